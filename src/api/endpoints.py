@@ -1,47 +1,249 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, Response
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime
-from .models import QuantumJobRequest, QuantumJobResponse
+from typing import Dict, Any, List, Literal
+from .models import (
+    QuantumJobRequest, QuantumJobResponse, BatchJobRequest, SweepJobRequest, ProfilerSettings,
+    CircuitTemplateRequest, CircuitTemplateResponse
+)
 from .gateway import QuantumGateway
+from .results import json_result_response, compact_result_response
+from src.monitoring.prometheus import CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE
+from src.orchestration.status_poller import TERMINAL_STATUSES
+from src.orchestration.orchestrator import SubmissionError
+from src.orchestration.scheduler import QueueFullError
+from src.orchestration.result_formats import ResultFormatError
+from src.circuits.ir import CircuitValidationError
+from src.circuits.templates import CircuitTemplate, TemplateNotFoundError
+from src.monitoring import tracing
 
 router = APIRouter()
 quantum_gateway = QuantumGateway()
 
+SSE_HEARTBEAT_SECONDS = 15.0
+
 @router.post("/api/v2/jobs", response_model=QuantumJobResponse)
 async def submit_quantum_job(job_request: QuantumJobRequest):
+    tracing.span_since_start("validation")
     try:
-        job_id = await quantum_gateway.submit_job(job_request)
-        status = await quantum_gateway.orchestrator.get_job_status(job_id)
-        return QuantumJobResponse(
-            job_id=job_id,
-            status=status["status"],
-            provider_used=status["provider"],
-            external_job_id=status["external_job_id"],
-            submitted_at=datetime.now()
-        )
+        with tracing.span("handler"):
+            job_id = await quantum_gateway.submit_job(job_request)
+            with tracing.span("status_lookup"):
+                status = await quantum_gateway.orchestrator.get_job_status(job_id)
+            return QuantumJobResponse(
+                job_id=job_id,
+                status=status["status"],
+                provider_used=status["provider"],
+                external_job_id=status["external_job_id"],
+                submitted_at=datetime.now()
+            )
+    except CircuitValidationError as e:
+        raise HTTPException(status_code=422, detail={"message": "Invalid circuit", "errors": e.errors})
+    except TemplateNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except SubmissionError as e:
+        raise HTTPException(status_code=502, detail=f"Job submission failed on all providers: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Job submission failed: {str(e)}")
 
+def _ndjson_response(items: List[Dict[str, Any]]) -> StreamingResponse:
+    return StreamingResponse((json.dumps(item) + "\n" for item in items), media_type="application/x-ndjson")
+
+@router.post("/api/v2/jobs:batch")
+async def submit_quantum_job_batch(batch_request: BatchJobRequest):
+    try:
+        return _ndjson_response(await quantum_gateway.submit_jobs(batch_request))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+@router.post("/api/v2/jobs:sweep")
+async def submit_quantum_job_sweep(sweep_request: SweepJobRequest):
+    """One job per parameter binding of a registered template, streamed back as NDJSON like a batch"""
+    try:
+        circuits = await quantum_gateway.bind_sweep(sweep_request)
+        return _ndjson_response(await quantum_gateway.submit_sweep(sweep_request, circuits))
+    except CircuitValidationError as e:
+        raise HTTPException(status_code=422, detail={"message": "Invalid parameter bindings", "errors": e.errors})
+    except TemplateNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+def _template_response(template: CircuitTemplate) -> CircuitTemplateResponse:
+    return CircuitTemplateResponse(
+        template_id=template.template_id,
+        parameters=template.parameters,
+        num_qubits=template.num_qubits,
+        gate_count=template.gate_count
+    )
+
+@router.post("/api/v2/circuits", response_model=CircuitTemplateResponse)
+async def register_circuit_template(template_request: CircuitTemplateRequest):
+    try:
+        template = await quantum_gateway.register_template(template_request.circuit_data, template_request.parameters)
+    except CircuitValidationError as e:
+        raise HTTPException(status_code=422, detail={"message": "Invalid circuit", "errors": e.errors})
+    return _template_response(template)
+
+@router.get("/api/v2/circuits/{template_id}", response_model=CircuitTemplateResponse)
+async def get_circuit_template(template_id: str):
+    try:
+        return _template_response(await quantum_gateway.templates.get(template_id))
+    except TemplateNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @router.get("/api/v2/jobs/{job_id}", response_model=QuantumJobResponse)
 async def get_quantum_job_status(job_id: str):
     try:
-        status = await quantum_gateway.orchestrator.get_job_status(job_id)
-        job_metadata = quantum_gateway.jobs.get(job_id, {})
-        return QuantumJobResponse(
-            job_id=job_id,
-            status=status["status"],
-            provider_used=status["provider"],
-            external_job_id=status["external_job_id"],
-            submitted_at=datetime.fromisoformat(status["submitted_at"])
-        )
+        with tracing.span("handler"):
+            status = await quantum_gateway.orchestrator.get_job_status(job_id)
+            return QuantumJobResponse(
+                job_id=job_id,
+                status=status["status"],
+                provider_used=status["provider"],
+                external_job_id=status["external_job_id"],
+                submitted_at=datetime.fromisoformat(status["submitted_at"])
+            )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Status query failed: {str(e)}")
 
+@router.get("/api/v2/jobs/{job_id}/events")
+async def stream_quantum_job_events(job_id: str):
+    orchestrator = quantum_gateway.orchestrator
+    # Subscribe before reading the current status so no transition in between is lost
+    subscription = orchestrator.events.subscribe([job_id])
+    try:
+        status = await orchestrator.get_job_status(job_id)
+    except ValueError as e:
+        subscription.close()
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def event_stream():
+        try:
+            yield f"event: status\ndata: {json.dumps(status, default=str)}\n\n"
+            current = status["status"]
+            while current not in TERMINAL_STATUSES:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                current = event["status"]
+                yield f"event: transition\ndata: {json.dumps(event)}\n\n"
+        finally:
+            subscription.close()
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/api/v2/jobs/events/ws")
+async def job_events_websocket(websocket: WebSocket):
+    """Clients send {"subscribe": [...]} / {"unsubscribe": [...]} and receive status transitions"""
+    await websocket.accept()
+    orchestrator = quantum_gateway.orchestrator
+    subscription = orchestrator.events.subscribe([])
+
+    async def push_events():
+        while True:
+            await websocket.send_json({"type": "transition", **(await subscription.get())})
+
+    pusher = asyncio.create_task(push_events())
+    try:
+        while True:
+            message = await websocket.receive_json()
+            unsubscribe = message.get("unsubscribe", [])
+            subscription.remove(unsubscribe)
+            for job_id in message.get("subscribe", []):
+                subscription.add([job_id])
+                try:
+                    status = await orchestrator.get_job_status(job_id)
+                except ValueError as e:
+                    subscription.remove([job_id])
+                    await websocket.send_json({"type": "error", "job_id": job_id, "detail": str(e)})
+                    continue
+                await websocket.send_json({"type": "status", "job_id": job_id, "status": status["status"], "details": status})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pusher.cancel()
+        subscription.close()
+
 @router.get("/api/v2/jobs/{job_id}/result")
-async def get_quantum_job_result(job_id: str):
+async def get_quantum_job_result(
+    job_id: str,
+    request: Request,
+    format: Literal["json", "counts", "packed", "npy", "arrow"] = "json",
+    experiment: int = Query(0, ge=0, description="Experiment index for packed, npy and arrow")
+):
+    accept_encoding = request.headers.get("accept-encoding", "")
     try:
-        result = await quantum_gateway.orchestrator.get_job_result(job_id)
-        return result
+        result, path = await quantum_gateway.orchestrator.open_job_result(job_id)
+        if format == "json":
+            return json_result_response(result, path, accept_encoding)
+        # Decoding a spilled file and vectorizing the shots is blocking work
+        return await run_in_threadpool(compact_result_response, result, path, format, experiment, accept_encoding)
+    except ResultFormatError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=406, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Result retrieval failed: {str(e)}")
+
+@router.get("/api/v2/providers/pool-stats")
+async def get_provider_pool_stats():
+    return quantum_gateway.get_pool_stats()
+
+@router.get("/api/v2/monitoring/cache")
+async def get_cache_statistics():
+    return quantum_gateway.monitoring.get_cache_statistics()
+
+@router.get("/api/v2/monitoring/webhooks")
+async def get_webhook_statistics():
+    return {
+        **quantum_gateway.monitoring.get_webhook_statistics(),
+        **quantum_gateway.notifications.get_stats()
+    }
+
+@router.get("/api/v2/monitoring/routing")
+async def get_routing_statistics():
+    return {
+        "policy": type(quantum_gateway.router.policy).__name__,
+        "providers": quantum_gateway.router.get_stats()
+    }
+
+@router.get("/api/v2/monitoring/providers")
+async def get_provider_resilience():
+    return quantum_gateway.get_resilience_stats()
+
+@router.get("/api/v2/monitoring/scheduler")
+async def get_scheduler_statistics():
+    return quantum_gateway.scheduler.get_stats()
+
+@router.get("/metrics")
+async def get_prometheus_metrics():
+    return Response(quantum_gateway.render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@router.get("/api/v2/debug/profiler")
+async def get_profiler_status():
+    return quantum_gateway.profiler.get_stats()
+
+@router.post("/api/v2/debug/profiler")
+async def set_profiler_status(settings: ProfilerSettings):
+    if settings.enabled:
+        quantum_gateway.profiler.enable(settings.threshold_seconds, settings.interval_seconds)
+    else:
+        quantum_gateway.profiler.disable()
+    return quantum_gateway.profiler.get_stats()
+
+@router.get("/api/v2/debug/traces")
+async def get_recent_traces(limit: int = 20):
+    return [trace.to_dict() for trace in list(quantum_gateway.tracer.recent)[-limit:]]
@@ -1,16 +1,60 @@
 import os
-from datetime import datetime
-from typing import Dict, Any
+import uuid
+from typing import Dict, Any, List, Optional
+from src.circuits.ir import CircuitIR, CircuitValidationError
+from src.circuits.templates import CircuitTemplate, TemplateRegistry
+from src.circuits.transpile import TRANSPILE_CACHE
 from src.orchestration.orchestrator import QuantumJobOrchestrator
+from src.orchestration.result_cache import ResultCache
+from src.orchestration.job_store import create_job_store
+from src.orchestration.redis_state import RedisSharedState
+from src.orchestration.scheduler import JobScheduler, ScheduledJob
+from src.orchestration.routing import ProviderRouter, JobFeatures, ExpectedTimePolicy, StaticAffinityPolicy
+from src.monitoring.metrics import QuantumGatewayMonitoring
+from src.monitoring.tracing import Tracer, SamplingProfiler, span
+from src.monitoring.prometheus import PrometheusWriter, write_monitoring_metrics, write_gauges
+from src.notifications.dispatcher import NotificationDispatcher, SMTPEmailSender
 from src.providers.ibm_provider import IBMQuantumProvider
 from src.providers.google_provider import GoogleQuantumProvider
 from src.providers.azure_provider import AzureQuantumProvider
-from .models import QuantumJobRequest
+from src.providers.resilience import ResilientProvider
+from .models import QuantumJobRequest, BatchJobRequest, SweepJobRequest
 
 class QuantumGateway:
     def __init__(self):
-        self.orchestrator = QuantumJobOrchestrator()
-        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.monitoring = QuantumGatewayMonitoring()
+        self.orchestrator = QuantumJobOrchestrator(
+            monitoring=self.monitoring,
+            result_cache=ResultCache(
+                directory=os.getenv("RESULT_CACHE_DIR"),
+                monitoring=self.monitoring
+            ),
+            job_store=create_job_store(os.getenv("JOB_STORE_URL") or os.getenv("REDIS_URL")),
+            shared_state=RedisSharedState.from_url(os.environ["REDIS_URL"]) if os.getenv("REDIS_URL") else None,
+            submit_timeout=float(os.getenv("PROVIDER_SUBMIT_TIMEOUT_SECONDS", "30"))
+        )
+        smtp_host = os.getenv("SMTP_HOST")
+        self.notifications = NotificationDispatcher(
+            self.orchestrator,
+            monitoring=self.monitoring,
+            email_sender=SMTPEmailSender(
+                smtp_host,
+                int(os.getenv("SMTP_PORT", "25")),
+                os.getenv("SMTP_SENDER", "quantumbridge@localhost")
+            ) if smtp_host else None
+        )
+        self.router = ProviderRouter(
+            policy=StaticAffinityPolicy() if os.getenv("ROUTING_POLICY") == "static" else ExpectedTimePolicy()
+        )
+        self.orchestrator.latency_estimator = self.router.expected_seconds
+        self.scheduler = JobScheduler(self.orchestrator, monitoring=self.monitoring)
+        self.templates = TemplateRegistry(self.orchestrator.job_store)
+        self.tracer = Tracer.from_env()
+        self.tracer.listeners.append(self.monitoring.record_request_trace)
+        self.profiler = SamplingProfiler(
+            output_dir=os.getenv("PROFILE_OUTPUT_DIR"),
+            threshold_seconds=float(os.getenv("PROFILE_THRESHOLD_SECONDS", "1.0"))
+        )
         self._load_providers()
 
     def _load_providers(self):
@@ -21,49 +65,210 @@ class QuantumGateway:
             "project": "main"
         }
         ibm_provider = IBMQuantumProvider(ibm_config)
-        self.orchestrator.register_provider("ibm", ibm_provider)
+        self.orchestrator.register_provider("ibm", ResilientProvider("ibm", ibm_provider))
         google_config = {
             "project_id": os.getenv("GOOGLE_CLOUD_PROJECT", "demo-project"),
             "service_account_key": os.getenv("GOOGLE_SERVICE_ACCOUNT_KEY", "demo_key")
         }
         google_provider = GoogleQuantumProvider(google_config)
-        self.orchestrator.register_provider("google", google_provider)
+        self.orchestrator.register_provider("google", ResilientProvider("google", google_provider))
         azure_config = {
             "subscription_id": os.getenv("AZURE_SUBSCRIPTION_ID", "demo-sub"),
             "resource_group": os.getenv("AZURE_RESOURCE_GROUP", "quantum-rg"),
             "workspace_name": os.getenv("AZURE_WORKSPACE_NAME", "quantum-ws")
         }
         azure_provider = AzureQuantumProvider(azure_config)
-        self.orchestrator.register_provider("azure", azure_provider)
+        self.orchestrator.register_provider("azure", ResilientProvider("azure", azure_provider))
+
+    async def startup(self):
+        for provider in self.orchestrator.providers.values():
+            await provider.startup()
+        await self.orchestrator.startup()
+        await self.scheduler.start()
+        await self.router.start(self.orchestrator)
+        await self.notifications.start()
+
+    async def shutdown(self):
+        await self.notifications.stop()
+        await self.router.stop()
+        await self.scheduler.stop()
+        await self.orchestrator.shutdown()
+        for provider in self.orchestrator.providers.values():
+            await provider.shutdown()
+        self.profiler.disable()
+        self.tracer.shutdown()
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: provider.get_pool_stats()
+            for name, provider in self.orchestrator.providers.items()
+        }
+
+    def get_resilience_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: provider.get_resilience_stats()
+            for name, provider in self.orchestrator.providers.items()
+            if hasattr(provider, "get_resilience_stats")
+        }
+
+    def render_metrics(self) -> str:
+        writer = PrometheusWriter()
+        write_monitoring_metrics(writer, self.monitoring)
+        resilience = self.get_resilience_stats()
+        write_gauges(writer, "quantum_provider_breaker_open", "1 while the provider's circuit breaker rejects calls", (
+            ({"provider": name}, int(stats["breaker_state"] == "open")) for name, stats in resilience.items()
+        ))
+        write_gauges(writer, "quantum_provider_in_flight", "Provider API calls in flight", (
+            ({"provider": name}, stats["in_flight"]) for name, stats in resilience.items()
+        ))
+        write_gauges(writer, "quantum_provider_limiter_wait_seconds_total", "Time spent waiting on provider rate limits", (
+            ({"provider": name}, stats["limiter_wait_seconds_total"]) for name, stats in resilience.items()
+        ), metric_type="counter")
+        write_gauges(writer, "quantum_provider_calls_total", "Provider API calls by outcome", (
+            ({"provider": name, "outcome": outcome}, stats[key])
+            for name, stats in resilience.items()
+            for outcome, key in (("attempted", "calls"), ("failed", "failures"), ("rejected", "rejected_calls"))
+        ), metric_type="counter")
+        write_gauges(writer, "quantum_status_poller_tracked_jobs", "Jobs the status poller is tracking", [
+            ({}, self.orchestrator.poller.tracked_jobs)
+        ])
+        scheduler = self.scheduler.get_stats()
+        write_gauges(writer, "quantum_scheduler_queue_depth", "Jobs waiting in the scheduler per provider", (
+            ({"provider": name}, stats["depth"]) for name, stats in scheduler.items()
+        ))
+        write_gauges(writer, "quantum_scheduler_active_jobs", "Dispatched unfinished jobs counted against the provider quota", (
+            ({"provider": name}, stats["active_jobs"]) for name, stats in scheduler.items()
+        ))
+        write_gauges(writer, "quantum_scheduler_jobs_total", "Scheduler admissions and dispatches by outcome", (
+            ({"provider": name, "outcome": outcome}, stats[outcome])
+            for name, stats in scheduler.items()
+            for outcome in ("enqueued", "dispatched", "failed", "rejected")
+        ), metric_type="counter")
+        write_gauges(writer, "quantum_transpile_cache_lookups_total", "Provider circuit emissions by cache outcome", [
+            ({"outcome": "hit"}, TRANSPILE_CACHE.hits),
+            ({"outcome": "miss"}, TRANSPILE_CACHE.misses)
+        ], metric_type="counter")
+        return writer.render()
 
-    def select_optimal_provider(self, job_request: QuantumJobRequest) -> str:
+    async def register_template(self, circuit_data: Dict[str, Any], parameters: Optional[List[str]] = None) -> CircuitTemplate:
+        if parameters is not None:
+            circuit_data = {**circuit_data, "parameters": parameters}
+        return await self.templates.register(circuit_data)
+
+    async def resolve_circuit(self, job_request: QuantumJobRequest) -> CircuitIR:
+        """Build the circuit IR once per request; raises CircuitValidationError listing every problem found"""
+        with span("circuit_validation"):
+            if job_request.template_id is None:
+                circuit = CircuitIR.from_dict(job_request.circuit_data)
+                circuit.validate()
+                return circuit
+            template = await self.templates.get(job_request.template_id)
+            bindings = job_request.parameter_bindings or [[]]
+            if len(bindings) != 1:
+                raise CircuitValidationError(["submit several parameter bindings to /api/v2/jobs:sweep"])
+            return template.bind(bindings)[0]
+
+    def select_optimal_provider(self, job_request: QuantumJobRequest, circuit: Optional[CircuitIR] = None) -> str:
         if job_request.preferred_provider:
             return job_request.preferred_provider
-        if job_request.algorithm_type == "vqe":
-            return "ibm"
-        elif job_request.algorithm_type in ["quantum_ml", "variational_classifier"]:
-            return "google"
-        elif job_request.circuit_format == "qsharp":
-            return "azure"
-        backend_req = job_request.backend_requirements
-        if backend_req.get("error_mitigation"):
-            return "ibm"
-        return "ibm"
+        with span("provider_selection"):
+            providers = self.orchestrator.providers
+            # Skip providers whose circuit breaker is open, unless that leaves nothing to choose from
+            candidates = [name for name, provider in providers.items() if getattr(provider, "available", True)] or list(providers)
+            return self.router.select(JobFeatures.from_request(job_request, circuit), candidates)
 
     async def submit_job(self, job_request: QuantumJobRequest) -> str:
-        selected_provider = self.select_optimal_provider(job_request)
+        """Queue a job with the scheduler; it is submitted to the provider in the background"""
+        circuit = await self.resolve_circuit(job_request)
+        selected_provider = self.select_optimal_provider(job_request, circuit)
+        job = self._scheduled_job(job_request, selected_provider, circuit)
+        with span("scheduling"):
+            await self.scheduler.enqueue([job])
+        return job.job_id
+
+    async def submit_jobs(self, batch_request: BatchJobRequest) -> List[Dict[str, Any]]:
+        """Queue a batch; items that fail validation or routing are reported without rejecting the rest"""
+        items = []
+        jobs = []
+        for index, job_request in enumerate(batch_request.jobs):
+            try:
+                circuit = await self.resolve_circuit(job_request)
+                provider_name = self.select_optimal_provider(job_request, circuit)
+            except (ValueError, LookupError) as e:
+                items.append({"index": index, "provider": None, "error": str(e)})
+                continue
+            job = self._scheduled_job(job_request, provider_name, circuit)
+            jobs.append(job)
+            items.append({"index": index, "provider": provider_name, "job_id": job.job_id, "status": "pending"})
+        await self.scheduler.enqueue(jobs)
+        return items
+
+    async def bind_sweep(self, sweep_request: SweepJobRequest) -> List[CircuitIR]:
+        """Bind every parameter row of a sweep in one vectorized step"""
+        with span("circuit_validation"):
+            template = await self.templates.get(sweep_request.template_id)
+            return template.bind(sweep_request.parameter_bindings)
+
+    async def submit_sweep(self, sweep_request: SweepJobRequest, circuits: List[CircuitIR]) -> List[Dict[str, Any]]:
+        """Queue one job per bound circuit of a sweep; routing is decided once for the whole sweep"""
+        provider_name = self.select_optimal_provider(sweep_request, circuits[0].template)
+        # A sweep shares one request, so its serialized form is computed once
+        original_request = self._original_request(sweep_request)
+        jobs = [self._scheduled_job(sweep_request, provider_name, circuit, original_request) for circuit in circuits]
+        await self.scheduler.enqueue(jobs)
+        return [
+            {"index": index, "provider": provider_name, "job_id": job.job_id, "status": "pending"}
+            for index, job in enumerate(jobs)
+        ]
+
+    def _scheduled_job(
+        self,
+        job_request: QuantumJobRequest,
+        provider_name: str,
+        circuit: CircuitIR,
+        original_request: Optional[Dict[str, Any]] = None
+    ) -> ScheduledJob:
+        return ScheduledJob(
+            job_id=str(uuid.uuid4()),
+            provider_name=provider_name,
+            circuit=circuit,
+            job_config=self._provider_config(job_request),
+            metadata=self._job_metadata(job_request, provider_name, circuit, original_request),
+            priority=job_request.priority,
+            tenant=job_request.tenant or job_request.job_name or "default",
+            deduplicate=job_request.deduplicate,
+            fallback_providers=job_request.fallback_providers,
+            hedge_after=self._hedge_budget(job_request)
+        )
+
+    def _provider_config(self, job_request: QuantumJobRequest) -> Dict[str, Any]:
         provider_config = job_request.execution_config.copy()
         provider_config.update(job_request.backend_requirements)
-        internal_job_id = await self.orchestrator.submit_job(
-            selected_provider,
-            job_request.circuit_data,
-            provider_config
+        return provider_config
+
+    def _hedge_budget(self, job_request: QuantumJobRequest) -> Optional[float]:
+        if not job_request.hedge:
+            return None
+        return job_request.hedge_after_seconds or job_request.max_execution_time or float(
+            os.getenv("HEDGE_QUEUE_BUDGET_SECONDS", "300")
         )
-        self.jobs[internal_job_id] = {
-            "original_request": job_request.dict(),
+
+    def _original_request(self, job_request: QuantumJobRequest) -> Dict[str, Any]:
+        # The circuit itself is stored as a separate blob by the orchestrator
+        return job_request.dict(exclude={"circuit_data", "parameter_bindings"})
+
+    def _job_metadata(
+        self,
+        job_request: QuantumJobRequest,
+        selected_provider: str,
+        circuit: CircuitIR,
+        original_request: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return {
+            "original_request": original_request or self._original_request(job_request),
+            "parameter_binding": circuit.bound_parameters() or None,
+            "algorithm_type": job_request.algorithm_type,
             "selected_provider": selected_provider,
-            "submitted_at": datetime.now(),
             "webhook_url": job_request.webhook_url,
             "notification_email": job_request.notification_email
         }
-        return internal_job_id
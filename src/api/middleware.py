@@ -1 +1,53 @@
-# Placeholder for API middleware (auth, logging, etc.)
\ No newline at end of file
+import time
+from typing import Optional
+from src.monitoring.tracing import Tracer, SamplingProfiler, current_trace, current_span
+
+class TracingMiddleware:
+    """ASGI middleware that traces sampled requests and feeds the sampling profiler.
+
+    Handlers add stage spans through ``src.monitoring.tracing.span``. The time between the
+    handler returning and the response starting is recorded as the ``serialization`` span.
+    """
+    def __init__(self, app, tracer: Tracer, profiler: Optional[SamplingProfiler] = None):
+        self.app = app
+        self.tracer = tracer
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profiling = self.profiler is not None and self.profiler.enabled
+        traceparent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        name = f"{scope['method']} {scope['path']}"
+        trace = self.tracer.start(name, traceparent, force=profiling)
+        if trace is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_trace(message):
+            if message["type"] == "http.response.start":
+                handler = next((span for span in reversed(trace.spans) if span.name == "handler"), None)
+                if handler is not None and handler.end is not None:
+                    trace.add_span("serialization", handler.end, time.perf_counter())
+                message = {**message, "headers": [*message.get("headers", []), (b"x-trace-id", trace.trace_id.encode())]}
+            await send(message)
+
+        trace_token = current_trace.set(trace)
+        span_token = current_span.set(None)
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            current_span.reset(span_token)
+            current_trace.reset(trace_token)
+            # Name by route template rather than raw path to keep job IDs out of metric labels
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                trace.name = f"{scope['method']} {route.path}"
+            self.tracer.finish(trace)
+            if profiling:
+                self.profiler.request_finished(trace.name, trace.trace_id, trace.start, trace.end)
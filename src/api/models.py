@@ -1,20 +1,49 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Dict, Any, Optional, List, Literal
 from datetime import datetime
 
 class QuantumJobRequest(BaseModel):
     algorithm_type: str = Field(..., description="maxcut, vqe, qaoa, custom")
-    circuit_data: Dict[str, Any] = Field(..., description="Circuit Definition")
+    circuit_data: Optional[Dict[str, Any]] = Field(None, description="Circuit Definition")
+    template_id: Optional[str] = Field(None, description="Registered circuit template to bind instead of circuit_data")
+    parameter_bindings: Optional[List[List[float]]] = Field(None, description="Template parameter values, one row per job")
     circuit_format: Literal["qiskit", "cirq", "qsharp"] = "qiskit"
     preferred_provider: Optional[Literal["ibm", "google", "azure"]] = None
     fallback_providers: List[str] = Field(default_factory=list)
     backend_requirements: Dict[str, Any] = Field(default_factory=dict)
     execution_config: Dict[str, Any] = Field(default_factory=dict)
     job_name: Optional[str] = None
+    tenant: Optional[str] = Field(None, description="Fair-share group for scheduling; defaults to job_name")
     priority: int = Field(1, ge=1, le=10)
     max_execution_time: Optional[int] = None
     webhook_url: Optional[str] = None
     notification_email: Optional[str] = None
+    deduplicate: bool = Field(True, description="Reuse results or running jobs of identical circuit submissions")
+    hedge: bool = Field(False, description="Also submit to the first fallback provider if the job is slow to start")
+    hedge_after_seconds: Optional[float] = Field(None, gt=0, description="Queue-time budget before hedging; defaults to max_execution_time")
+
+    @model_validator(mode="after")
+    def check_circuit_source(self):
+        if (self.circuit_data is None) == (self.template_id is None):
+            raise ValueError("Provide either circuit_data or template_id")
+        return self
+
+class SweepJobRequest(QuantumJobRequest):
+    template_id: str
+    parameter_bindings: List[List[float]] = Field(..., min_length=1, max_length=100000)
+
+class CircuitTemplateRequest(BaseModel):
+    circuit_data: Dict[str, Any] = Field(..., description="Circuit definition; string parameters are template symbols")
+    parameters: Optional[List[str]] = Field(None, description="Parameter order for bindings; defaults to order of first use")
+
+class CircuitTemplateResponse(BaseModel):
+    template_id: str
+    parameters: List[str]
+    num_qubits: int
+    gate_count: int
+
+class BatchJobRequest(BaseModel):
+    jobs: List[QuantumJobRequest] = Field(..., min_length=1, max_length=10000)
 
 class QuantumJobResponse(BaseModel):
     job_id: str
@@ -30,3 +59,8 @@ class QuantumJobResponse(BaseModel):
     retry_count: int = 0
     result: Optional[Dict[str, Any]] = None
     execution_summary: Optional[Dict[str, Any]] = None
+
+class ProfilerSettings(BaseModel):
+    enabled: bool
+    threshold_seconds: Optional[float] = Field(None, ge=0, description="Dump stacks for requests slower than this")
+    interval_seconds: Optional[float] = Field(None, gt=0, le=1, description="Sampling interval")
@@ -1,12 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from .endpoints import router as quantum_router
+from .endpoints import router as quantum_router, quantum_gateway
+from .middleware import TracingMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await quantum_gateway.startup()
+    yield
+    await quantum_gateway.shutdown()
 
 app = FastAPI(
     title="QuantumBridge Multi-Provider Gateway",
     description="Unified API for heterogeneous Quantum Computing Providers",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(TracingMiddleware, tracer=quantum_gateway.tracer, profiler=quantum_gateway.profiler)
 app.include_router(quantum_router)
 
 @app.get("/api/v2/health")
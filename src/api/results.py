@@ -0,0 +1,77 @@
+import gzip
+import json
+from typing import Dict, Any, Iterator, Optional
+from fastapi.responses import Response, StreamingResponse, FileResponse
+from src.orchestration.result_cache import ResultCache
+from src.orchestration.result_formats import COMPACT_FORMATS
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Smaller bodies are sent uncompressed; the framing overhead outweighs the savings
+COMPRESS_MIN_BYTES = 1024
+STREAM_CHUNK_BYTES = 64 * 1024
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if not part.strip().endswith(";q=0")
+    }
+    if ZSTD_AVAILABLE and "zstd" in accepted:
+        return "zstd"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=5)
+
+def _read_spilled(path: str, encoding: Optional[str]) -> Iterator[bytes]:
+    """Decompress a spilled gzip file chunk by chunk, re-encoding with zstd if that was negotiated"""
+    compressor = zstandard.ZstdCompressor(level=3).compressobj() if encoding == "zstd" else None
+    with gzip.open(path, "rb") as f:
+        while True:
+            chunk = f.read(STREAM_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield compressor.compress(chunk) if compressor else chunk
+    if compressor:
+        yield compressor.flush()
+
+def json_result_response(result: Optional[Dict[str, Any]], path: Optional[str], accept_encoding: str) -> Response:
+    encoding = negotiate_encoding(accept_encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if path is not None:
+        if encoding == "gzip":
+            # The spill file already is the gzip body; it is sent with sendfile where the server supports it
+            return FileResponse(path, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"})
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        # Sync iterators are run in the threadpool, keeping file reads off the event loop
+        return StreamingResponse(_read_spilled(path, encoding), media_type="application/json", headers=headers)
+    body = json.dumps(result, default=str).encode()
+    if encoding is not None and len(body) >= COMPRESS_MIN_BYTES:
+        body = _compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+def compact_result_response(
+    result: Optional[Dict[str, Any]], path: Optional[str], result_format: str, experiment: int, accept_encoding: str
+) -> Response:
+    """Result converted to one of COMPACT_FORMATS; raises ResultFormatError or RuntimeError"""
+    if result is None:
+        result = ResultCache.load(path)
+    media_type, encode = COMPACT_FORMATS[result_format]
+    body, headers = encode(result, experiment)
+    encoding = negotiate_encoding(accept_encoding)
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if encoding is not None and len(body) >= COMPRESS_MIN_BYTES and result_format != "arrow":
+        body = _compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=media_type, headers=headers)
@@ -0,0 +1 @@
+# circuits package init
@@ -0,0 +1,197 @@
+import hashlib
+from typing import Dict, Any, List, Optional, Tuple, Union
+import numpy as np
+
+MAX_ARITY = 3
+MAX_PARAMS = 3
+MAX_INTERNED_GATES = 4096
+
+# name: (qubit count, parameter count); the opcode of a gate is its index in this table
+KNOWN_GATES: Dict[str, Tuple[int, int]] = {
+    "id": (1, 0), "h": (1, 0), "x": (1, 0), "y": (1, 0), "z": (1, 0),
+    "s": (1, 0), "sdg": (1, 0), "t": (1, 0), "tdg": (1, 0), "sx": (1, 0), "sxdg": (1, 0),
+    "rx": (1, 1), "ry": (1, 1), "rz": (1, 1), "p": (1, 1), "u1": (1, 1), "u2": (1, 2), "u3": (1, 3), "u": (1, 3),
+    "measure": (1, 0), "reset": (1, 0),
+    "cx": (2, 0), "cy": (2, 0), "cz": (2, 0), "ch": (2, 0), "swap": (2, 0), "iswap": (2, 0),
+    "crx": (2, 1), "cry": (2, 1), "crz": (2, 1), "cp": (2, 1),
+    "rxx": (2, 1), "ryy": (2, 1), "rzz": (2, 1),
+    "ccx": (3, 0), "cswap": (3, 0)
+}
+GATE_ALIASES = {"cnot": "cx", "toffoli": "ccx", "fredkin": "cswap", "phase": "p", "i": "id"}
+
+# Interned gate names; unknown names are appended so they can be reported by validate()
+GATE_NAMES: List[str] = list(KNOWN_GATES)
+_OPCODES: Dict[str, int] = {name: index for index, name in enumerate(GATE_NAMES)}
+_ARITY = np.array([arity for arity, _ in KNOWN_GATES.values()], dtype=np.int8)
+_PARAM_COUNT = np.array([count for _, count in KNOWN_GATES.values()], dtype=np.int8)
+
+def intern_gate(name: str) -> int:
+    name = GATE_ALIASES.get(name.lower(), name.lower())
+    opcode = _OPCODES.get(name)
+    if opcode is None:
+        if len(GATE_NAMES) >= MAX_INTERNED_GATES:
+            raise ValueError(f"unknown gate '{name}'")
+        opcode = _OPCODES[name] = len(GATE_NAMES)
+        GATE_NAMES.append(name)
+    return opcode
+
+class CircuitValidationError(ValueError):
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+class CircuitIR:
+    """Column-oriented circuit: one opcode, up to three qubits and three parameters per gate.
+
+    Unused qubit slots hold -1 and unused parameter slots NaN. Keys of the original circuit
+    other than ``gates`` and ``num_qubits`` are kept in ``metadata``. Circuits bound from a
+    template keep a reference to it and to their parameter values in ``template`` and ``binding``.
+    """
+    __slots__ = ("num_qubits", "opcodes", "qubits", "params", "metadata", "template", "binding", "_fingerprint")
+
+    def __init__(
+        self,
+        num_qubits: int,
+        opcodes: np.ndarray,
+        qubits: np.ndarray,
+        params: np.ndarray,
+        metadata: Optional[Dict[str, Any]] = None,
+        template: Optional["CircuitIR"] = None,
+        binding: Optional[np.ndarray] = None
+    ):
+        self.num_qubits = num_qubits
+        self.opcodes = opcodes
+        self.qubits = qubits
+        self.params = params
+        self.metadata = metadata or {}
+        self.template = template
+        self.binding = binding
+        self._fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, circuit_data: Dict[str, Any]) -> "CircuitIR":
+        gates = circuit_data.get("gates", [])
+        count = len(gates)
+        opcodes = np.empty(count, dtype=np.int16)
+        qubits = np.full((count, MAX_ARITY), -1, dtype=np.int32)
+        params = np.full((count, MAX_PARAMS), np.nan, dtype=np.float64)
+        for index, gate in enumerate(gates):
+            try:
+                cls._parse_gate(gate, index, opcodes, qubits, params)
+            except (AttributeError, TypeError, ValueError) as e:
+                raise CircuitValidationError([f"gate {index}: {e}"])
+        num_qubits = circuit_data.get("num_qubits")
+        if num_qubits is None:
+            num_qubits = int(qubits.max()) + 1 if count else 0
+        metadata = {key: value for key, value in circuit_data.items() if key not in ("gates", "num_qubits")}
+        return cls(int(num_qubits), opcodes, qubits, params, metadata)
+
+    @staticmethod
+    def _parse_gate(gate: Dict[str, Any], index: int, opcodes: np.ndarray, qubits: np.ndarray, params: np.ndarray):
+        opcodes[index] = intern_gate(str(gate.get("type", gate.get("name", ""))))
+        if "qubits" in gate:
+            targets = gate["qubits"]
+        elif "target" in gate:
+            controls = gate.get("controls", [gate["control"]] if "control" in gate else [])
+            targets = [*controls, gate["target"]]
+        else:
+            targets = [gate.get("qubit", -1)]
+        qubits[index, :len(targets[:MAX_ARITY])] = targets[:MAX_ARITY]
+        if len(targets) > MAX_ARITY:
+            qubits[index, MAX_ARITY - 1] = -2
+        values = gate.get("params")
+        if values is None and ("theta" in gate or "angle" in gate):
+            values = [gate.get("theta", gate.get("angle"))]
+        if values:
+            params[index, :len(values[:MAX_PARAMS])] = values[:MAX_PARAMS]
+
+    @classmethod
+    def coerce(cls, circuit: Union["CircuitIR", Dict[str, Any]]) -> "CircuitIR":
+        return circuit if isinstance(circuit, CircuitIR) else cls.from_dict(circuit)
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    @property
+    def gate_count(self) -> int:
+        return len(self.opcodes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.opcodes.nbytes + self.qubits.nbytes + self.params.nbytes
+
+    @property
+    def fingerprint(self) -> str:
+        """SHA-256 over the columns and qubit count, computed once"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256(np.int64(self.num_qubits).tobytes())
+            digest.update(np.array([GATE_NAMES[opcode] for opcode in np.unique(self.opcodes)]).tobytes())
+            for column in (self.opcodes, self.qubits, np.nan_to_num(self.params, nan=np.inf)):
+                digest.update(np.ascontiguousarray(column).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def bound_parameters(self) -> Dict[str, float]:
+        """Parameter values by name for a circuit bound from a template"""
+        if self.template is None:
+            return {}
+        return dict(zip(self.template.parameters, self.binding.tolist()))
+
+    def gate_names(self) -> np.ndarray:
+        return np.array(GATE_NAMES, dtype=object)[self.opcodes]
+
+    def validate(self, max_errors: int = 20):
+        """Check gate names, qubit counts and bounds, and parameters in whole-column operations"""
+        errors: List[str] = []
+        known = self.opcodes < len(_ARITY)
+        for index in np.flatnonzero(~known)[:max_errors]:
+            errors.append(f"gate {index}: unknown gate '{GATE_NAMES[self.opcodes[index]]}'")
+        opcodes = np.where(known, self.opcodes, 0)
+        used = self.qubits != -1
+        arity = used.sum(axis=1)
+        bad_arity = known & ((arity != _ARITY[opcodes]) | (self.qubits[:, -1] == -2))
+        for index in np.flatnonzero(bad_arity)[:max_errors]:
+            errors.append(
+                f"gate {index}: '{GATE_NAMES[self.opcodes[index]]}' acts on {_ARITY[opcodes[index]]} qubit(s)"
+            )
+        out_of_range = (used & ((self.qubits < 0) | (self.qubits >= self.num_qubits))).any(axis=1)
+        for index in np.flatnonzero(out_of_range & ~bad_arity)[:max_errors]:
+            errors.append(f"gate {index}: qubit out of range for {self.num_qubits}-qubit circuit")
+        a, b, c = self.qubits[:, 0], self.qubits[:, 1], self.qubits[:, 2]
+        repeated = ((a == b) & (a != -1)) | ((a == c) & (a != -1)) | ((b == c) & (b != -1))
+        for index in np.flatnonzero(repeated)[:max_errors]:
+            errors.append(f"gate {index}: the same qubit is used twice")
+        expected_params = np.arange(MAX_PARAMS) < _PARAM_COUNT[opcodes][:, None]
+        missing = known & (expected_params & ~np.isfinite(self.params)).any(axis=1)
+        for index in np.flatnonzero(missing)[:max_errors]:
+            errors.append(f"gate {index}: '{GATE_NAMES[self.opcodes[index]]}' needs {_PARAM_COUNT[opcodes[index]]} finite parameter(s)")
+        if errors:
+            raise CircuitValidationError(errors[:max_errors])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Back to the API's gate-dict format"""
+        gates = []
+        names = GATE_NAMES
+        for opcode, row, values in zip(self.opcodes.tolist(), self.qubits.tolist(), self.params.tolist()):
+            targets = [qubit for qubit in row if qubit != -1]
+            gate: Dict[str, Any] = {"type": names[opcode]}
+            if len(targets) == 1:
+                gate["qubit"] = targets[0]
+            elif len(targets) == 2:
+                gate["control"], gate["target"] = targets
+            else:
+                gate["qubits"] = targets
+            values = [value for value in values if value == value]
+            if values:
+                gate["params"] = values
+            gates.append(gate)
+        return {**self.metadata, "gates": gates, "num_qubits": self.num_qubits}
+
+def circuit_to_dict(circuit: Union[CircuitIR, Dict[str, Any]]) -> Dict[str, Any]:
+    return circuit.to_dict() if isinstance(circuit, CircuitIR) else circuit
+
+def gate_count(circuit: Union[CircuitIR, Dict[str, Any], None]) -> int:
+    if isinstance(circuit, CircuitIR):
+        return circuit.gate_count
+    gates = (circuit or {}).get("gates", [])
+    return len(gates) if hasattr(gates, "__len__") else 0
@@ -0,0 +1,153 @@
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+from .ir import CircuitIR, CircuitValidationError, MAX_PARAMS
+
+PARAMETER_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+class TemplateNotFoundError(LookupError):
+    pass
+
+class CircuitTemplate(CircuitIR):
+    """Circuit whose gate parameters may be named symbols, bound to values per job.
+
+    A symbol is written as a string (``"params": ["gamma"]``, ``"theta": "beta"``) or as
+    ``{"param": "gamma"}``. Symbolic slots hold 0.0 in ``params``; ``sites`` lists them as
+    parallel arrays of gate index, parameter slot and index into ``parameters``.
+    """
+    __slots__ = ("parameters", "sites", "_template_fingerprint")
+
+    def __init__(self, circuit: CircuitIR, parameters: List[str], sites: Tuple[np.ndarray, np.ndarray, np.ndarray]):
+        super().__init__(circuit.num_qubits, circuit.opcodes, circuit.qubits, circuit.params, circuit.metadata)
+        self.parameters = parameters
+        self.sites = sites
+        self._template_fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, circuit_data: Dict[str, Any]) -> "CircuitTemplate":
+        declared = circuit_data.get("parameters")
+        names: Dict[str, int] = {}
+        errors: List[str] = []
+        if declared is not None:
+            for name in declared:
+                names.setdefault(str(name), len(names))
+        sites: List[Tuple[int, int, int]] = []
+        gates = []
+        for index, gate in enumerate(circuit_data.get("gates", [])):
+            values = gate.get("params") if isinstance(gate, dict) else None
+            if values is None and isinstance(gate, dict) and ("theta" in gate or "angle" in gate):
+                values = [gate.get("theta", gate.get("angle"))]
+            symbolic = [
+                (slot, value.get("param") if isinstance(value, dict) else value)
+                for slot, value in enumerate(values or [])
+                if isinstance(value, (str, dict))
+            ]
+            if not symbolic:
+                gates.append(gate)
+                continue
+            values = list(values)
+            for slot, name in symbolic:
+                values[slot] = 0.0
+                if not isinstance(name, str) or not PARAMETER_NAME.match(name):
+                    errors.append(f"gate {index}: invalid parameter name {name!r}")
+                elif slot >= MAX_PARAMS:
+                    errors.append(f"gate {index}: at most {MAX_PARAMS} parameters per gate")
+                elif declared is not None and name not in names:
+                    errors.append(f"gate {index}: parameter '{name}' is not declared in 'parameters'")
+                else:
+                    sites.append((index, slot, names.setdefault(name, len(names))))
+            gates.append({**{key: value for key, value in gate.items() if key not in ("theta", "angle")}, "params": values})
+        if errors:
+            raise CircuitValidationError(errors)
+        circuit = CircuitIR.from_dict({
+            **{key: value for key, value in circuit_data.items() if key != "parameters"},
+            "gates": gates
+        })
+        columns = np.array(sites, dtype=np.int64).reshape(-1, 3).T
+        return cls(circuit, list(names), (columns[0], columns[1], columns[2]))
+
+    @property
+    def template_id(self) -> str:
+        return f"tpl_{self.fingerprint[:32]}"
+
+    @property
+    def fingerprint(self) -> str:
+        if self._template_fingerprint is None:
+            digest = hashlib.sha256(super().fingerprint.encode())
+            digest.update("\0".join(self.parameters).encode())
+            for column in self.sites:
+                digest.update(np.ascontiguousarray(column).tobytes())
+            self._template_fingerprint = digest.hexdigest()
+        return self._template_fingerprint
+
+    def symbols(self) -> Dict[Tuple[int, int], str]:
+        """Parameter name at each symbolic (gate, slot)"""
+        gates, slots, indices = self.sites
+        return {(gate, slot): self.parameters[index] for gate, slot, index in zip(gates.tolist(), slots.tolist(), indices.tolist())}
+
+    def bind(self, bindings: Sequence[Sequence[float]]) -> List[CircuitIR]:
+        """Bind a whole sweep at once: one row of values per job, in ``parameters`` order.
+
+        The bound circuits share this template's opcode and qubit columns.
+        """
+        try:
+            values = np.asarray(bindings, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise CircuitValidationError(["parameter_bindings must be rows of numbers"])
+        if values.ndim != 2 or values.shape[1] != len(self.parameters):
+            raise CircuitValidationError([
+                f"each parameter binding needs {len(self.parameters)} value(s): {', '.join(self.parameters) or 'none'}"
+            ])
+        not_finite = np.flatnonzero(~np.isfinite(values).all(axis=1))
+        if len(not_finite):
+            raise CircuitValidationError([f"binding {index}: values must be finite" for index in not_finite[:20]])
+        gates, slots, indices = self.sites
+        params = np.repeat(self.params[None], len(values), axis=0)
+        params[:, gates, slots] = values[:, indices]
+        return [
+            CircuitIR(self.num_qubits, self.opcodes, self.qubits, params[row], self.metadata, self, values[row])
+            for row in range(len(values))
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        circuit = super().to_dict()
+        gates = circuit["gates"] = [dict(gate) for gate in circuit["gates"]]
+        for (gate, slot), name in self.symbols().items():
+            gates[gate]["params"] = [*gates[gate]["params"]]
+            gates[gate]["params"][slot] = name
+        return {**circuit, "parameters": self.parameters}
+
+class TemplateRegistry:
+    """Registered templates by ID, persisted through the job store's circuit blobs so all workers see them"""
+    KEY_PREFIX = "template:"
+
+    def __init__(self, job_store: Any, max_cached: int = 1024):
+        self.job_store = job_store
+        self.max_cached = max_cached
+        self._templates: "OrderedDict[str, CircuitTemplate]" = OrderedDict()
+
+    async def register(self, circuit_data: Dict[str, Any]) -> CircuitTemplate:
+        template = CircuitTemplate.from_dict(circuit_data)
+        template.validate()
+        if template.template_id not in self._templates:
+            await self.job_store.put_circuit(self.KEY_PREFIX + template.template_id, template.to_dict())
+        self._remember(template)
+        return template
+
+    async def get(self, template_id: str) -> CircuitTemplate:
+        template = self._templates.get(template_id)
+        if template is None:
+            circuit_data = await self.job_store.get_circuit(self.KEY_PREFIX + template_id)
+            if circuit_data is None:
+                raise TemplateNotFoundError(f"Template {template_id} not found")
+            template = CircuitTemplate.from_dict(circuit_data)
+        self._remember(template)
+        return template
+
+    def _remember(self, template: CircuitTemplate):
+        self._templates[template.template_id] = template
+        self._templates.move_to_end(template.template_id)
+        if len(self._templates) > self.max_cached:
+            self._templates.popitem(last=False)
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Tuple, Union
+import numpy as np
+from .ir import CircuitIR, CircuitValidationError
+from .templates import CircuitTemplate
+
+def _operands(circuit: CircuitIR) -> Tuple[List[str], List[List[int]], List[List[Union[float, str]]]]:
+    """Gate names, qubits and parameters as lists; template parameters appear as their names"""
+    names = circuit.gate_names().tolist()
+    qubits = [[qubit for qubit in row if qubit >= 0] for row in circuit.qubits.tolist()]
+    params: List[List[Union[float, str]]] = [[value for value in row if value == value] for row in circuit.params.tolist()]
+    if isinstance(circuit, CircuitTemplate):
+        for (gate, slot), name in circuit.symbols().items():
+            params[gate][slot] = name
+    return names, qubits, params
+
+def _parameters(circuit: CircuitIR) -> List[str]:
+    return circuit.parameters if isinstance(circuit, CircuitTemplate) else []
+
+def emit_qiskit(circuit: CircuitIR) -> Dict[str, Any]:
+    """One Qobj QASM experiment; template parameters stay symbolic for the run's parameter_binds"""
+    instructions = []
+    for name, targets, values in zip(*_operands(circuit)):
+        instruction: Dict[str, Any] = {"name": name, "qubits": targets}
+        if values:
+            instruction["params"] = values
+        if name == "measure":
+            instruction["memory"] = targets
+        instructions.append(instruction)
+    return {
+        "instructions": instructions,
+        "header": {"n_qubits": circuit.num_qubits, "memory_slots": circuit.num_qubits}
+    }
+
+def assign_moments(circuit: CircuitIR) -> np.ndarray:
+    """Earliest moment each gate can run in, given the gates before it on the same qubits"""
+    moments = np.empty(len(circuit), dtype=np.int64)
+    next_free = [0] * max(circuit.num_qubits, 1)
+    for index, row in enumerate(circuit.qubits.tolist()):
+        targets = [qubit for qubit in row if qubit >= 0]
+        moment = max(next_free[qubit] for qubit in targets) if targets else 0
+        moments[index] = moment
+        for qubit in targets:
+            next_free[qubit] = moment + 1
+    return moments
+
+def emit_cirq(circuit: CircuitIR) -> Dict[str, Any]:
+    """Moment-by-moment circuit in the Quantum Engine JSON layout, with template parameters as sweep symbols"""
+    moments = assign_moments(circuit)
+    layers: List[List[Dict[str, Any]]] = [[] for _ in range(int(moments.max()) + 1 if len(moments) else 0)]
+    for moment, (name, targets, values) in zip(moments.tolist(), zip(*_operands(circuit))):
+        operation: Dict[str, Any] = {"gate": {"id": name}, "qubits": [{"id": f"q{qubit}"} for qubit in targets]}
+        if values:
+            operation["args"] = {"params": [{"symbol": value} if isinstance(value, str) else value for value in values]}
+        layers[moment].append(operation)
+    return {
+        "scheduling_strategy": "MOMENT_BY_MOMENT",
+        "moments": [{"operations": operations} for operations in layers]
+    }
+
+_QSHARP_GATES: Dict[str, str] = {
+    "id": "I({0});", "h": "H({0});", "x": "X({0});", "y": "Y({0});", "z": "Z({0});",
+    "s": "S({0});", "sdg": "Adjoint S({0});", "t": "T({0});", "tdg": "Adjoint T({0});",
+    "sx": "Rx(PI() / 2.0, {0});", "sxdg": "Rx(-PI() / 2.0, {0});",
+    "rx": "Rx({p0}, {0});", "ry": "Ry({p0}, {0});", "rz": "Rz({p0}, {0});",
+    "p": "R1({p0}, {0});", "u1": "R1({p0}, {0});",
+    "u2": "Rz({p1}, {0}); Ry(PI() / 2.0, {0}); Rz({p0}, {0});",
+    "u3": "Rz({p2}, {0}); Ry({p0}, {0}); Rz({p1}, {0});",
+    "u": "Rz({p2}, {0}); Ry({p0}, {0}); Rz({p1}, {0});",
+    "reset": "Reset({0});",
+    "cx": "CNOT({0}, {1});", "cy": "Controlled Y([{0}], {1});", "cz": "CZ({0}, {1});",
+    "ch": "Controlled H([{0}], {1});", "swap": "SWAP({0}, {1});",
+    "crx": "Controlled Rx([{0}], ({p0}, {1}));", "cry": "Controlled Ry([{0}], ({p0}, {1}));",
+    "crz": "Controlled Rz([{0}], ({p0}, {1}));", "cp": "Controlled R1([{0}], ({p0}, {1}));",
+    "rxx": "Rxx({p0}, {0}, {1});", "ryy": "Ryy({p0}, {0}, {1});", "rzz": "Rzz({p0}, {0}, {1});",
+    "ccx": "CCNOT({0}, {1}, {2});", "cswap": "Controlled SWAP([{0}], ({1}, {2}));"
+}
+
+def emit_qsharp(circuit: CircuitIR) -> Dict[str, Any]:
+    """Q# entry point that applies the gates and measures every qubit; template parameters become its arguments"""
+    body = []
+    for index, (name, targets, values) in enumerate(zip(*_operands(circuit))):
+        if name == "measure":
+            continue
+        template = _QSHARP_GATES.get(name)
+        if template is None:
+            raise CircuitValidationError([f"gate {index}: '{name}' has no Q# equivalent"])
+        body.append("        " + template.format(
+            *(f"q[{qubit}]" for qubit in targets),
+            **{f"p{position}": value if isinstance(value, str) else repr(float(value)) for position, value in enumerate(values)}
+        ))
+    source = "\n".join([
+        "namespace QuantumBridge {",
+        "    open Microsoft.Quantum.Intrinsic;",
+        "    open Microsoft.Quantum.Math;",
+        "    open Microsoft.Quantum.Measurement;",
+        "",
+        "    @EntryPoint()",
+        f"    operation Main({', '.join(f'{name} : Double' for name in _parameters(circuit))}) : Result[] {{",
+        f"        use q = Qubit[{circuit.num_qubits}];",
+        *body,
+        "        return MResetEachZ(q);",
+        "    }",
+        "}"
+    ])
+    return {"source": source, "entry_point": "QuantumBridge.Main", "num_qubits": circuit.num_qubits}
+
+EMITTERS: Dict[str, Callable[[CircuitIR], Dict[str, Any]]] = {
+    "qiskit": emit_qiskit,
+    "cirq": emit_cirq,
+    "qsharp": emit_qsharp
+}
+
+class TranspileCache:
+    """LRU of emitted circuits keyed by circuit fingerprint and target format"""
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_emit(self, circuit: CircuitIR, target: str) -> Dict[str, Any]:
+        key = (circuit.fingerprint, target)
+        emitted = self._entries.get(key)
+        if emitted is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return emitted
+        self.misses += 1
+        emitted = EMITTERS[target](circuit)
+        self._entries[key] = emitted
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return emitted
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0
+        }
+
+TRANSPILE_CACHE = TranspileCache()
+
+def transpile(circuit: Union[CircuitIR, Dict[str, Any]], target: str) -> Dict[str, Any]:
+    """Emit a circuit for a target format, reusing earlier output for the same circuit.
+
+    The returned dict is shared with the cache and must not be modified.
+    """
+    return TRANSPILE_CACHE.get_or_emit(CircuitIR.coerce(circuit), target)
@@ -1,7 +1,19 @@
-from typing import Dict, Optional
-from dataclasses import dataclass
+import bisect
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
+# Upper bounds in seconds, shared by the windowed stats and the exported Prometheus histograms
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200, 14400, 43200, 86400
+)
+
+REQUEST_STAGE_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+DEFAULT_PROVIDERS = ("ibm", "google", "azure")
+
 @dataclass
 class JobMetrics:
     job_id: str
@@ -14,19 +26,157 @@ class JobMetrics:
     status: str = "pending"
     error_count: int = 0
 
+class Histogram:
+    """Fixed-bucket histogram; quantiles are interpolated within the matching bucket"""
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram"):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+@dataclass
+class _Slot:
+    start: float
+    counters: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    histograms: Dict[Tuple[str, str], Histogram] = field(default_factory=dict)
+
+class SlidingWindow:
+    """Counters and histograms kept in fixed time slots, so window queries cost O(slots), not O(jobs)"""
+    def __init__(self, window: timedelta = timedelta(hours=24), slot_seconds: float = 300.0):
+        self.slot_seconds = slot_seconds
+        self.max_slots = int(window.total_seconds() // slot_seconds) + 1
+        self.slots: deque = deque()
+
+    def _current(self) -> _Slot:
+        now = time.monotonic()
+        if not self.slots or now - self.slots[-1].start >= self.slot_seconds:
+            self.slots.append(_Slot(now - (now - self.slots[-1].start) % self.slot_seconds if self.slots else now))
+            while len(self.slots) > self.max_slots:
+                self.slots.popleft()
+        return self.slots[-1]
+
+    def increment(self, key: Tuple[str, str], amount: int = 1):
+        counters = self._current().counters
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, key: Tuple[str, str], value: float):
+        histograms = self._current().histograms
+        if key not in histograms:
+            histograms[key] = Histogram()
+        histograms[key].observe(value)
+
+    def _recent(self, window: timedelta) -> List[_Slot]:
+        cutoff = time.monotonic() - window.total_seconds()
+        return [slot for slot in self.slots if slot.start + self.slot_seconds > cutoff]
+
+    def totals(self, window: timedelta) -> Tuple[Dict[Tuple[str, str], int], Dict[Tuple[str, str], Histogram]]:
+        counters: Dict[Tuple[str, str], int] = {}
+        histograms: Dict[Tuple[str, str], Histogram] = {}
+        for slot in self._recent(window):
+            for key, count in slot.counters.items():
+                counters[key] = counters.get(key, 0) + count
+            for key, histogram in slot.histograms.items():
+                if key not in histograms:
+                    histograms[key] = Histogram()
+                histograms[key].merge(histogram)
+        return counters, histograms
+
 class QuantumGatewayMonitoring:
-    def __init__(self):
-        self.job_metrics: Dict[str, JobMetrics] = {}
+    """Job, cache and webhook metrics kept as incremental aggregates.
+
+    Per-job records are only kept until the job finishes or ``job_retention`` passes; provider
+    and algorithm statistics come from counters, all-time histograms and a sliding window, so
+    reading them costs the same however many jobs have been recorded.
+    """
+    def __init__(
+        self,
+        job_retention: timedelta = timedelta(hours=24),
+        max_tracked_jobs: int = 1_000_000,
+        window: timedelta = timedelta(hours=24),
+        slot_seconds: float = 300.0
+    ):
+        self.job_metrics: "OrderedDict[str, JobMetrics]" = OrderedDict()
+        self.job_retention = job_retention
+        self.max_tracked_jobs = max_tracked_jobs
+        self.window = SlidingWindow(window, slot_seconds)
+        self.job_counters: Dict[Tuple[str, str, str], int] = {}
+        self.algorithm_providers: Dict[str, Dict[str, int]] = {}
+        self.latency_histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.algorithm_execution: Dict[str, Histogram] = {}
         self.provider_stats: Dict[str, Dict] = {}
+        self.cache_stats: Dict[str, Dict[str, int]] = {}
+        self.webhook_stats: Dict[str, float] = {
+            "delivered": 0,
+            "failed": 0,
+            "total_latency_seconds": 0.0,
+            "max_latency_seconds": 0.0,
+            "queue_depth": 0,
+            "max_queue_depth": 0
+        }
+        self.webhook_latency = Histogram()
+        self.request_stages: Dict[Tuple[str, str], Histogram] = {}
         self.system_start_time = datetime.now()
 
+    def _expire_jobs(self, now: datetime):
+        cutoff = now - self.job_retention
+        while self.job_metrics:
+            oldest = next(iter(self.job_metrics.values()))
+            if oldest.submission_time >= cutoff and len(self.job_metrics) <= self.max_tracked_jobs:
+                break
+            self.job_metrics.popitem(last=False)
+
+    def _count(self, provider: str, algorithm_type: str, event: str):
+        key = (provider, algorithm_type, event)
+        self.job_counters[key] = self.job_counters.get(key, 0) + 1
+        self.window.increment((provider, event))
+
+    def _observe(self, provider: str, kind: str, seconds: float):
+        key = (provider, kind)
+        if key not in self.latency_histograms:
+            self.latency_histograms[key] = Histogram()
+        self.latency_histograms[key].observe(seconds)
+        self.window.observe(key, seconds)
+
     def record_job_submission(self, job_id: str, provider: str, algorithm_type: str):
+        now = datetime.now()
+        self._expire_jobs(now)
         self.job_metrics[job_id] = JobMetrics(
             job_id=job_id,
             provider=provider,
             algorithm_type=algorithm_type,
-            submission_time=datetime.now()
+            submission_time=now
         )
+        self._count(provider, algorithm_type, "submitted")
+        providers = self.algorithm_providers.setdefault(algorithm_type, {})
+        providers[provider] = providers.get(provider, 0) + 1
 
     def record_job_status_change(self, job_id: str, new_status: str):
         if job_id not in self.job_metrics:
@@ -37,73 +187,122 @@ class QuantumGatewayMonitoring:
         now = datetime.now()
         if old_status == "pending" and new_status == "running":
             metrics.queue_time = (now - metrics.submission_time).total_seconds()
+            self._observe(metrics.provider, "queue", metrics.queue_time)
         if new_status in ["completed", "failed", "cancelled"]:
             metrics.total_time = (now - metrics.submission_time).total_seconds()
             if metrics.queue_time:
                 metrics.execution_time = metrics.total_time - metrics.queue_time
+                self._observe(metrics.provider, "execution", metrics.execution_time)
+                if new_status == "completed":
+                    histogram = self.algorithm_execution.setdefault(metrics.algorithm_type, Histogram())
+                    histogram.observe(metrics.execution_time)
+            self._observe(metrics.provider, "total", metrics.total_time)
+            self._count(metrics.provider, metrics.algorithm_type, new_status)
+            # Finished jobs only live on in the aggregates
+            del self.job_metrics[job_id]
+
+    def record_scheduler_wait(self, provider: str, seconds: float):
+        self._observe(provider, "scheduler_wait", seconds)
 
     def record_job_error(self, job_id: str, error: str):
         if job_id in self.job_metrics:
-            self.job_metrics[job_id].error_count += 1
+            metrics = self.job_metrics[job_id]
+            metrics.error_count += 1
+            self._count(metrics.provider, metrics.algorithm_type, "error")
+
+    def record_cache_event(self, cache_name: str, event: str):
+        counters = self.cache_stats.setdefault(cache_name, {"hit": 0, "miss": 0, "eviction": 0})
+        counters[event] = counters.get(event, 0) + 1
+
+    def get_cache_statistics(self) -> Dict:
+        stats = {}
+        for cache_name, counters in self.cache_stats.items():
+            lookups = counters["hit"] + counters["miss"]
+            stats[cache_name] = {
+                "hits": counters["hit"],
+                "misses": counters["miss"],
+                "evictions": counters["eviction"],
+                "hit_rate": counters["hit"] / lookups if lookups else 0
+            }
+        return stats
+
+    def record_webhook_delivery(self, latency_seconds: float, delivered: bool):
+        stats = self.webhook_stats
+        if delivered:
+            stats["delivered"] += 1
+            stats["total_latency_seconds"] += latency_seconds
+            stats["max_latency_seconds"] = max(stats["max_latency_seconds"], latency_seconds)
+            self.webhook_latency.observe(latency_seconds)
+        else:
+            stats["failed"] += 1
+
+    def record_webhook_queue_depth(self, depth: int):
+        self.webhook_stats["queue_depth"] = depth
+        self.webhook_stats["max_queue_depth"] = max(self.webhook_stats["max_queue_depth"], depth)
+
+    def get_webhook_statistics(self) -> Dict:
+        stats = self.webhook_stats
+        return {
+            "delivered": stats["delivered"],
+            "failed": stats["failed"],
+            "avg_latency_seconds": stats["total_latency_seconds"] / stats["delivered"] if stats["delivered"] else None,
+            "max_latency_seconds": stats["max_latency_seconds"],
+            "p95_latency_seconds": self.webhook_latency.quantile(0.95),
+            "queue_depth": stats["queue_depth"],
+            "max_queue_depth": stats["max_queue_depth"]
+        }
+
+    def record_request_trace(self, trace) -> None:
+        """Add the stage timings of a sampled request trace to the per-route stage histograms"""
+        for record in trace.spans:
+            if record.end is None:
+                continue
+            key = (trace.name, record.name)
+            if key not in self.request_stages:
+                self.request_stages[key] = Histogram(REQUEST_STAGE_BUCKETS)
+            self.request_stages[key].observe(record.end - record.start)
 
     def get_provider_statistics(self, time_window: timedelta = timedelta(hours=24)) -> Dict:
-        cutoff_time = datetime.now() - time_window
-        recent_jobs = [
-            metrics for metrics in self.job_metrics.values()
-            if metrics.submission_time >= cutoff_time
-        ]
+        """Jobs submitted and finished per provider within the window (at slot granularity)"""
+        counters, histograms = self.window.totals(time_window)
+        providers = list(DEFAULT_PROVIDERS) + sorted({key[0] for key in counters} - set(DEFAULT_PROVIDERS))
         stats = {}
-        for provider in ["ibm", "google", "azure"]:
-            provider_jobs = [job for job in recent_jobs if job.provider == provider]
-            if provider_jobs:
-                completed_jobs = [job for job in provider_jobs if job.status == "completed"]
-                failed_jobs = [job for job in provider_jobs if job.status == "failed"]
-                avg_queue_time = None
-                avg_execution_time = None
-                if completed_jobs:
-                    queue_times = [job.queue_time for job in completed_jobs if job.queue_time]
-                    exec_times = [job.execution_time for job in completed_jobs if job.execution_time]
-                    if queue_times:
-                        avg_queue_time = sum(queue_times) / len(queue_times)
-                    if exec_times:
-                        avg_execution_time = sum(exec_times) / len(exec_times)
-                stats[provider] = {
-                    "total_jobs": len(provider_jobs),
-                    "completed_jobs": len(completed_jobs),
-                    "failed_jobs": len(failed_jobs),
-                    "success_rate": len(completed_jobs) / len(provider_jobs) if provider_jobs else 0,
-                    "avg_queue_time_seconds": avg_queue_time,
-                    "avg_execution_time_seconds": avg_execution_time,
-                    "error_rate": sum(job.error_count for job in provider_jobs) / len(provider_jobs) if provider_jobs else 0
-                }
-            else:
-                stats[provider] = {
-                    "total_jobs": 0,
-                    "completed_jobs": 0,
-                    "failed_jobs": 0,
-                    "success_rate": 0,
-                    "avg_queue_time_seconds": None,
-                    "avg_execution_time_seconds": None,
-                    "error_rate": 0
-                }
+        for provider in providers:
+            submitted = counters.get((provider, "submitted"), 0)
+            completed = counters.get((provider, "completed"), 0)
+            failed = counters.get((provider, "failed"), 0)
+            finished = completed + failed + counters.get((provider, "cancelled"), 0)
+            queue = histograms.get((provider, "queue"), Histogram())
+            execution = histograms.get((provider, "execution"), Histogram())
+            stats[provider] = {
+                "total_jobs": submitted,
+                "completed_jobs": completed,
+                "failed_jobs": failed,
+                "success_rate": completed / finished if finished else 0,
+                "avg_queue_time_seconds": queue.mean,
+                "avg_execution_time_seconds": execution.mean,
+                "p50_queue_time_seconds": queue.quantile(0.5),
+                "p95_queue_time_seconds": queue.quantile(0.95),
+                "p99_queue_time_seconds": queue.quantile(0.99),
+                "p50_execution_time_seconds": execution.quantile(0.5),
+                "p95_execution_time_seconds": execution.quantile(0.95),
+                "p99_execution_time_seconds": execution.quantile(0.99),
+                "error_rate": counters.get((provider, "error"), 0) / submitted if submitted else 0
+            }
         return stats
 
     def get_algorithm_statistics(self) -> Dict:
         algorithm_stats = {}
-        for metrics in self.job_metrics.values():
-            algo = metrics.algorithm_type
+        for (provider, algo, event), count in self.job_counters.items():
             if algo not in algorithm_stats:
                 algorithm_stats[algo] = {
                     "total_jobs": 0,
                     "completed_jobs": 0,
-                    "avg_execution_time": None,
-                    "preferred_providers": {}
+                    "avg_execution_time": self.algorithm_execution[algo].mean if algo in self.algorithm_execution else None,
+                    "preferred_providers": dict(self.algorithm_providers.get(algo, {}))
                 }
-            algorithm_stats[algo]["total_jobs"] += 1
-            if metrics.status == "completed":
-                algorithm_stats[algo]["completed_jobs"] += 1
-            provider = metrics.provider
-            if provider not in algorithm_stats[algo]["preferred_providers"]:
-                algorithm_stats[algo]["preferred_providers"][provider] = 0
-            algorithm_stats[algo]["preferred_providers"][provider] += 1
+            if event == "submitted":
+                algorithm_stats[algo]["total_jobs"] += count
+            elif event == "completed":
+                algorithm_stats[algo]["completed_jobs"] += count
         return algorithm_stats
@@ -0,0 +1,84 @@
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from .metrics import QuantumGatewayMonitoring, Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class PrometheusWriter:
+    """Builds a Prometheus text exposition, one metric family at a time"""
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, metric_type: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+
+    def sample(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None):
+        if labels:
+            label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            self.lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+        else:
+            self.lines.append(f"{name} {_format_value(value)}")
+
+    def histogram(self, name: str, histogram: Histogram, labels: Optional[Dict[str, Any]] = None):
+        labels = labels or {}
+        cumulative = 0
+        for bound, count in zip(list(histogram.buckets) + [float("inf")], histogram.counts):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, {**labels, "le": _format_value(float(bound))})
+        self.sample(f"{name}_sum", histogram.sum, labels)
+        self.sample(f"{name}_count", histogram.count, labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+def write_monitoring_metrics(writer: PrometheusWriter, monitoring: QuantumGatewayMonitoring):
+    writer.family("quantum_jobs_total", "counter", "Job lifecycle events by provider, algorithm and event")
+    for (provider, algorithm, event), count in sorted(monitoring.job_counters.items()):
+        writer.sample("quantum_jobs_total", count, {"provider": provider, "algorithm": algorithm, "event": event})
+    writer.family("quantum_jobs_tracked", "gauge", "Unfinished jobs with a per-job metrics record")
+    writer.sample("quantum_jobs_tracked", len(monitoring.job_metrics))
+    for kind, help_text in (
+        ("queue", "Time from submission until the job started running"),
+        ("execution", "Time from start of execution until the job finished"),
+        ("total", "Time from submission until the job finished"),
+        ("scheduler_wait", "Time jobs waited in the gateway scheduler before provider submission")
+    ):
+        name = f"quantum_job_{kind}_seconds"
+        writer.family(name, "histogram", help_text)
+        for (provider, histogram_kind), histogram in sorted(monitoring.latency_histograms.items()):
+            if histogram_kind == kind:
+                writer.histogram(name, histogram, {"provider": provider})
+    writer.family("quantum_request_stage_seconds", "histogram", "Time per stage of sampled API requests")
+    for (route, stage), histogram in sorted(monitoring.request_stages.items()):
+        writer.histogram("quantum_request_stage_seconds", histogram, {"route": route, "stage": stage})
+    writer.family("quantum_cache_events_total", "counter", "Cache lookups and evictions")
+    for cache_name, counters in sorted(monitoring.cache_stats.items()):
+        for event, count in sorted(counters.items()):
+            writer.sample("quantum_cache_events_total", count, {"cache": cache_name, "event": event})
+    webhook_stats = monitoring.webhook_stats
+    writer.family("quantum_webhook_deliveries_total", "counter", "Webhook and email notifications by outcome")
+    writer.sample("quantum_webhook_deliveries_total", webhook_stats["delivered"], {"outcome": "delivered"})
+    writer.sample("quantum_webhook_deliveries_total", webhook_stats["failed"], {"outcome": "failed"})
+    writer.family("quantum_webhook_delivery_seconds", "histogram", "Time from enqueue to successful delivery")
+    writer.histogram("quantum_webhook_delivery_seconds", monitoring.webhook_latency)
+    writer.family("quantum_webhook_queue_depth", "gauge", "Notifications waiting in the intake queue")
+    writer.sample("quantum_webhook_queue_depth", webhook_stats["queue_depth"])
+
+def write_gauges(
+    writer: PrometheusWriter,
+    name: str,
+    help_text: str,
+    samples: Iterable[Tuple[Dict[str, Any], float]],
+    metric_type: str = "gauge"
+):
+    writer.family(name, metric_type, help_text)
+    for labels, value in samples:
+        writer.sample(name, value, labels)
@@ -0,0 +1,285 @@
+import json
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+@dataclass
+class Trace:
+    trace_id: str
+    name: str
+    start: float = field(default_factory=time.perf_counter)
+    wall_start: float = field(default_factory=time.time)
+    spans: List[Span] = field(default_factory=list)
+    parent_span_id: Optional[str] = None
+    end: Optional[float] = None
+
+    def add_span(self, name: str, start: float, end: float, parent_id: Optional[str] = None, **attributes) -> Span:
+        span = Span(name, secrets.token_hex(8), parent_id, start, end, attributes)
+        self.spans.append(span)
+        return span
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start": self.wall_start,
+            "duration_ms": ((self.end or time.perf_counter()) - self.start) * 1000,
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "offset_ms": (span.start - self.start) * 1000,
+                    "duration_ms": span.duration * 1000,
+                    **({"attributes": span.attributes} if span.attributes else {})
+                }
+                for span in self.spans
+            ]
+        }
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Time a block as a child of the current span; a no-op outside a sampled request"""
+    trace = current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = current_span.get()
+    record = trace.add_span(name, time.perf_counter(), None, parent.span_id if parent else None, **attributes)
+    token = current_span.set(record)
+    try:
+        yield record
+    finally:
+        record.end = time.perf_counter()
+        current_span.reset(token)
+
+def span_since_start(name: str):
+    """Record a span from the start of the request until now (e.g. body parsing and validation)"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add_span(name, trace.start, time.perf_counter())
+
+def trace_headers() -> Dict[str, str]:
+    """W3C traceparent for the current span, for propagation to outgoing provider calls"""
+    trace = current_trace.get()
+    if trace is None:
+        return {}
+    parent = current_span.get()
+    span_id = parent.span_id if parent else secrets.token_hex(8)
+    return {"traceparent": f"00-{trace.trace_id}-{span_id}-01"}
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    parts = (header or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+class JsonLinesExporter:
+    """Appends one JSON document per finished trace to a file"""
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace):
+        line = json.dumps(trace.to_dict())
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+class OpenTelemetryExporter:
+    """Replays finished traces as OpenTelemetry spans, keeping the gateway's trace ID.
+
+    Needs ``opentelemetry-sdk`` and ``opentelemetry-exporter-otlp``; spans go to an OTLP collector.
+    """
+    def __init__(self, endpoint: Optional[str] = None, service_name: str = "quantumbridge-gateway"):
+        try:
+            from opentelemetry import trace as otel_trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise RuntimeError(
+                "OpenTelemetry export requires opentelemetry-sdk and opentelemetry-exporter-otlp"
+            ) from e
+        self._otel_trace = otel_trace
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()))
+        self._provider = provider
+        self._tracer = provider.get_tracer("quantumbridge")
+
+    def export(self, trace: Trace):
+        otel_trace = self._otel_trace
+        to_ns = lambda perf: int((trace.wall_start + perf - trace.start) * 1e9)
+        parent = otel_trace.NonRecordingSpan(otel_trace.SpanContext(
+            trace_id=int(trace.trace_id, 16),
+            span_id=int(trace.parent_span_id or secrets.token_hex(8), 16),
+            is_remote=True,
+            trace_flags=otel_trace.TraceFlags(otel_trace.TraceFlags.SAMPLED)
+        ))
+        root = self._tracer.start_span(
+            trace.name, context=otel_trace.set_span_in_context(parent), start_time=to_ns(trace.start)
+        )
+        otel_spans = {None: root}
+        for record in sorted(trace.spans, key=lambda record: record.start):
+            otel_span = self._tracer.start_span(
+                record.name,
+                context=otel_trace.set_span_in_context(otel_spans.get(record.parent_id, root)),
+                start_time=to_ns(record.start),
+                attributes=record.attributes
+            )
+            otel_span.end(end_time=to_ns(record.end if record.end is not None else trace.end))
+            otel_spans[record.span_id] = otel_span
+        root.end(end_time=to_ns(trace.end))
+
+    def shutdown(self):
+        self._provider.shutdown()
+
+class Tracer:
+    """Samples requests into traces and hands finished ones to exporters and listeners"""
+    def __init__(self, sample_rate: float = 0.0, exporters: Optional[List[Any]] = None):
+        self.sample_rate = sample_rate
+        self.exporters = exporters or []
+        self.listeners: List[Callable[[Trace], None]] = []
+        self.recent: deque = deque(maxlen=100)
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        exporters: List[Any] = []
+        trace_file = os.getenv("TRACE_EXPORT_FILE")
+        if trace_file:
+            exporters.append(JsonLinesExporter(trace_file))
+        if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            exporters.append(OpenTelemetryExporter(os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"]))
+        return cls(float(os.getenv("TRACE_SAMPLE_RATE", "0.01")), exporters)
+
+    def start(self, name: str, traceparent: Optional[str] = None, force: bool = False) -> Optional[Trace]:
+        incoming = parse_traceparent(traceparent)
+        # An upstream sampled flag always gets traced so distributed traces stay complete
+        if not (force or (incoming and traceparent.endswith("-01")) or random.random() < self.sample_rate):
+            return None
+        trace_id, parent_span_id = incoming if incoming else (secrets.token_hex(16), None)
+        return Trace(trace_id, name, parent_span_id=parent_span_id)
+
+    def finish(self, trace: Trace):
+        trace.end = time.perf_counter()
+        self.recent.append(trace)
+        for listener in self.listeners:
+            listener(trace)
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+            except Exception:
+                continue
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            if hasattr(exporter, "shutdown"):
+                exporter.shutdown()
+
+class SamplingProfiler:
+    """Samples the event loop thread's stack while enabled and dumps folded stacks for slow requests.
+
+    The output is in the collapsed ``frame;frame;frame count`` format read by flamegraph.pl and speedscope.
+    All requests share the event loop thread, so a dump also contains stacks of requests that
+    overlapped with the slow one.
+    """
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        interval: float = 0.005,
+        threshold_seconds: float = 1.0,
+        max_samples: int = 200_000
+    ):
+        self.output_dir = output_dir or os.path.join(os.getcwd(), "profiles")
+        self.interval = interval
+        self.threshold_seconds = threshold_seconds
+        self.samples: deque = deque(maxlen=max_samples)
+        self.dumps: deque = deque(maxlen=100)
+        self._target_thread: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def enable(self, threshold_seconds: Optional[float] = None, interval: Optional[float] = None):
+        if threshold_seconds is not None:
+            self.threshold_seconds = threshold_seconds
+        if interval is not None:
+            self.interval = interval
+        if self.enabled:
+            return
+        self._target_thread = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="quantumbridge-profiler", daemon=True)
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.samples.clear()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples.append((time.perf_counter(), ";".join(reversed(stack))))
+
+    def request_finished(self, name: str, trace_id: str, start: float, end: float) -> Optional[str]:
+        """Write the stacks sampled during a slow request; returns the dump path"""
+        if not self.enabled or end - start < self.threshold_seconds:
+            return None
+        folded: Dict[str, int] = {}
+        for timestamp, stack in list(self.samples):
+            if start <= timestamp <= end:
+                folded[stack] = folded.get(stack, 0) + 1
+        if not folded:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{trace_id}.folded")
+        with open(path, "w") as f:
+            for stack, count in sorted(folded.items()):
+                f.write(f"{stack} {count}\n")
+        self.dumps.append({"path": path, "request": name, "trace_id": trace_id, "duration_ms": (end - start) * 1000})
+        return path
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "interval_seconds": self.interval,
+            "threshold_seconds": self.threshold_seconds,
+            "buffered_samples": len(self.samples),
+            "dumps": list(self.dumps)
+        }
@@ -0,0 +1 @@
+# notifications package init
\ No newline at end of file
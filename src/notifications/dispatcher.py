@@ -0,0 +1,257 @@
+import asyncio
+import random
+import smtplib
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+from urllib.parse import urlsplit
+import httpx
+from src.orchestration.status_poller import TERMINAL_STATUSES
+
+@dataclass
+class Notification:
+    target: str
+    payload: Dict[str, Any]
+    channel: str = "webhook"
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+class DeliveryError(Exception):
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class SMTPEmailSender:
+    """Sends notification emails through an SMTP relay on a worker thread"""
+    def __init__(self, host: str, port: int = 25, sender: str = "quantumbridge@localhost"):
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    async def __call__(self, address: str, payload: Dict[str, Any]):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = address
+        message["Subject"] = f"Quantum job {payload['job_id']} {payload['status']}"
+        message.set_content(
+            f"Job {payload['job_id']} on {payload['provider']} finished with status {payload['status']}."
+        )
+        def send():
+            with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+                smtp.send_message(message)
+        await asyncio.to_thread(send)
+
+class NotificationDispatcher:
+    """Delivers webhooks (and optional emails) when jobs reach a terminal state.
+
+    Notifications go through a bounded intake queue and are routed to a backlog per receiving
+    host. Each host is served by its own small set of workers, so a slow receiver only delays
+    its own deliveries. Notifications for the same URL that are ready together are sent as one
+    batched payload. Failed deliveries are retried with exponential backoff and jitter, then
+    moved to a bounded dead-letter store.
+    """
+    def __init__(
+        self,
+        orchestrator: Any,
+        monitoring: Any = None,
+        queue_size: int = 10_000,
+        host_backlog_size: int = 1_000,
+        per_host_concurrency: int = 4,
+        batch_size: int = 50,
+        batch_window: float = 0.05,
+        max_attempts: int = 5,
+        base_backoff: float = 0.5,
+        max_backoff: float = 60.0,
+        request_timeout: float = 10.0,
+        dead_letter_size: int = 1_000,
+        email_sender: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self.orchestrator = orchestrator
+        self.monitoring = monitoring
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.host_backlog_size = host_backlog_size
+        self.per_host_concurrency = per_host_concurrency
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.request_timeout = request_timeout
+        self.dead_letters: deque = deque(maxlen=dead_letter_size)
+        self.email_sender = email_sender
+        self._client = http_client
+        self._owns_client = http_client is None
+        self._host_queues: Dict[str, asyncio.Queue] = {}
+        self._host_workers: Dict[str, List[asyncio.Task]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._subscription = None
+        self.delivered = 0
+        self.failed = 0
+
+    async def start(self):
+        if self._tasks:
+            return
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.request_timeout,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+            )
+        self._subscription = self.orchestrator.events.subscribe()
+        self._tasks = [
+            asyncio.create_task(self._consume_events()),
+            asyncio.create_task(self._route())
+        ]
+
+    async def stop(self):
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        tasks = self._tasks + [task for workers in self._host_workers.values() for task in workers]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._host_workers = {}
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def enqueue(self, notification: Notification) -> bool:
+        """Queue a notification without blocking; returns False if it had to be dead-lettered"""
+        try:
+            self.queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            self._dead_letter(notification, "queue full")
+            return False
+        self._record_queue_depth()
+        return True
+
+    async def _consume_events(self):
+        while True:
+            event = await self._subscription.get()
+            if event["status"] not in TERMINAL_STATUSES:
+                continue
+            try:
+                job_info = await self.orchestrator.job_store.get(event["job_id"])
+            except Exception:
+                continue
+            if job_info is None:
+                continue
+            payload = {**event, "job_name": (job_info.get("original_request") or {}).get("job_name")}
+            if job_info.get("webhook_url"):
+                self.enqueue(Notification(job_info["webhook_url"], payload))
+            if job_info.get("notification_email") and self.email_sender is not None:
+                self.enqueue(Notification(job_info["notification_email"], payload, channel="email"))
+
+    async def _route(self):
+        while True:
+            notification = await self.queue.get()
+            self._record_queue_depth()
+            host = urlsplit(notification.target).netloc if notification.channel == "webhook" else "email"
+            host_queue = self._host_queues.get(host)
+            if host_queue is None:
+                host_queue = self._host_queues[host] = asyncio.Queue(maxsize=self.host_backlog_size)
+            try:
+                host_queue.put_nowait(notification)
+            except asyncio.QueueFull:
+                self._dead_letter(notification, f"backlog for {host} full")
+                continue
+            workers = [task for task in self._host_workers.get(host, []) if not task.done()]
+            # Add parallel deliveries to a host only once its backlog exceeds what the busy workers batch
+            if not workers or (
+                len(workers) < self.per_host_concurrency and host_queue.qsize() > self.batch_size * len(workers)
+            ):
+                workers.append(asyncio.create_task(self._serve_host(host, host_queue)))
+            self._host_workers[host] = workers
+
+    async def _serve_host(self, host: str, host_queue: asyncio.Queue):
+        while not host_queue.empty():
+            batch = [host_queue.get_nowait()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(host_queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            by_target: Dict[tuple, List[Notification]] = {}
+            for notification in batch:
+                by_target.setdefault((notification.channel, notification.target), []).append(notification)
+            for (channel, target), notifications in by_target.items():
+                if channel == "email":
+                    for notification in notifications:
+                        await self._deliver(notification.target, [notification])
+                else:
+                    await self._deliver(target, notifications)
+
+    async def _deliver(self, target: str, notifications: List[Notification]):
+        channel = notifications[0].channel
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if channel == "email":
+                    await self.email_sender(target, notifications[0].payload)
+                else:
+                    await self._post_webhook(target, notifications)
+            except Exception as e:
+                retryable = getattr(e, "retryable", True)
+                if not retryable or attempt >= self.max_attempts:
+                    for notification in notifications:
+                        notification.attempts = attempt
+                        self._dead_letter(notification, str(e))
+                    return
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+                await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+                continue
+            now = time.monotonic()
+            for notification in notifications:
+                notification.attempts = attempt
+                self.delivered += 1
+                if self.monitoring is not None:
+                    self.monitoring.record_webhook_delivery(now - notification.enqueued_at, True)
+            return
+
+    async def _post_webhook(self, url: str, notifications: List[Notification]):
+        if len(notifications) == 1:
+            body = notifications[0].payload
+        else:
+            body = {"events": [notification.payload for notification in notifications]}
+        try:
+            response = await self._client.post(url, json=body)
+        except httpx.HTTPError as e:
+            raise DeliveryError(f"{type(e).__name__}: {e}")
+        if response.status_code >= 500 or response.status_code == 429:
+            raise DeliveryError(f"receiver returned {response.status_code}")
+        if response.status_code >= 400:
+            raise DeliveryError(f"receiver rejected delivery with {response.status_code}", retryable=False)
+
+    def _dead_letter(self, notification: Notification, reason: str):
+        self.failed += 1
+        self.dead_letters.append({
+            "target": notification.target,
+            "channel": notification.channel,
+            "payload": notification.payload,
+            "attempts": notification.attempts,
+            "reason": reason
+        })
+        if self.monitoring is not None:
+            self.monitoring.record_webhook_delivery(time.monotonic() - notification.enqueued_at, False)
+
+    def _record_queue_depth(self):
+        if self.monitoring is not None:
+            self.monitoring.record_webhook_queue_depth(self.queue.qsize())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "host_backlogs": {host: queue.qsize() for host, queue in self._host_queues.items() if queue.qsize()},
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dead_letters": len(self.dead_letters)
+        }
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Dict, Any, Iterable, Optional, Set
+
+class StatusSubscription:
+    """Queue of status events for a changing set of job IDs (or all jobs)"""
+    def __init__(self, bus: "StatusEventBus", job_ids: Optional[Iterable[str]], max_queue_size: int):
+        self.bus = bus
+        self.job_ids: Optional[Set[str]] = set(job_ids) if job_ids is not None else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+
+    def add(self, job_ids: Iterable[str]):
+        job_ids = set(job_ids) - self.job_ids
+        self.job_ids |= job_ids
+        for job_id in job_ids:
+            self.bus._by_job.setdefault(job_id, set()).add(self)
+
+    def remove(self, job_ids: Iterable[str]):
+        for job_id in set(job_ids) & self.job_ids:
+            self.job_ids.discard(job_id)
+            self.bus._discard(job_id, self)
+
+    def deliver(self, event: Dict[str, Any]):
+        # A slow consumer loses its oldest events instead of blocking the publisher
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+class StatusEventBus:
+    """In-process fan-out of normalized job status transitions"""
+    def __init__(self, max_queue_size: int = 256):
+        self.max_queue_size = max_queue_size
+        self._by_job: Dict[str, Set[StatusSubscription]] = {}
+        self._all: Set[StatusSubscription] = set()
+
+    def subscribe(self, job_ids: Optional[Iterable[str]] = None) -> StatusSubscription:
+        """Subscribe to the given jobs, or to every job when job_ids is None"""
+        subscription = StatusSubscription(self, None, self.max_queue_size)
+        if job_ids is None:
+            self._all.add(subscription)
+        else:
+            subscription.job_ids = set()
+            subscription.add(job_ids)
+        return subscription
+
+    def unsubscribe(self, subscription: StatusSubscription):
+        self._all.discard(subscription)
+        for job_id in subscription.job_ids or ():
+            self._discard(job_id, subscription)
+
+    def _discard(self, job_id: str, subscription: StatusSubscription):
+        subscribers = self._by_job.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._by_job[job_id]
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._all) + len({sub for subs in self._by_job.values() for sub in subs})
+
+    def publish(self, event: Dict[str, Any]):
+        for subscription in self._all:
+            subscription.deliver(event)
+        for subscription in self._by_job.get(event["job_id"], ()):
+            subscription.deliver(event)
@@ -0,0 +1,495 @@
+import asyncio
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
+from src.circuits.ir import circuit_to_dict
+
+class JobStore(ABC):
+    """Storage for job metadata rows, with circuit blobs kept apart from the hot row"""
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def flush(self):
+        pass
+
+    @abstractmethod
+    async def put(self, record: Dict[str, Any]):
+        """Insert or replace a job row keyed by record["job_id"]"""
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def update(self, job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Merge fields into an existing row and return the updated row"""
+        pass
+
+    @abstractmethod
+    async def put_circuit(self, job_id: str, circuit_data: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    async def get_circuit(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def find_by_external(self, provider_name: str, external_job_id: str) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def find_by_status(self, status: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def find_by_fingerprint(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Most recent job that actually ran at the provider for this circuit fingerprint"""
+        pass
+
+class InMemoryJobStore(JobStore):
+    def __init__(self):
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.circuits: Dict[str, Dict[str, Any]] = {}
+        self._by_external: Dict[Tuple[str, str], List[str]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._by_fingerprint: Dict[str, str] = {}
+
+    async def put(self, record: Dict[str, Any]):
+        job_id = record["job_id"]
+        if job_id in self.records:
+            self._unindex(self.records[job_id])
+        self.records[job_id] = record
+        self._index(record)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.records.get(job_id)
+
+    async def update(self, job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        record = self.records.get(job_id)
+        if record is None:
+            return None
+        self._unindex(record)
+        record.update(fields)
+        self._index(record)
+        return record
+
+    async def put_circuit(self, job_id: str, circuit_data: Dict[str, Any]):
+        self.circuits[job_id] = circuit_data
+
+    async def get_circuit(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.circuits.get(job_id)
+
+    async def find_by_external(self, provider_name: str, external_job_id: str) -> List[Dict[str, Any]]:
+        return [self.records[job_id] for job_id in self._by_external.get((provider_name, external_job_id), [])]
+
+    async def find_by_status(self, status: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        job_ids = list(islice(self._by_status.get(status, {}), limit))
+        return [self.records[job_id] for job_id in job_ids]
+
+    async def find_by_fingerprint(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        job_id = self._by_fingerprint.get(fingerprint)
+        return self.records.get(job_id) if job_id else None
+
+    def _index(self, record: Dict[str, Any]):
+        job_id = record["job_id"]
+        if record.get("external_job_id") is not None:
+            self._by_external.setdefault((record["provider_name"], record["external_job_id"]), []).append(job_id)
+        self._by_status.setdefault(record["status"], {})[job_id] = None
+        if record.get("fingerprint") and not record.get("deduplicated_from"):
+            self._by_fingerprint[record["fingerprint"]] = job_id
+
+    def _unindex(self, record: Dict[str, Any]):
+        job_id = record["job_id"]
+        key = (record["provider_name"], record.get("external_job_id"))
+        if job_id in self._by_external.get(key, []):
+            self._by_external[key].remove(job_id)
+            if not self._by_external[key]:
+                del self._by_external[key]
+        self._by_status.get(record["status"], {}).pop(job_id, None)
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+def encode_record(record: Dict[str, Any]) -> str:
+    return json.dumps(record, default=_encode_value, separators=(",", ":"))
+
+def decode_record(data: str) -> Dict[str, Any]:
+    return json.loads(data, object_hook=_decode_object)
+
+class BufferedJobStore(JobStore):
+    """Write-behind base: rows are buffered and written in batches by a background task.
+
+    Recently used rows are kept in a bounded LRU so status updates do not re-read the database.
+    """
+    def __init__(self, flush_interval: float = 0.05, batch_size: int = 500, hot_rows: int = 10_000):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.hot_rows = hot_rows
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_circuits: Dict[str, Dict[str, Any]] = {}
+        self._hot: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    async def start(self):
+        await self._connect()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        await self._disconnect()
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._pending and not self._pending_circuits:
+                return
+            records, self._pending = list(self._pending.values()), {}
+            circuits, self._pending_circuits = list(self._pending_circuits.items()), {}
+            try:
+                await self._write_batch(records, circuits)
+            except BaseException:
+                # Keep the batch for the next flush unless newer writes replaced it meanwhile
+                for record in records:
+                    self._pending.setdefault(record["job_id"], record)
+                for job_id, circuit_data in circuits:
+                    self._pending_circuits.setdefault(job_id, circuit_data)
+                raise
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                continue
+
+    def _buffer(self, record: Dict[str, Any]):
+        self._pending[record["job_id"]] = record
+        self._remember(record)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def _remember(self, record: Dict[str, Any]):
+        self._hot[record["job_id"]] = record
+        self._hot.move_to_end(record["job_id"])
+        while len(self._hot) > self.hot_rows:
+            self._hot.popitem(last=False)
+
+    async def put(self, record: Dict[str, Any]):
+        self._buffer(record)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        record = self._pending.get(job_id) or self._hot.get(job_id)
+        if record is not None:
+            return record
+        record = await self._fetch(job_id)
+        if record is not None:
+            self._remember(record)
+        return record
+
+    async def update(self, job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        record = await self.get(job_id)
+        if record is None:
+            return None
+        record.update(fields)
+        self._buffer(record)
+        return record
+
+    async def put_circuit(self, job_id: str, circuit_data: Dict[str, Any]):
+        self._pending_circuits[job_id] = circuit_data
+
+    async def get_circuit(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if job_id in self._pending_circuits:
+            return self._pending_circuits[job_id]
+        return await self._fetch_circuit(job_id)
+
+    async def find_by_external(self, provider_name: str, external_job_id: str) -> List[Dict[str, Any]]:
+        await self.flush()
+        return await self._query("provider_name = {} AND external_job_id = {}", (provider_name, external_job_id))
+
+    async def find_by_status(self, status: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        await self.flush()
+        return await self._query("status = {}", (status,), limit=limit)
+
+    async def find_by_fingerprint(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        await self.flush()
+        records = await self._query(
+            "fingerprint = {} AND deduplicated_from IS NULL", (fingerprint,), order_by="submitted_at DESC", limit=1
+        )
+        return records[0] if records else None
+
+    @abstractmethod
+    async def _connect(self):
+        pass
+
+    @abstractmethod
+    async def _disconnect(self):
+        pass
+
+    @abstractmethod
+    async def _write_batch(self, records: List[Dict[str, Any]], circuits: List[Tuple[str, Dict[str, Any]]]):
+        pass
+
+    @abstractmethod
+    async def _fetch(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def _fetch_circuit(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def _query(
+        self, where: str, params: tuple, order_by: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Select rows; ``where`` uses ``{}`` for each parameter placeholder"""
+        pass
+
+def _row_values(record: Dict[str, Any]) -> tuple:
+    submitted_at = record.get("submitted_at")
+    return (
+        record["job_id"],
+        record.get("provider_name"),
+        record.get("external_job_id"),
+        record.get("status"),
+        record.get("fingerprint"),
+        record.get("deduplicated_from"),
+        submitted_at.isoformat() if isinstance(submitted_at, datetime) else submitted_at,
+        encode_record(record)
+    )
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    provider_name TEXT,
+    external_job_id TEXT,
+    status TEXT,
+    fingerprint TEXT,
+    deduplicated_from TEXT,
+    submitted_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_external ON jobs (provider_name, external_job_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS idx_jobs_fingerprint ON jobs (fingerprint);
+CREATE TABLE IF NOT EXISTS job_circuits (
+    job_id TEXT PRIMARY KEY,
+    circuit TEXT NOT NULL
+);
+"""
+
+SQLITE_UPSERT = """
+INSERT INTO jobs (job_id, provider_name, external_job_id, status, fingerprint, deduplicated_from, submitted_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (job_id) DO UPDATE SET
+    provider_name = excluded.provider_name,
+    external_job_id = excluded.external_job_id,
+    status = excluded.status,
+    fingerprint = excluded.fingerprint,
+    deduplicated_from = excluded.deduplicated_from,
+    submitted_at = excluded.submitted_at,
+    data = excluded.data
+"""
+
+class SQLiteJobStore(BufferedJobStore):
+    """Local SQLite store; all database work runs on one background thread"""
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+        self._connection: Optional[sqlite3.Connection] = None
+
+    async def _run(self, fn, *args):
+        if self._connection is None:
+            await self._connect()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _connect(self):
+        if self._connection is not None:
+            return
+        def connect():
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SQLITE_SCHEMA)
+            return connection
+        self._connection = await asyncio.get_running_loop().run_in_executor(self._executor, connect)
+
+    async def _disconnect(self):
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await asyncio.get_running_loop().run_in_executor(self._executor, connection.close)
+
+    async def _write_batch(self, records: List[Dict[str, Any]], circuits: List[Tuple[str, Dict[str, Any]]]):
+        rows = [_row_values(record) for record in records]
+        circuit_rows = [(job_id, json.dumps(circuit_to_dict(circuit_data))) for job_id, circuit_data in circuits]
+        def write():
+            with self._connection:
+                self._connection.executemany(SQLITE_UPSERT, rows)
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO job_circuits (job_id, circuit) VALUES (?, ?)", circuit_rows
+                )
+        await self._run(write)
+
+    async def _fetch(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = await self._run(
+            lambda: self._connection.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        )
+        return decode_record(row[0]) if row else None
+
+    async def _fetch_circuit(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = await self._run(
+            lambda: self._connection.execute("SELECT circuit FROM job_circuits WHERE job_id = ?", (job_id,)).fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    async def _query(
+        self, where: str, params: tuple, order_by: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        sql = f"SELECT data FROM jobs WHERE {where.format(*(['?'] * len(params)))}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = await self._run(lambda: self._connection.execute(sql, params).fetchall())
+        return [decode_record(row[0]) for row in rows]
+
+POSTGRES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    provider_name TEXT,
+    external_job_id TEXT,
+    status TEXT,
+    fingerprint TEXT,
+    deduplicated_from TEXT,
+    submitted_at TIMESTAMP,
+    data JSONB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_external ON jobs (provider_name, external_job_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS idx_jobs_fingerprint ON jobs (fingerprint);
+CREATE TABLE IF NOT EXISTS job_circuits (
+    job_id TEXT PRIMARY KEY,
+    circuit JSONB NOT NULL
+);
+"""
+
+POSTGRES_UPSERT = """
+INSERT INTO jobs (job_id, provider_name, external_job_id, status, fingerprint, deduplicated_from, submitted_at, data)
+VALUES ($1, $2, $3, $4, $5, $6, $7::text::timestamp, $8::jsonb)
+ON CONFLICT (job_id) DO UPDATE SET
+    provider_name = EXCLUDED.provider_name,
+    external_job_id = EXCLUDED.external_job_id,
+    status = EXCLUDED.status,
+    fingerprint = EXCLUDED.fingerprint,
+    deduplicated_from = EXCLUDED.deduplicated_from,
+    submitted_at = EXCLUDED.submitted_at,
+    data = EXCLUDED.data
+"""
+
+class PostgresJobStore(BufferedJobStore):
+    """Postgres store backed by an asyncpg connection pool"""
+    def __init__(self, dsn: str, min_pool_size: int = 1, max_pool_size: int = 10, **kwargs):
+        super().__init__(**kwargs)
+        self.dsn = dsn
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self._pool = None
+
+    async def _connect(self):
+        if self._pool is not None:
+            return
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise RuntimeError("PostgresJobStore requires the 'asyncpg' package") from e
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=self.min_pool_size, max_size=self.max_pool_size)
+        async with self._pool.acquire() as connection:
+            await connection.execute(POSTGRES_SCHEMA)
+
+    async def _disconnect(self):
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
+
+    async def _acquire(self):
+        if self._pool is None:
+            await self._connect()
+        return self._pool.acquire()
+
+    async def _write_batch(self, records: List[Dict[str, Any]], circuits: List[Tuple[str, Dict[str, Any]]]):
+        async with await self._acquire() as connection:
+            async with connection.transaction():
+                if records:
+                    await connection.executemany(POSTGRES_UPSERT, [_row_values(record) for record in records])
+                if circuits:
+                    await connection.executemany(
+                        "INSERT INTO job_circuits (job_id, circuit) VALUES ($1, $2::jsonb) "
+                        "ON CONFLICT (job_id) DO UPDATE SET circuit = EXCLUDED.circuit",
+                        [(job_id, json.dumps(circuit_to_dict(circuit_data))) for job_id, circuit_data in circuits]
+                    )
+
+    async def _fetch(self, job_id: str) -> Optional[Dict[str, Any]]:
+        async with await self._acquire() as connection:
+            data = await connection.fetchval("SELECT data::text FROM jobs WHERE job_id = $1", job_id)
+        return decode_record(data) if data else None
+
+    async def _fetch_circuit(self, job_id: str) -> Optional[Dict[str, Any]]:
+        async with await self._acquire() as connection:
+            data = await connection.fetchval("SELECT circuit::text FROM job_circuits WHERE job_id = $1", job_id)
+        return json.loads(data) if data else None
+
+    async def _query(
+        self, where: str, params: tuple, order_by: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        sql = f"SELECT data::text FROM jobs WHERE {where.format(*(f'${i + 1}' for i in range(len(params))))}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        async with await self._acquire() as connection:
+            rows = await connection.fetch(sql, *params)
+        return [decode_record(row[0]) for row in rows]
+
+def create_job_store(url: Optional[str] = None) -> JobStore:
+    """Build a store from a URL: memory://, sqlite:///path/to/jobs.db, postgresql://... or redis://..."""
+    if not url or url.startswith("memory://"):
+        return InMemoryJobStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteJobStore(url[len("sqlite:///"):])
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresJobStore(url)
+    if url.startswith(("redis://", "rediss://")):
+        from src.orchestration.redis_state import RedisJobStore
+        return RedisJobStore.from_url(url)
+    raise ValueError(f"Unsupported job store URL: {url}")
@@ -1,59 +1,523 @@
+import asyncio
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from src.orchestration.status_normalizer import StatusNormalizer
+from src.orchestration.status_poller import StatusPoller, TERMINAL_STATUSES
+from src.orchestration.status_cache import StatusCache
+from src.orchestration.result_cache import ResultCache
+from src.orchestration.job_store import JobStore, InMemoryJobStore
+from src.orchestration.events import StatusEventBus
+
+class SubmissionError(Exception):
+    """Every provider in the failover list rejected or timed out the submission"""
+    def __init__(self, attempts: List[Dict[str, Any]]):
+        super().__init__("; ".join(f"{attempt['provider']}: {attempt['error']}" for attempt in attempts))
+        self.attempts = attempts
 
 class QuantumJobOrchestrator:
-    def __init__(self):
+    def __init__(
+        self,
+        monitoring: Optional[Any] = None,
+        status_cache: Optional[StatusCache] = None,
+        result_cache: Optional[ResultCache] = None,
+        job_store: Optional[JobStore] = None,
+        shared_state: Optional[Any] = None,
+        submit_timeout: float = 30.0,
+        latency_estimator: Optional[Callable[[str, Dict[str, Any]], Optional[float]]] = None
+    ):
         self.providers: Dict[str, Any] = {}
-        self.job_mappings: Dict[str, Dict[str, Any]] = {}
+        self.job_store = job_store or InMemoryJobStore()
+        self.shared_state = shared_state
+        self.monitoring = monitoring
+        self.status_cache = status_cache or StatusCache(monitoring=monitoring)
+        self.result_cache = result_cache or ResultCache(monitoring=monitoring)
+        self.poller = StatusPoller(self)
+        self.events = StatusEventBus()
+        self.submit_timeout = submit_timeout
+        # Estimates a provider's total time to result for a job config; used to report hedging savings
+        self.latency_estimator = latency_estimator
+        self._hedges: Dict[str, asyncio.Task] = {}
 
     def register_provider(self, name: str, provider: Any):
         self.providers[name] = provider
 
-    async def submit_job(self, provider_name: str, circuit_data: Dict[str, Any], job_config: Dict[str, Any]) -> str:
+    async def startup(self):
+        await self.job_store.start()
+        # Resume polling jobs that were still active when the previous process stopped
+        for status in ("queued", "initializing", "running"):
+            for job_info in await self.job_store.find_by_status(status, limit=100_000):
+                if job_info.get("external_job_id") is not None:
+                    self.poller.track(
+                        job_info["job_id"], status, job_info["provider_name"], job_info["external_job_id"]
+                    )
+        if self.shared_state is not None:
+            await self.shared_state.start(self)
+        await self.poller.start()
+
+    async def shutdown(self):
+        for task in self._hedges.values():
+            task.cancel()
+        await asyncio.gather(*self._hedges.values(), return_exceptions=True)
+        await self.poller.stop()
+        if self.shared_state is not None:
+            await self.shared_state.close()
+        await self.job_store.close()
+
+    async def should_poll(self) -> bool:
+        """With shared state only the leader worker polls providers; the others listen for its updates"""
+        return self.shared_state is None or await self.shared_state.is_leader()
+
+    def _on_remote_status(self, internal_job_id: str, provider_name: str, snapshot: Dict[str, Any]):
+        previous = self.status_cache.peek(internal_job_id)
+        self.status_cache.put(internal_job_id, provider_name, snapshot)
+        self.poller.track(internal_job_id, snapshot["status"])
+        previous_status = previous["status"] if previous else None
+        if previous_status != snapshot["status"]:
+            self._publish_transition(internal_job_id, previous_status, snapshot)
+
+    def _publish_transition(self, internal_job_id: str, previous_status: Optional[str], snapshot: Dict[str, Any]):
+        self.events.publish({
+            "job_id": internal_job_id,
+            "status": snapshot["status"],
+            "previous_status": previous_status,
+            "provider": snapshot["provider"],
+            "external_job_id": snapshot["external_job_id"],
+            "submitted_at": snapshot["submitted_at"],
+            "timestamp": datetime.now().isoformat()
+        })
+
+    async def _track(self, internal_job_id: str, status: str, provider_name: str, external_job_id: Optional[str]):
+        self.poller.track(internal_job_id, status, provider_name, external_job_id)
+        if self.shared_state is not None:
+            await self.shared_state.publish_track(internal_job_id, status, provider_name, external_job_id)
+
+    async def submit_job(
+        self,
+        provider_name: str,
+        circuit_data: Dict[str, Any],
+        job_config: Dict[str, Any],
+        deduplicate: bool = True,
+        metadata: Optional[Dict[str, Any]] = None,
+        fallback_providers: Optional[List[str]] = None,
+        hedge_after: Optional[float] = None,
+        internal_job_id: Optional[str] = None
+    ) -> str:
+        """Submit to ``provider_name``, failing over to ``fallback_providers`` in order.
+
+        With ``hedge_after`` set, a job that has not reached RUNNING after that many seconds is
+        also submitted to the next fallback provider; the first copy to complete wins and the
+        other one is cancelled. Passing the ``internal_job_id`` of a pending job submits it.
+        """
+        candidates = [provider_name] + [name for name in fallback_providers or [] if name != provider_name]
+        for name in candidates:
+            if name not in self.providers:
+                raise ValueError(f"Provider '{name}' not registered")
+        previous_status = "pending" if internal_job_id else None
+        internal_job_id = internal_job_id or str(uuid.uuid4())
+        attempts: List[Dict[str, Any]] = []
+        for index, name in enumerate(candidates):
+            provider = self.providers[name]
+            fingerprint = f"{name}:{provider.circuit_fingerprint(circuit_data, job_config)}"
+            if deduplicate and await self._attach_to_existing(
+                internal_job_id, fingerprint, circuit_data, job_config, metadata, previous_status
+            ):
+                return internal_job_id
+            try:
+                external_job_id = await asyncio.wait_for(provider.submit_job(circuit_data, job_config), self.submit_timeout)
+            except Exception as e:
+                attempts.append({"provider": name, "error": f"{type(e).__name__}: {e}"})
+                continue
+            attempts.append({"provider": name, "external_job_id": external_job_id})
+            await self._register_job(
+                internal_job_id, name, external_job_id, circuit_data, job_config, fingerprint,
+                {**(metadata or {}), "submission_attempts": attempts, "winning_attempt": len(attempts) - 1},
+                previous_status
+            )
+            if hedge_after is not None and index + 1 < len(candidates):
+                self._hedges[internal_job_id] = asyncio.create_task(self._hedge(
+                    internal_job_id, candidates[index + 1:], circuit_data, job_config, hedge_after
+                ))
+            return internal_job_id
+        raise SubmissionError(attempts)
+
+    async def _hedge(
+        self,
+        internal_job_id: str,
+        candidates: List[str],
+        circuit_data: Dict[str, Any],
+        job_config: Dict[str, Any],
+        budget: float
+    ):
+        subscription = self.events.subscribe([internal_job_id])
+        try:
+            if await self._wait_for_progress(subscription, internal_job_id, budget):
+                return
+            hedge_job_id = str(uuid.uuid4())
+            for name in candidates:
+                provider = self.providers[name]
+                try:
+                    external_job_id = await asyncio.wait_for(
+                        provider.submit_job(circuit_data, job_config), self.submit_timeout
+                    )
+                except Exception:
+                    continue
+                break
+            else:
+                return
+            subscription.add([hedge_job_id])
+            await self._register_job(
+                hedge_job_id, name, external_job_id, circuit_data, job_config,
+                f"{name}:{provider.circuit_fingerprint(circuit_data, job_config)}", {"hedge_of": internal_job_id}
+            )
+            job_info = await self.job_store.get(internal_job_id)
+            attempts = job_info["submission_attempts"] + [
+                {"provider": name, "external_job_id": external_job_id, "job_id": hedge_job_id, "hedged": True}
+            ]
+            await self.job_store.update(internal_job_id, {"submission_attempts": attempts})
+            await self._settle_hedge(subscription, internal_job_id, hedge_job_id, len(attempts) - 1)
+        finally:
+            subscription.close()
+            self._hedges.pop(internal_job_id, None)
+
+    async def _wait_for_progress(self, subscription: Any, internal_job_id: str, budget: float) -> bool:
+        """Whether the job reaches RUNNING (or finishes) within ``budget`` seconds"""
+        job_info = await self.job_store.get(internal_job_id)
+        if job_info is None or job_info["status"] == "running" or job_info["status"] in TERMINAL_STATUSES:
+            return True
+        deadline = time.monotonic() + budget
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+            if event["status"] == "running" or event["status"] in TERMINAL_STATUSES:
+                return True
+
+    async def _settle_hedge(self, subscription: Any, internal_job_id: str, hedge_job_id: str, hedge_attempt: int):
+        primary, hedge = await self.job_store.get(internal_job_id), await self.job_store.get(hedge_job_id)
+        finished: Dict[str, str] = {
+            job["job_id"]: job["status"] for job in (primary, hedge) if job["status"] in TERMINAL_STATUSES
+        }
+        while "completed" not in finished.values() and len(finished) < 2:
+            event = await subscription.get()
+            if event["status"] in TERMINAL_STATUSES:
+                finished[event["job_id"]] = event["status"]
+        if finished.get(internal_job_id) == "completed" or "completed" not in finished.values():
+            winner, loser = internal_job_id, hedge_job_id
+        else:
+            winner, loser = hedge_job_id, internal_job_id
+        loser_info = await self.job_store.get(loser)
+        if loser not in finished:
+            try:
+                await self.providers[loser_info["provider_name"]].cancel_job(loser_info["external_job_id"])
+            except Exception:
+                pass
+        if winner == internal_job_id:
+            await self.job_store.update(internal_job_id, {"latency_saved_seconds": 0.0})
+            return
+        primary = await self.job_store.get(internal_job_id)
+        hedge = await self.job_store.get(hedge_job_id)
+        elapsed = (datetime.now() - primary["submitted_at"]).total_seconds()
+        estimated = self.latency_estimator(primary["provider_name"], primary["job_config"]) if self.latency_estimator else None
+        # Point the original job at the winning copy so status, results and notifications follow it
+        await self.job_store.update(internal_job_id, {
+            "provider_name": hedge["provider_name"],
+            "external_job_id": hedge["external_job_id"],
+            "fingerprint": hedge["fingerprint"],
+            "winning_attempt": hedge_attempt,
+            "latency_saved_seconds": max(0.0, estimated - elapsed) if estimated is not None else None
+        })
+        await self._track(internal_job_id, primary["status"], hedge["provider_name"], hedge["external_job_id"])
+        await self._apply_provider_status(internal_job_id, hedge["provider_status"])
+
+    async def submit_jobs(self, provider_name: str, jobs: List[Dict[str, Any]]) -> List[Any]:
+        """Submit many jobs to one provider, using its native batch submission when available.
+
+        Each job is a dict with ``circuit_data``, ``job_config`` and optional ``deduplicate``, ``metadata``
+        and ``job_id`` (of a pending job). Items of the returned list are internal job IDs or the
+        exception raised for that job.
+        """
         if provider_name not in self.providers:
             raise ValueError(f"Provider '{provider_name}' not registered")
-        internal_job_id = str(uuid.uuid4())
         provider = self.providers[provider_name]
-        external_job_id = await provider.submit_job(circuit_data, job_config)
-        self.job_mappings[internal_job_id] = {
+        results: List[Any] = [None] * len(jobs)
+        to_submit: List[int] = []
+        duplicates_in_batch: Dict[int, List[int]] = {}
+        first_in_batch: Dict[str, int] = {}
+        fingerprints = []
+        job_ids = [job.get("job_id") or str(uuid.uuid4()) for job in jobs]
+        for index, job in enumerate(jobs):
+            fingerprint = f"{provider_name}:{provider.circuit_fingerprint(job['circuit_data'], job['job_config'])}"
+            fingerprints.append(fingerprint)
+            deduplicate = job.get("deduplicate", True)
+            internal_job_id = job_ids[index]
+            if deduplicate and await self._attach_to_existing(
+                internal_job_id, fingerprint, job["circuit_data"], job["job_config"], job.get("metadata"),
+                "pending" if "job_id" in job else None
+            ):
+                results[index] = internal_job_id
+            elif deduplicate and fingerprint in first_in_batch:
+                duplicates_in_batch.setdefault(first_in_batch[fingerprint], []).append(index)
+            else:
+                first_in_batch.setdefault(fingerprint, index)
+                to_submit.append(index)
+        if provider.supports_batch_submission:
+            external_job_ids = []
+            for start in range(0, len(to_submit), provider.max_batch_submission):
+                chunk = to_submit[start:start + provider.max_batch_submission]
+                try:
+                    external_job_ids.extend(await provider.submit_jobs(
+                        [(jobs[index]["circuit_data"], jobs[index]["job_config"]) for index in chunk]
+                    ))
+                except Exception as e:
+                    external_job_ids.extend([e] * len(chunk))
+        else:
+            external_job_ids = await asyncio.gather(
+                *(provider.submit_job(jobs[index]["circuit_data"], jobs[index]["job_config"]) for index in to_submit),
+                return_exceptions=True
+            )
+        for index, external_job_id in zip(to_submit, external_job_ids):
+            if isinstance(external_job_id, BaseException):
+                results[index] = external_job_id
+                for duplicate in duplicates_in_batch.get(index, []):
+                    results[duplicate] = external_job_id
+                continue
+            internal_job_id = job_ids[index]
+            job = jobs[index]
+            await self._register_job(
+                internal_job_id,
+                provider_name,
+                external_job_id,
+                job["circuit_data"],
+                job["job_config"],
+                fingerprints[index],
+                job.get("metadata"),
+                "pending" if "job_id" in job else None
+            )
+            results[index] = internal_job_id
+            for duplicate in duplicates_in_batch.get(index, []):
+                duplicate_job_id = job_ids[duplicate]
+                job = jobs[duplicate]
+                await self._attach_to_existing(
+                    duplicate_job_id, fingerprints[duplicate], job["circuit_data"], job["job_config"], job.get("metadata"),
+                    "pending" if "job_id" in job else None
+                )
+                results[duplicate] = duplicate_job_id
+        return results
+
+    async def _register_job(
+        self,
+        internal_job_id: str,
+        provider_name: str,
+        external_job_id: str,
+        circuit_data: Dict[str, Any],
+        job_config: Dict[str, Any],
+        fingerprint: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        previous_status: Optional[str] = None
+    ):
+        await self.job_store.put({
+            **(metadata or {}),
+            "job_id": internal_job_id,
             "provider_name": provider_name,
             "external_job_id": external_job_id,
             "submitted_at": datetime.now(),
-            "circuit_data": circuit_data,
             "job_config": job_config,
+            "fingerprint": fingerprint,
             "status": "queued",
             "status_history": []
+        })
+        await self.job_store.put_circuit(internal_job_id, circuit_data)
+        await self._track(internal_job_id, "queued", provider_name, external_job_id)
+        if previous_status is not None:
+            await self._announce_submission(internal_job_id, previous_status)
+
+    async def _attach_to_existing(
+        self,
+        internal_job_id: str,
+        fingerprint: str,
+        circuit_data: Dict[str, Any],
+        job_config: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+        previous_status: Optional[str] = None
+    ) -> bool:
+        """Reuse a cached result or an identical job that is still running or completed"""
+        primary = await self.job_store.find_by_fingerprint(fingerprint)
+        primary_job_id = primary["job_id"] if primary else None
+        if fingerprint in self.result_cache:
+            status, provider_status = "completed", {"cached_result": True}
+        elif primary is not None and primary["status"] not in ("failed", "cancelled"):
+            status, provider_status = primary["status"], primary.get("provider_status")
+        else:
+            return False
+        provider_name, _ = fingerprint.split(":", 1)
+        job_info = {
+            **(metadata or {}),
+            "job_id": internal_job_id,
+            "provider_name": provider_name,
+            "external_job_id": primary["external_job_id"] if primary else None,
+            "submitted_at": datetime.now(),
+            "job_config": job_config,
+            "fingerprint": fingerprint,
+            "deduplicated_from": primary_job_id,
+            "status": status,
+            "status_history": []
         }
-        return internal_job_id
+        if provider_status is not None:
+            job_info["provider_status"] = provider_status
+        await self.job_store.put(job_info)
+        await self.job_store.put_circuit(internal_job_id, circuit_data)
+        await self._track(internal_job_id, status, provider_name, job_info["external_job_id"])
+        if previous_status is not None:
+            await self._announce_submission(internal_job_id, previous_status)
+        elif status in TERMINAL_STATUSES:
+            # Attached straight to a finished job, so no poll will ever report this transition
+            self._publish_transition(internal_job_id, None, self._status_snapshot(internal_job_id, job_info))
+        return True
+
+    async def register_pending(
+        self,
+        internal_job_id: str,
+        provider_name: str,
+        circuit_data: Dict[str, Any],
+        job_config: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Record a job that waits in the scheduler and has not been sent to a provider yet"""
+        await self.job_store.put({
+            **(metadata or {}),
+            "job_id": internal_job_id,
+            "provider_name": provider_name,
+            "external_job_id": None,
+            "submitted_at": datetime.now(),
+            "job_config": job_config,
+            "fingerprint": None,
+            "status": "pending",
+            "status_history": [],
+            "provider_status": None
+        })
+        await self.job_store.put_circuit(internal_job_id, circuit_data)
+
+    async def fail_pending(self, internal_job_id: str, error: str, metadata: Optional[Dict[str, Any]] = None):
+        """Mark a pending job failed when no provider accepted it"""
+        await self.job_store.update(internal_job_id, {**(metadata or {}), "status": "failed", "error": error})
+        await self._announce_submission(internal_job_id, "pending")
+
+    async def _announce_submission(self, internal_job_id: str, previous_status: str):
+        # Other workers may hold the pending snapshot, so the new one is published like a polled status
+        job_info = await self.job_store.get(internal_job_id)
+        snapshot = self._status_snapshot(internal_job_id, job_info)
+        self.status_cache.invalidate(internal_job_id)
+        if job_info["status"] != previous_status:
+            self._publish_transition(internal_job_id, previous_status, snapshot)
+        if self.shared_state is not None:
+            await self.shared_state.publish_status(internal_job_id, job_info["provider_name"], snapshot)
 
     async def get_job_status(self, internal_job_id: str) -> Dict[str, Any]:
-        if internal_job_id not in self.job_mappings:
+        cached = self.status_cache.get(internal_job_id)
+        if cached is not None:
+            return cached
+        if self.shared_state is not None:
+            shared = await self.shared_state.get_status(internal_job_id)
+            if shared is not None:
+                self.status_cache.put(internal_job_id, shared["provider"], shared)
+                return shared
+        job_info = await self.job_store.get(internal_job_id)
+        if job_info is None:
             raise ValueError(f"Job {internal_job_id} not found")
-        job_info = self.job_mappings[internal_job_id]
-        provider_name = job_info["provider_name"]
-        external_job_id = job_info["external_job_id"]
-        provider = self.providers[provider_name]
-        provider_status = await provider.get_job_status(external_job_id)
-        unified_status = StatusNormalizer.normalize(provider_name, provider_status)
-        job_info["status"] = unified_status
-        job_info["last_checked"] = datetime.now()
-        job_info["provider_status"] = provider_status
+        has_status = "provider_status" in job_info
+        # Terminal statuses never change, jobs without an external ID have nothing to poll,
+        # and while the poller runs it keeps the rest fresh
+        if has_status and (
+            job_info["status"] in TERMINAL_STATUSES or job_info["external_job_id"] is None or self.poller.running
+        ):
+            snapshot = self._status_snapshot(internal_job_id, job_info)
+            self.status_cache.put(internal_job_id, job_info["provider_name"], snapshot)
+            return snapshot
+        provider_status = await self.poller.fetch(job_info["provider_name"], job_info["external_job_id"])
+        return await self._apply_provider_status(internal_job_id, provider_status)
+
+    async def _apply_provider_status(
+        self,
+        internal_job_id: str,
+        provider_status: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        job_info = await self.job_store.get(internal_job_id)
+        if job_info is None:
+            self.poller.untrack(internal_job_id)
+            return None
+        unified_status = StatusNormalizer.normalize(job_info["provider_name"], provider_status)
+        previous_status = job_info["status"]
+        job_info = await self.job_store.update(internal_job_id, {
+            "status": unified_status,
+            "last_checked": datetime.now(),
+            "provider_status": provider_status
+        })
+        self.poller.track(internal_job_id, unified_status)
+        snapshot = self._status_snapshot(internal_job_id, job_info)
+        self.status_cache.put(internal_job_id, job_info["provider_name"], snapshot)
+        if previous_status != unified_status:
+            self._publish_transition(internal_job_id, previous_status, snapshot)
+        if self.shared_state is not None:
+            await self.shared_state.publish_status(internal_job_id, job_info["provider_name"], snapshot)
+        return snapshot
+
+    def _status_snapshot(self, internal_job_id: str, job_info: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "internal_job_id": internal_job_id,
-            "status": unified_status,
-            "provider": provider_name,
-            "external_job_id": external_job_id,
+            "status": job_info["status"],
+            "provider": job_info["provider_name"],
+            "external_job_id": job_info["external_job_id"],
             "submitted_at": job_info["submitted_at"].isoformat(),
-            "provider_details": provider_status
+            "provider_details": job_info.get("provider_status")
         }
 
     async def get_job_result(self, internal_job_id: str) -> Dict[str, Any]:
-        if internal_job_id not in self.job_mappings:
+        job_info = await self.job_store.get(internal_job_id)
+        if job_info is None:
             raise ValueError(f"Job {internal_job_id} not found")
-        job_info = self.job_mappings[internal_job_id]
+        if job_info["status"] == "pending":
+            raise ValueError(f"Job {internal_job_id} is still waiting in the scheduler")
+        fingerprint = job_info.get("fingerprint")
+        if fingerprint is not None:
+            cached = self.result_cache.get(fingerprint)
+            if cached is not None:
+                return cached
         provider_name = job_info["provider_name"]
         external_job_id = job_info["external_job_id"]
+        if external_job_id is None:
+            raise ValueError(f"Result for job {internal_job_id} is no longer available")
         provider = self.providers[provider_name]
-        return await provider.get_job_result(external_job_id)
+        result = await provider.get_job_result(external_job_id)
+        if fingerprint is not None and job_info["status"] == "completed":
+            self.result_cache.put(fingerprint, result)
+        return result
+
+    async def open_job_result(self, internal_job_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Result of a job, or for large results the path of its gzip-compressed JSON file.
+
+        Completed results are streamed from the provider into the result cache, so a large
+        download is written to disk chunk by chunk instead of being held in memory.
+        """
+        job_info = await self.job_store.get(internal_job_id)
+        if job_info is None:
+            raise ValueError(f"Job {internal_job_id} not found")
+        if job_info["status"] == "pending":
+            raise ValueError(f"Job {internal_job_id} is still waiting in the scheduler")
+        fingerprint = job_info.get("fingerprint")
+        if fingerprint is not None:
+            cached = self.result_cache.lookup(fingerprint)
+            if cached is not None:
+                return cached
+        external_job_id = job_info["external_job_id"]
+        if external_job_id is None:
+            raise ValueError(f"Result for job {internal_job_id} is no longer available")
+        provider = self.providers[job_info["provider_name"]]
+        if fingerprint is None or job_info["status"] != "completed":
+            return await provider.get_job_result(external_job_id), None
+        return await self.result_cache.put_stream(fingerprint, provider.stream_job_result(external_job_id))
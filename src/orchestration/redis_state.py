@@ -0,0 +1,214 @@
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from src.circuits.ir import circuit_to_dict
+from src.orchestration.job_store import JobStore, encode_record, decode_record
+from src.orchestration.status_poller import TERMINAL_STATUSES
+
+def _redis_from_url(url: str):
+    try:
+        import redis.asyncio as redis
+    except ImportError as e:
+        raise RuntimeError("Redis mode requires the 'redis' package") from e
+    return redis.from_url(url, decode_responses=True)
+
+class RedisJobStore(JobStore):
+    """Job rows shared by all workers; every write is a single pipelined round trip"""
+    def __init__(self, redis: Any, prefix: str = "quantumbridge:"):
+        self.redis = redis
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisJobStore":
+        return cls(_redis_from_url(url), **kwargs)
+
+    def _key(self, *parts: str) -> str:
+        return self.prefix + ":".join(parts)
+
+    async def put(self, record: Dict[str, Any]):
+        previous = await self.get(record["job_id"])
+        await self._write(record, previous)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.redis.get(self._key("job", job_id))
+        return decode_record(data) if data else None
+
+    async def update(self, job_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        previous = await self.get(job_id)
+        if previous is None:
+            return None
+        record = {**previous, **fields}
+        await self._write(record, previous)
+        return record
+
+    async def _write(self, record: Dict[str, Any], previous: Optional[Dict[str, Any]]):
+        job_id = record["job_id"]
+        submitted_at = record.get("submitted_at")
+        score = submitted_at.timestamp() if isinstance(submitted_at, datetime) else time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.set(self._key("job", job_id), encode_record(record))
+        if previous is not None and previous.get("status") != record.get("status"):
+            pipe.zrem(self._key("status", previous["status"]), job_id)
+        pipe.zadd(self._key("status", record["status"]), {job_id: score})
+        if record.get("external_job_id") is not None:
+            pipe.sadd(self._key("external", record["provider_name"], record["external_job_id"]), job_id)
+        if record.get("fingerprint") and not record.get("deduplicated_from"):
+            pipe.set(self._key("fingerprint", record["fingerprint"]), job_id)
+        await pipe.execute()
+
+    async def put_circuit(self, job_id: str, circuit_data: Dict[str, Any]):
+        await self.redis.set(self._key("circuit", job_id), json.dumps(circuit_to_dict(circuit_data)))
+
+    async def get_circuit(self, job_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.redis.get(self._key("circuit", job_id))
+        return json.loads(data) if data else None
+
+    async def _get_many(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        if not job_ids:
+            return []
+        rows = await self.redis.mget([self._key("job", job_id) for job_id in job_ids])
+        return [decode_record(row) for row in rows if row]
+
+    async def find_by_external(self, provider_name: str, external_job_id: str) -> List[Dict[str, Any]]:
+        job_ids = await self.redis.smembers(self._key("external", provider_name, external_job_id))
+        return await self._get_many(sorted(job_ids))
+
+    async def find_by_status(self, status: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        job_ids = await self.redis.zrange(self._key("status", status), 0, limit - 1)
+        return await self._get_many(job_ids)
+
+    async def find_by_fingerprint(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        job_id = await self.redis.get(self._key("fingerprint", fingerprint))
+        return await self.get(job_id) if job_id else None
+
+class RedisSharedState:
+    """Cross-worker state: shared status cache, pub/sub status fan-in, poller leadership and rate counters.
+
+    Only the worker holding the leader lock polls providers. Every worker tracks every active job,
+    so another worker can take over polling when the leader goes away.
+    """
+    def __init__(
+        self,
+        redis: Any,
+        prefix: str = "quantumbridge:",
+        status_ttl: int = 60,
+        leader_ttl: float = 10.0,
+        instance_id: Optional[str] = None
+    ):
+        self.redis = redis
+        self.prefix = prefix
+        self.status_ttl = status_ttl
+        self.leader_ttl = leader_ttl
+        self.instance_id = instance_id or uuid.uuid4().hex
+        self.channel = f"{prefix}events"
+        self._is_leader = False
+        self._leader_checked_at = 0.0
+        self._listener: Optional[asyncio.Task] = None
+        self._pubsub = None
+        self.orchestrator: Any = None
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisSharedState":
+        return cls(_redis_from_url(url), **kwargs)
+
+    def _key(self, *parts: str) -> str:
+        return self.prefix + ":".join(parts)
+
+    async def start(self, orchestrator: Any):
+        self.orchestrator = orchestrator
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._is_leader and await self.redis.get(self._key("poller-leader")) == self.instance_id:
+            await self.redis.delete(self._key("poller-leader"))
+        self._is_leader = False
+
+    async def publish_status(self, job_id: str, provider_name: str, snapshot: Dict[str, Any]):
+        payload = json.dumps(snapshot, default=str)
+        pipe = self.redis.pipeline(transaction=False)
+        if snapshot["status"] in TERMINAL_STATUSES:
+            pipe.set(self._key("status-cache", job_id), payload)
+        else:
+            pipe.set(self._key("status-cache", job_id), payload, ex=self.status_ttl)
+        pipe.publish(self.channel, json.dumps({
+            "type": "status",
+            "origin": self.instance_id,
+            "job_id": job_id,
+            "provider_name": provider_name,
+            "snapshot": snapshot
+        }, default=str))
+        await pipe.execute()
+
+    async def publish_track(self, job_id: str, status: str, provider_name: str, external_job_id: Optional[str]):
+        await self.redis.publish(self.channel, json.dumps({
+            "type": "track",
+            "origin": self.instance_id,
+            "job_id": job_id,
+            "status": status,
+            "provider_name": provider_name,
+            "external_job_id": external_job_id
+        }))
+
+    async def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.redis.get(self._key("status-cache", job_id))
+        return json.loads(data) if data else None
+
+    async def is_leader(self) -> bool:
+        """Acquire or renew the poller leader lock, re-checking at most three times per TTL"""
+        now = time.monotonic()
+        if now - self._leader_checked_at < self.leader_ttl / 3:
+            return self._is_leader
+        self._leader_checked_at = now
+        key = self._key("poller-leader")
+        ttl_ms = int(self.leader_ttl * 1000)
+        if await self.redis.set(key, self.instance_id, nx=True, px=ttl_ms):
+            self._is_leader = True
+        elif await self.redis.get(key) == self.instance_id:
+            await self.redis.pexpire(key, ttl_ms)
+            self._is_leader = True
+        else:
+            self._is_leader = False
+        return self._is_leader
+
+    async def hit_rate_counter(self, name: str, window_seconds: int) -> int:
+        """Count a hit in the current fixed window shared by all workers and return the window total"""
+        window = int(time.time() // window_seconds)
+        key = self._key("rate", name, str(window))
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.incr(key)
+        pipe.expire(key, window_seconds * 2)
+        count, _ = await pipe.execute()
+        return count
+
+    async def _listen(self):
+        async for message in self._pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            if event.get("origin") == self.instance_id:
+                continue
+            if event["type"] == "status":
+                self.orchestrator._on_remote_status(event["job_id"], event["provider_name"], event["snapshot"])
+            elif event["type"] == "track" and event.get("external_job_id") is not None:
+                self.orchestrator.poller.track(
+                    event["job_id"], event["status"], event["provider_name"], event["external_job_id"]
+                )
@@ -0,0 +1,183 @@
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, AsyncIterator, Optional, Tuple
+
+# Fast compression: spilling happens on the request path, and the file is also what gzip clients receive
+SPILL_COMPRESSION_LEVEL = 3
+
+class ResultCache:
+    """Content-addressed job result cache with a bounded memory tier and a bounded disk tier.
+
+    Results larger than ``spill_threshold_bytes`` and results evicted from memory are kept as
+    gzip-compressed JSON files on disk so large payloads do not sit on the heap. The files can be
+    sent to clients that accept gzip as they are.
+    """
+    def __init__(
+        self,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+        spill_threshold_bytes: int = 256 * 1024,
+        directory: Optional[str] = None,
+        monitoring: Any = None
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.directory = directory
+        self.monitoring = monitoring
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or key in self._disk
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self._record("hit")
+            return self._memory[key][0]
+        if key in self._disk:
+            self._disk.move_to_end(key)
+            try:
+                result = self.load(self._path(key))
+            except OSError:
+                self._drop_from_disk(key)
+            else:
+                self._record("hit")
+                return result
+        self._record("miss")
+        return None
+
+    def lookup(self, key: str) -> Optional[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Like get(), but a spilled result is returned as the path of its file instead of being loaded"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self._record("hit")
+            return self._memory[key][0], None
+        if key in self._disk and os.path.exists(self._path(key)):
+            self._disk.move_to_end(key)
+            self._record("hit")
+            return None, self._path(key)
+        self._drop_from_disk(key)
+        self._record("miss")
+        return None
+
+    @staticmethod
+    def load(path: str) -> Dict[str, Any]:
+        with gzip.open(path, "rb") as f:
+            return json.load(f)
+
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Store a result read as raw JSON chunks, switching to a disk file once it passes the spill threshold.
+
+        Returns the parsed result if it stayed small, otherwise the path of the spilled file.
+        """
+        loop = asyncio.get_running_loop()
+        buffer = bytearray()
+        spool = None
+        size = 0
+        temporary_path = None
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if spool is None:
+                    buffer += chunk
+                    if len(buffer) <= self.spill_threshold_bytes:
+                        continue
+                    self._ensure_directory()
+                    temporary_path = f"{self._path(key)}.{uuid.uuid4().hex}.partial"
+                    spool = await loop.run_in_executor(None, gzip.open, temporary_path, "wb", SPILL_COMPRESSION_LEVEL)
+                    chunk, buffer = bytes(buffer), bytearray()
+                await loop.run_in_executor(None, spool.write, chunk)
+        except BaseException:
+            if spool is not None:
+                spool.close()
+                os.remove(temporary_path)
+            raise
+        if spool is None:
+            result = json.loads(buffer)
+            self.put(key, result)
+            return result, None
+        await loop.run_in_executor(None, spool.close)
+        self._discard(key)
+        os.replace(temporary_path, self._path(key))
+        self._register_on_disk(key, os.path.getsize(self._path(key)))
+        return None, self._path(key)
+
+    def _ensure_directory(self):
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix="quantumbridge-results-")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def put(self, key: str, result: Dict[str, Any]):
+        payload = json.dumps(result, default=str).encode()
+        self._discard(key)
+        if len(payload) > self.spill_threshold_bytes:
+            self._write_to_disk(key, payload)
+            return
+        self._memory[key] = (result, len(payload))
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            evicted_key, (evicted, size) = self._memory.popitem(last=False)
+            self._memory_bytes -= size
+            self._write_to_disk(evicted_key, json.dumps(evicted, default=str).encode())
+
+    def path_for(self, key: str) -> Optional[str]:
+        """Path of the on-disk copy of a result, if it has been spilled"""
+        return self._path(key) if key in self._disk else None
+
+    def _write_to_disk(self, key: str, payload: bytes):
+        self._ensure_directory()
+        with gzip.open(self._path(key), "wb", compresslevel=SPILL_COMPRESSION_LEVEL) as f:
+            f.write(payload)
+        self._register_on_disk(key, os.path.getsize(self._path(key)))
+
+    def _register_on_disk(self, key: str, size: int):
+        if size > self.max_disk_bytes:
+            os.remove(self._path(key))
+            self._record("eviction")
+            return
+        self._disk[key] = size
+        self._disk_bytes += size
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            self._drop_from_disk(next(iter(self._disk)))
+            self._record("eviction")
+
+    def _drop_from_disk(self, key: str):
+        size = self._disk.pop(key, None)
+        if size is None:
+            return
+        self._disk_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _discard(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[1]
+        self._drop_from_disk(key)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key.replace(':', '_')}.json.gz")
+
+    def _record(self, event: str):
+        if self.monitoring is not None:
+            self.monitoring.record_cache_event("result", event)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "directory": self.directory
+        }
@@ -0,0 +1,112 @@
+import io
+import json
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+
+class ResultFormatError(ValueError):
+    pass
+
+def _outcome(key: Any) -> int:
+    """Measurement outcome from a hex ("0x5"), bitstring ("101") or integer key"""
+    if isinstance(key, str):
+        return int(key, 16) if key.startswith("0x") else int(key, 2)
+    return int(key)
+
+def experiments(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-experiment measurement data as ``{"counts", "memory", "width"}``.
+
+    Understands the Qobj result layout (``results[].data``) and flat results with
+    ``counts``/``histogram`` and ``memory``/``measurements`` keys.
+    """
+    entries = result.get("results") if isinstance(result.get("results"), list) else [{"data": result}]
+    found = []
+    for entry in entries:
+        data = entry.get("data", {}) if isinstance(entry, dict) else {}
+        counts = data.get("counts", data.get("histogram"))
+        memory = data.get("memory", data.get("measurements"))
+        if counts is None and memory is None:
+            continue
+        header = entry.get("header", {}) if isinstance(entry, dict) else {}
+        found.append({"counts": counts, "memory": memory, "width": header.get("memory_slots", header.get("n_qubits"))})
+    if not found:
+        raise ResultFormatError("Result contains no measurement counts or per-shot memory")
+    return found
+
+def shot_outcomes(experiment: Dict[str, Any]) -> np.ndarray:
+    memory = experiment["memory"]
+    if memory is None:
+        raise ResultFormatError("Result has no per-shot memory; request format=counts")
+    if memory and isinstance(memory[0], list):
+        # One list of bits per shot, most significant bit first
+        bits = np.asarray(memory, dtype=np.uint64)
+        return (bits << np.arange(bits.shape[1] - 1, -1, -1, dtype=np.uint64)).sum(axis=1, dtype=np.uint64)
+    return np.fromiter((_outcome(shot) for shot in memory), dtype=np.uint64, count=len(memory))
+
+def outcome_counts(experiment: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct outcomes and their counts, from the histogram or by counting the shots"""
+    if experiment["counts"] is not None:
+        pairs = sorted((_outcome(key), int(count)) for key, count in experiment["counts"].items())
+        outcomes, counts = zip(*pairs) if pairs else ((), ())
+        return np.array(outcomes, dtype=np.uint64), np.array(counts, dtype=np.uint64)
+    outcomes, counts = np.unique(shot_outcomes(experiment), return_counts=True)
+    return outcomes, counts.astype(np.uint64)
+
+def _width(experiment: Dict[str, Any], outcomes: np.ndarray) -> int:
+    if experiment["width"]:
+        return int(experiment["width"])
+    return max(int(outcomes.max()).bit_length(), 1) if len(outcomes) else 1
+
+def encode_counts(result: Dict[str, Any]) -> bytes:
+    """Bitstring histograms, one per experiment"""
+    summaries = []
+    for experiment in experiments(result):
+        outcomes, counts = outcome_counts(experiment)
+        width = _width(experiment, outcomes)
+        summaries.append({
+            "counts": {format(outcome, f"0{width}b"): count for outcome, count in zip(outcomes.tolist(), counts.tolist())},
+            "shots": int(counts.sum())
+        })
+    return json.dumps({"experiments": summaries}).encode()
+
+def encode_packed(result: Dict[str, Any], experiment_index: int = 0) -> Tuple[bytes, Dict[str, str]]:
+    """Per-shot bitstrings packed 8 bits to a byte, each shot padded to whole bytes, most significant bit first"""
+    experiment = _select(result, experiment_index)
+    outcomes = shot_outcomes(experiment)
+    width = _width(experiment, outcomes)
+    bits = ((outcomes[:, None] >> np.arange(width - 1, -1, -1, dtype=np.uint64)) & np.uint64(1)).astype(np.uint8)
+    packed = np.packbits(bits, axis=1)
+    return packed.tobytes(), {"X-Shots": str(len(outcomes)), "X-Bits-Per-Shot": str(width), "X-Bytes-Per-Shot": str(packed.shape[1])}
+
+def encode_npy(result: Dict[str, Any], experiment_index: int = 0) -> Tuple[bytes, Dict[str, str]]:
+    """Per-shot outcomes as a NumPy .npy uint64 vector"""
+    outcomes = shot_outcomes(_select(result, experiment_index))
+    buffer = io.BytesIO()
+    np.save(buffer, outcomes, allow_pickle=False)
+    return buffer.getvalue(), {"X-Shots": str(len(outcomes))}
+
+def encode_arrow(result: Dict[str, Any], experiment_index: int = 0) -> Tuple[bytes, Dict[str, str]]:
+    """Histogram as an Arrow IPC stream with uint64 ``outcome`` and ``count`` columns (needs ``pyarrow``)"""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError("format=arrow requires pyarrow") from e
+    outcomes, counts = outcome_counts(_select(result, experiment_index))
+    table = pa.table({"outcome": pa.array(outcomes, pa.uint64()), "count": pa.array(counts, pa.uint64())})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes(), {}
+
+def _select(result: Dict[str, Any], experiment_index: int) -> Dict[str, Any]:
+    found = experiments(result)
+    if not 0 <= experiment_index < len(found):
+        raise ResultFormatError(f"Result has {len(found)} experiment(s)")
+    return found[experiment_index]
+
+# format name: (media type, encoder(result, experiment_index) -> (body, headers))
+COMPACT_FORMATS: Dict[str, Tuple[str, Any]] = {
+    "counts": ("application/json", lambda result, experiment_index: (encode_counts(result), {})),
+    "packed": ("application/octet-stream", encode_packed),
+    "npy": ("application/x-npy", encode_npy),
+    "arrow": ("application/vnd.apache.arrow.stream", encode_arrow)
+}
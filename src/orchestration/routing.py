@@ -0,0 +1,279 @@
+import asyncio
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from src.circuits.ir import CircuitIR, gate_count
+from src.orchestration.status_poller import TERMINAL_STATUSES
+
+@dataclass
+class JobFeatures:
+    algorithm_type: str
+    circuit_format: str = "qiskit"
+    num_qubits: int = 0
+    gate_count: int = 0
+    shots: int = 1024
+    priority: int = 1
+    backend: Optional[str] = None
+    error_mitigation: bool = False
+
+    @classmethod
+    def from_request(cls, job_request: Any, circuit: Optional[CircuitIR] = None) -> "JobFeatures":
+        config = {**job_request.execution_config, **job_request.backend_requirements}
+        return cls(
+            algorithm_type=job_request.algorithm_type,
+            circuit_format=job_request.circuit_format,
+            num_qubits=circuit.num_qubits if circuit is not None else (job_request.circuit_data or {}).get("num_qubits", 0),
+            gate_count=gate_count(circuit if circuit is not None else job_request.circuit_data),
+            shots=config.get("shots", config.get("repetitions", 1024)),
+            priority=job_request.priority,
+            backend=config.get("backend"),
+            error_mitigation=bool(config.get("error_mitigation"))
+        )
+
+@dataclass
+class ProviderProfile:
+    """Static capabilities plus cold-start estimates used until live samples arrive"""
+    max_qubits: int
+    circuit_formats: Tuple[str, ...]
+    queue_seconds: float
+    overhead_seconds: float
+    seconds_per_gate_shot: float
+    failure_rate: float
+
+DEFAULT_PROVIDER_PROFILES: Dict[str, ProviderProfile] = {
+    "ibm": ProviderProfile(127, ("qiskit", "cirq"), 30.0, 5.0, 2e-6, 0.05),
+    "google": ProviderProfile(53, ("cirq", "qiskit"), 35.0, 5.0, 2e-6, 0.05),
+    "azure": ProviderProfile(40, ("qsharp", "qiskit", "cirq"), 60.0, 10.0, 3e-6, 0.05)
+}
+
+# Algorithm/provider pairings that have historically worked well; used as a mild preference
+ALGORITHM_AFFINITY: Dict[str, str] = {
+    "vqe": "ibm",
+    "quantum_ml": "google",
+    "variational_classifier": "google"
+}
+
+class RollingStats:
+    """Exponentially weighted mean and variance of queue time, execution rate and failures"""
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.samples = 0
+        self.queue_mean: Optional[float] = None
+        self.queue_var = 0.0
+        self.exec_per_unit: Optional[float] = None
+        self.failure_rate: Optional[float] = None
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        return value if current is None else current + self.alpha * (value - current)
+
+    def record_queue(self, seconds: float):
+        if self.queue_mean is None:
+            self.queue_mean = seconds
+        else:
+            delta = seconds - self.queue_mean
+            self.queue_mean += self.alpha * delta
+            self.queue_var = (1 - self.alpha) * (self.queue_var + self.alpha * delta * delta)
+        self.samples += 1
+
+    def record_execution(self, seconds: float, work_units: float):
+        self.exec_per_unit = self._ewma(self.exec_per_unit, seconds / max(work_units, 1.0))
+
+    def record_outcome(self, success: bool):
+        self.failure_rate = self._ewma(self.failure_rate, 0.0 if success else 1.0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "queue_mean_seconds": self.queue_mean,
+            "queue_std_seconds": math.sqrt(self.queue_var),
+            "execution_seconds_per_gate_shot": self.exec_per_unit,
+            "failure_rate": self.failure_rate
+        }
+
+class RoutingPolicy(ABC):
+    """Scores a provider for a job; lower is better and math.inf means ineligible"""
+
+    @abstractmethod
+    def score(
+        self,
+        provider_name: str,
+        features: JobFeatures,
+        profile: Optional[ProviderProfile],
+        stats: Optional[RollingStats]
+    ) -> float:
+        pass
+
+def is_eligible(profile: Optional[ProviderProfile], features: JobFeatures) -> bool:
+    if profile is None:
+        return True
+    return features.circuit_format in profile.circuit_formats and features.num_qubits <= profile.max_qubits
+
+class StaticAffinityPolicy(RoutingPolicy):
+    """The original fixed rules: algorithm affinity, then error mitigation, then IBM"""
+    def score(self, provider_name, features, profile, stats) -> float:
+        if features.circuit_format == "qsharp":
+            return 0.0 if provider_name == "azure" else math.inf
+        if ALGORITHM_AFFINITY.get(features.algorithm_type) == provider_name:
+            return 0.0
+        if features.error_mitigation and provider_name == "ibm":
+            return 1.0
+        return 2.0 if provider_name == "ibm" else 3.0
+
+class ExpectedTimePolicy(RoutingPolicy):
+    """Expected time to a successful result from rolling queue/execution/failure stats.
+
+    Higher priority jobs are scored on a pessimistic queue estimate (mean plus up to
+    ``risk_stddevs`` standard deviations), so they avoid providers with erratic queues.
+    """
+    def __init__(self, affinity_discount: float = 0.8, risk_stddevs: float = 2.0, min_samples: int = 3):
+        self.affinity_discount = affinity_discount
+        self.risk_stddevs = risk_stddevs
+        self.min_samples = min_samples
+
+    def score(self, provider_name, features, profile, stats) -> float:
+        if not is_eligible(profile, features):
+            return math.inf
+        profile = profile or ProviderProfile(10**6, (features.circuit_format,), 60.0, 10.0, 3e-6, 0.1)
+        live = stats is not None and stats.samples >= self.min_samples
+        queue = stats.queue_mean if live else profile.queue_seconds
+        if live:
+            queue += self.risk_stddevs * (features.priority - 1) / 9 * math.sqrt(stats.queue_var)
+        work_units = max(features.gate_count, 1) * max(features.shots, 1)
+        per_unit = stats.exec_per_unit if live and stats.exec_per_unit is not None else profile.seconds_per_gate_shot
+        failure_rate = stats.failure_rate if live and stats.failure_rate is not None else profile.failure_rate
+        expected = (queue + profile.overhead_seconds + per_unit * work_units) / max(1.0 - failure_rate, 0.01)
+        if ALGORITHM_AFFINITY.get(features.algorithm_type) == provider_name or (
+            features.error_mitigation and provider_name == "ibm"
+        ):
+            expected *= self.affinity_discount
+        return expected
+
+class ProviderRouter:
+    """Picks the provider with the lowest policy score and learns from observed job transitions"""
+    def __init__(
+        self,
+        policy: Optional[RoutingPolicy] = None,
+        profiles: Optional[Dict[str, ProviderProfile]] = None,
+        alpha: float = 0.2,
+        max_tracked_jobs: int = 100_000
+    ):
+        self.policy = policy or ExpectedTimePolicy()
+        self.profiles = {**DEFAULT_PROVIDER_PROFILES, **(profiles or {})}
+        self.alpha = alpha
+        self.max_tracked_jobs = max_tracked_jobs
+        self.stats: Dict[Tuple[str, Optional[str]], RollingStats] = {}
+        self._running_since: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._subscription = None
+        self.orchestrator: Any = None
+
+    def _stats_for(self, provider_name: str, backend: Optional[str]) -> RollingStats:
+        key = (provider_name, backend)
+        if key not in self.stats:
+            self.stats[key] = RollingStats(self.alpha)
+        return self.stats[key]
+
+    def lookup_stats(self, provider_name: str, backend: Optional[str]) -> Optional[RollingStats]:
+        """Backend-level stats when available, else provider-wide stats"""
+        return self.stats.get((provider_name, backend)) or self.stats.get((provider_name, None))
+
+    def rank(self, features: JobFeatures, candidates: Iterable[str]) -> List[Tuple[str, float]]:
+        scores = [
+            (name, self.policy.score(name, features, self.profiles.get(name), self.lookup_stats(name, features.backend)))
+            for name in candidates
+        ]
+        return sorted((item for item in scores if item[1] != math.inf), key=lambda item: item[1])
+
+    def select(self, features: JobFeatures, candidates: Iterable[str]) -> str:
+        ranked = self.rank(features, candidates)
+        if not ranked:
+            raise ValueError(
+                f"No provider can run a {features.num_qubits}-qubit {features.circuit_format} circuit"
+            )
+        return ranked[0][0]
+
+    def expected_seconds(self, provider_name: str, job_config: Dict[str, Any], gate_count: int = 1) -> Optional[float]:
+        """Mean queue plus execution time on a provider, without policy preferences or risk margins"""
+        stats = self.lookup_stats(provider_name, job_config.get("backend"))
+        profile = self.profiles.get(provider_name)
+        queue = stats.queue_mean if stats is not None and stats.queue_mean is not None else (profile and profile.queue_seconds)
+        if queue is None:
+            return None
+        per_unit = stats.exec_per_unit if stats is not None and stats.exec_per_unit is not None else (
+            profile.seconds_per_gate_shot if profile else 0.0
+        )
+        return queue + per_unit * max(gate_count, 1) * job_config.get("shots", 1024)
+
+    def record_queue_time(self, provider_name: str, backend: Optional[str], seconds: float):
+        for key_backend in {None, backend}:
+            self._stats_for(provider_name, key_backend).record_queue(seconds)
+
+    def record_completion(
+        self,
+        provider_name: str,
+        backend: Optional[str],
+        success: bool,
+        execution_seconds: Optional[float] = None,
+        work_units: float = 1.0
+    ):
+        for key_backend in {None, backend}:
+            stats = self._stats_for(provider_name, key_backend)
+            stats.record_outcome(success)
+            if execution_seconds is not None and success:
+                stats.record_execution(execution_seconds, work_units)
+
+    async def start(self, orchestrator: Any):
+        self.orchestrator = orchestrator
+        self._subscription = orchestrator.events.subscribe()
+        self._task = asyncio.create_task(self._consume_events())
+
+    async def stop(self):
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _consume_events(self):
+        while True:
+            event = await self._subscription.get()
+            try:
+                await self.observe(event)
+            except Exception:
+                continue
+
+    async def observe(self, event: Dict[str, Any]):
+        """Update rolling stats from a status transition event"""
+        job_id, status = event["job_id"], event["status"]
+        timestamp = datetime.fromisoformat(event["timestamp"])
+        if status == "running" and job_id not in self._running_since:
+            if len(self._running_since) >= self.max_tracked_jobs:
+                self._running_since.pop(next(iter(self._running_since)))
+            self._running_since[job_id] = timestamp
+            job_info = await self.orchestrator.job_store.get(job_id) if self.orchestrator else None
+            backend = (job_info or {}).get("job_config", {}).get("backend")
+            queue_seconds = (timestamp - datetime.fromisoformat(event["submitted_at"])).total_seconds()
+            self.record_queue_time(event["provider"], backend, queue_seconds)
+        elif status in TERMINAL_STATUSES and status != "cancelled" and event.get("previous_status") is not None:
+            job_info = await self.orchestrator.job_store.get(job_id) if self.orchestrator else None
+            job_config = (job_info or {}).get("job_config", {})
+            started = self._running_since.pop(job_id, None)
+            execution_seconds = (timestamp - started).total_seconds() if started else None
+            circuit = await self.orchestrator.job_store.get_circuit(job_id) if self.orchestrator else None
+            work_units = max(gate_count(circuit), 1) * job_config.get("shots", 1024)
+            self.record_completion(
+                event["provider"], job_config.get("backend"), status == "completed", execution_seconds, work_units
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            f"{provider}/{backend}" if backend else provider: stats.as_dict()
+            for (provider, backend), stats in self.stats.items()
+        }
@@ -0,0 +1,356 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set, Tuple
+from src.circuits.ir import CircuitIR
+from src.orchestration.status_poller import TERMINAL_STATUSES
+
+# Admission limits and ordering knobs; override per provider with the "scheduler" config key
+DEFAULT_SCHEDULER_CONFIG: Dict[str, Any] = {
+    "max_queue_depth": 200_000,
+    "max_active_jobs": 1_000,
+    "dispatch_concurrency": 8,
+    "aging_seconds": 30.0,
+    "fair_share_seconds": 0.5
+}
+
+# Fields the orchestrator writes to every job record; the rest of a pending record is job metadata
+_RECORD_FIELDS = {
+    "job_id", "provider_name", "external_job_id", "submitted_at", "job_config", "fingerprint",
+    "status", "status_history", "provider_status", "scheduling"
+}
+
+class QueueFullError(Exception):
+    """Raised by admission control when a provider queue cannot take the submitted jobs"""
+    def __init__(self, provider_name: str, max_queue_depth: int):
+        super().__init__(f"Scheduler queue for provider '{provider_name}' is full ({max_queue_depth} jobs)")
+        self.provider_name = provider_name
+        self.max_queue_depth = max_queue_depth
+
+@dataclass
+class ScheduledJob:
+    job_id: str
+    provider_name: str
+    circuit: CircuitIR
+    job_config: Dict[str, Any]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    priority: int = 1
+    tenant: str = "default"
+    deduplicate: bool = True
+    fallback_providers: List[str] = field(default_factory=list)
+    hedge_after: Optional[float] = None
+    enqueued_at: float = field(default_factory=time.time)
+
+    @property
+    def batchable(self) -> bool:
+        """Failover and hedging are per job, so only plain jobs share a batch submission"""
+        return not self.fallback_providers and self.hedge_after is None
+
+    def scheduling(self) -> Dict[str, Any]:
+        return {
+            "priority": self.priority,
+            "tenant": self.tenant,
+            "deduplicate": self.deduplicate,
+            "fallback_providers": self.fallback_providers,
+            "hedge_after": self.hedge_after
+        }
+
+class ProviderQueue:
+    """Jobs waiting for one provider, ordered by an aged, fair-shared start time.
+
+    Jobs are grouped into flows by (tenant, priority). Each flow has a clock that advances by
+    ``fair_share_seconds`` per job, so a tenant's burst is interleaved with other tenants' jobs
+    instead of running ahead of them. Every priority level above 1 moves a job's key
+    ``aging_seconds`` earlier. Keys are fixed at enqueue time, so a low-priority job overtakes
+    newer urgent jobs once it has waited long enough.
+    """
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.max_queue_depth = config["max_queue_depth"]
+        self.max_active_jobs = config["max_active_jobs"]
+        self.aging_seconds = config["aging_seconds"]
+        self.fair_share_seconds = config["fair_share_seconds"]
+        self.slots = asyncio.Semaphore(config["dispatch_concurrency"])
+        self.wakeup = asyncio.Event()
+        self.heap: List[Tuple[float, int, ScheduledJob]] = []
+        self.flow_clocks: Dict[Tuple[str, int], float] = {}
+        self.active: Set[str] = set()
+        self.reserved = 0
+        self.enqueued = 0
+        self.dispatched = 0
+        self.failed = 0
+        self.rejected = 0
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, job: ScheduledJob):
+        flow = (job.tenant, job.priority)
+        start = max(job.enqueued_at, self.flow_clocks.get(flow, 0.0))
+        self.flow_clocks[flow] = start + self.fair_share_seconds
+        if len(self.flow_clocks) > 10_000:
+            # Clocks behind the present no longer influence any key
+            now = time.time()
+            self.flow_clocks = {key: clock for key, clock in self.flow_clocks.items() if clock > now}
+        key = start - (job.priority - 1) * self.aging_seconds
+        heapq.heappush(self.heap, (key, next(self._sequence), job))
+        self.enqueued += 1
+        self.wakeup.set()
+
+    def pop(self) -> ScheduledJob:
+        return heapq.heappop(self.heap)[2]
+
+    def peek(self) -> Optional[ScheduledJob]:
+        return self.heap[0][2] if self.heap else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        oldest = min((job.enqueued_at for _, _, job in self.heap), default=None)
+        return {
+            "depth": len(self.heap),
+            "max_queue_depth": self.max_queue_depth,
+            "active_jobs": len(self.active),
+            "max_active_jobs": self.max_active_jobs,
+            "oldest_wait_seconds": time.time() - oldest if oldest is not None else None,
+            "enqueued": self.enqueued,
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+
+class JobScheduler:
+    """Per-provider priority queues between the gateway and the orchestrator.
+
+    ``enqueue`` records jobs as ``pending`` and returns at once; a dispatcher per provider
+    submits them in queue order. Admission control rejects jobs beyond ``max_queue_depth``
+    and holds back dispatch while a provider has ``max_active_jobs`` unfinished jobs or its
+    circuit breaker is open. Pending jobs are kept in the job store, so the leader worker
+    puts them back in the queues after a restart.
+    """
+    def __init__(
+        self,
+        orchestrator: Any,
+        monitoring: Any = None,
+        config: Optional[Dict[str, Any]] = None,
+        recheck_interval: float = 0.5
+    ):
+        self.orchestrator = orchestrator
+        self.monitoring = monitoring
+        self.config = config or {}
+        self.recheck_interval = recheck_interval
+        self.queues: Dict[str, ProviderQueue] = {}
+        self._active_jobs: Dict[str, str] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._dispatches: Set[asyncio.Task] = set()
+        self._subscription = None
+        self._dropped_seen = 0
+
+    def queue(self, provider_name: str) -> ProviderQueue:
+        if provider_name not in self.queues:
+            provider = self.orchestrator.providers[provider_name]
+            self.queues[provider_name] = ProviderQueue(provider_name, {
+                **DEFAULT_SCHEDULER_CONFIG,
+                **provider.config.get("scheduler", {}),
+                **self.config
+            })
+        return self.queues[provider_name]
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._subscription = self.orchestrator.events.subscribe()
+        self._tasks = [asyncio.create_task(self._consume_events())]
+        job_store = self.orchestrator.job_store
+        for status in ("queued", "initializing", "running"):
+            for job_info in await job_store.find_by_status(status, limit=100_000):
+                if job_info["provider_name"] in self.orchestrator.providers:
+                    self._activate(job_info["job_id"], job_info["provider_name"])
+        if await self.orchestrator.should_poll():
+            await self._restore()
+        for name in self.orchestrator.providers:
+            self._tasks.append(asyncio.create_task(self._drain(name)))
+
+    async def stop(self):
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        tasks = self._tasks + list(self._dispatches)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _restore(self):
+        job_store = self.orchestrator.job_store
+        pending = await job_store.find_by_status("pending", limit=1_000_000)
+        for job_info in sorted(pending, key=lambda record: record["submitted_at"]):
+            circuit = await job_store.get_circuit(job_info["job_id"])
+            if circuit is None or job_info["provider_name"] not in self.orchestrator.providers:
+                await self.orchestrator.fail_pending(job_info["job_id"], "Pending job could not be restored")
+                continue
+            self.queue(job_info["provider_name"]).push(ScheduledJob(
+                job_id=job_info["job_id"],
+                provider_name=job_info["provider_name"],
+                circuit=CircuitIR.coerce(circuit),
+                job_config=job_info["job_config"],
+                metadata={key: value for key, value in job_info.items() if key not in _RECORD_FIELDS},
+                enqueued_at=job_info["submitted_at"].timestamp(),
+                **job_info.get("scheduling", {})
+            ))
+
+    async def enqueue(self, jobs: List[ScheduledJob]):
+        """Admit every job or none; raises QueueFullError if a provider queue lacks room"""
+        counts = Counter(job.provider_name for job in jobs)
+        for job in jobs:
+            for name in [job.provider_name, *job.fallback_providers]:
+                if name not in self.orchestrator.providers:
+                    raise ValueError(f"Provider '{name}' not registered")
+        for name, count in counts.items():
+            queue = self.queue(name)
+            if len(queue) + queue.reserved + count > queue.max_queue_depth:
+                queue.rejected += count
+                raise QueueFullError(name, queue.max_queue_depth)
+        for name, count in counts.items():
+            self.queues[name].reserved += count
+        try:
+            for job in jobs:
+                await self.orchestrator.register_pending(
+                    job.job_id, job.provider_name, job.circuit, job.job_config,
+                    {**job.metadata, "scheduling": job.scheduling()}
+                )
+                queue = self.queues[job.provider_name]
+                queue.reserved -= 1
+                counts[job.provider_name] -= 1
+                queue.push(job)
+        finally:
+            for name, count in counts.items():
+                self.queues[name].reserved -= count
+
+    async def _drain(self, provider_name: str):
+        queue = self.queue(provider_name)
+        provider = self.orchestrator.providers[provider_name]
+        while True:
+            await queue.slots.acquire()
+            try:
+                await self._wait_until_dispatchable(queue, provider)
+                jobs = self._take(queue, provider)
+            except BaseException:
+                queue.slots.release()
+                raise
+            task = asyncio.create_task(self._dispatch(queue, jobs))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _wait_until_dispatchable(self, queue: ProviderQueue, provider: Any):
+        while True:
+            available = getattr(provider, "available", True)
+            at_capacity = len(queue.active) >= queue.max_active_jobs
+            if queue.heap and available and not at_capacity:
+                return
+            if at_capacity and self._subscription is not None and self._subscription.dropped != self._dropped_seen:
+                self._dropped_seen = self._subscription.dropped
+                await self._reconcile()
+                continue
+            queue.wakeup.clear()
+            try:
+                # An open breaker recovers with time alone, so it is re-checked periodically
+                await asyncio.wait_for(queue.wakeup.wait(), None if available else self.recheck_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _take(self, queue: ProviderQueue, provider: Any) -> List[ScheduledJob]:
+        jobs = [queue.pop()]
+        if jobs[0].batchable and getattr(provider, "supports_batch_submission", False):
+            limit = min(provider.max_batch_submission, queue.max_active_jobs - len(queue.active))
+            while queue.heap and len(jobs) < limit and queue.peek().batchable:
+                jobs.append(queue.pop())
+        for job in jobs:
+            self._activate(job.job_id, queue.name)
+        return jobs
+
+    async def _dispatch(self, queue: ProviderQueue, jobs: List[ScheduledJob]):
+        try:
+            now = time.time()
+            metadata = []
+            for job in jobs:
+                waited = now - job.enqueued_at
+                metadata.append({**job.metadata, "scheduling": {**job.scheduling(), "wait_seconds": waited}})
+                if self.monitoring is not None:
+                    self.monitoring.record_scheduler_wait(queue.name, waited)
+            if len(jobs) == 1:
+                job = jobs[0]
+                try:
+                    results = [await self.orchestrator.submit_job(
+                        job.provider_name,
+                        job.circuit,
+                        job.job_config,
+                        deduplicate=job.deduplicate,
+                        metadata=metadata[0],
+                        fallback_providers=job.fallback_providers,
+                        hedge_after=job.hedge_after,
+                        internal_job_id=job.job_id
+                    )]
+                except Exception as e:
+                    results = [e]
+            else:
+                try:
+                    results = await self.orchestrator.submit_jobs(queue.name, [
+                        {
+                            "job_id": job.job_id,
+                            "circuit_data": job.circuit,
+                            "job_config": job.job_config,
+                            "deduplicate": job.deduplicate,
+                            "metadata": job_metadata
+                        }
+                        for job, job_metadata in zip(jobs, metadata)
+                    ])
+                except Exception as e:
+                    results = [e] * len(jobs)
+            for job, result in zip(jobs, results):
+                if isinstance(result, BaseException):
+                    queue.failed += 1
+                    self._release(job.job_id)
+                    await self.orchestrator.fail_pending(job.job_id, str(result) or type(result).__name__)
+                    continue
+                queue.dispatched += 1
+                job_info = await self.orchestrator.job_store.get(job.job_id)
+                if job_info["provider_name"] != queue.name:
+                    # Failed over, so the job now counts against the fallback provider's quota
+                    self._release(job.job_id)
+                    self._activate(job.job_id, job_info["provider_name"])
+                if self.monitoring is not None:
+                    self.monitoring.record_job_submission(
+                        job.job_id, job_info["provider_name"], job.metadata.get("algorithm_type", "custom")
+                    )
+        finally:
+            queue.slots.release()
+
+    def _activate(self, job_id: str, provider_name: str):
+        self._active_jobs[job_id] = provider_name
+        self.queue(provider_name).active.add(job_id)
+
+    def _release(self, job_id: str):
+        provider_name = self._active_jobs.pop(job_id, None)
+        if provider_name is not None:
+            queue = self.queues[provider_name]
+            queue.active.discard(job_id)
+            queue.wakeup.set()
+
+    async def _consume_events(self):
+        while True:
+            event = await self._subscription.get()
+            if event["status"] in TERMINAL_STATUSES:
+                self._release(event["job_id"])
+
+    async def _reconcile(self):
+        """Release active jobs whose terminal transition was dropped by a full event queue"""
+        for job_id in list(self._active_jobs):
+            job_info = await self.orchestrator.job_store.get(job_id)
+            if job_info is None or job_info["status"] in TERMINAL_STATUSES:
+                self._release(job_id)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: queue.get_stats() for name, queue in self.queues.items()}
@@ -0,0 +1,97 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from src.orchestration.status_poller import TERMINAL_STATUSES
+
+DEFAULT_PROVIDER_TTLS: Dict[str, float] = {
+    "ibm": 2.0,
+    "google": 5.0,
+    "azure": 5.0
+}
+
+class StatusCache:
+    """LRU status cache: terminal statuses never expire, the rest expire after a per-provider TTL"""
+    def __init__(
+        self,
+        provider_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 2.0,
+        max_entries: int = 100_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        monitoring: Any = None
+    ):
+        self.provider_ttls = {**DEFAULT_PROVIDER_TTLS, **(provider_ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.monitoring = monitoring
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(job_id)
+        if entry is not None:
+            snapshot, expires_at, _ = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(job_id)
+                self._record("hit")
+                return snapshot
+            self._remove(job_id)
+        self._record("miss")
+        return None
+
+    def peek(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached snapshot even if expired, without touching LRU order or counters"""
+        entry = self._entries.get(job_id)
+        return entry[0] if entry is not None else None
+
+    def put(self, job_id: str, provider_name: str, snapshot: Dict[str, Any]):
+        if snapshot["status"] in TERMINAL_STATUSES:
+            expires_at = None
+        else:
+            expires_at = time.monotonic() + self.provider_ttls.get(provider_name, self.default_ttl)
+        size = len(json.dumps(snapshot, default=str))
+        self._remove(job_id)
+        self._entries[job_id] = (snapshot, expires_at, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest_job_id = next(iter(self._entries))
+            self._remove(oldest_job_id)
+            self._record("eviction")
+
+    def invalidate(self, job_id: str):
+        self._remove(job_id)
+
+    def _remove(self, job_id: str):
+        entry = self._entries.pop(job_id, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _record(self, event: str):
+        if event == "hit":
+            self.hits += 1
+        elif event == "miss":
+            self.misses += 1
+        else:
+            self.evictions += 1
+        if self.monitoring is not None:
+            self.monitoring.record_cache_event("status", event)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0
+        }
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+DEFAULT_POLL_INTERVALS: Dict[str, float] = {
+    "pending": 5.0,
+    "queued": 5.0,
+    "initializing": 1.0,
+    "running": 1.0,
+    "unknown": 10.0
+}
+
+class StatusPoller:
+    """Background status polling with single-flight lookups and per-provider batching"""
+    def __init__(
+        self,
+        orchestrator: Any,
+        intervals: Optional[Dict[str, float]] = None,
+        tick_interval: float = 0.2,
+        max_batch_size: int = 100
+    ):
+        self.orchestrator = orchestrator
+        self.intervals = {**DEFAULT_POLL_INTERVALS, **(intervals or {})}
+        self.tick_interval = tick_interval
+        self.max_batch_size = max_batch_size
+        self._next_poll: Dict[str, float] = {}
+        self._targets: Dict[str, Tuple[str, str]] = {}
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.provider_calls = 0
+        self.coalesced_lookups = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def track(
+        self,
+        internal_job_id: str,
+        status: str,
+        provider_name: Optional[str] = None,
+        external_job_id: Optional[str] = None
+    ):
+        """(Re)schedule a job according to its unified status; terminal jobs stop polling"""
+        if status in TERMINAL_STATUSES:
+            self.untrack(internal_job_id)
+            return
+        if provider_name is not None and external_job_id is not None:
+            self._targets[internal_job_id] = (provider_name, external_job_id)
+        if internal_job_id not in self._targets:
+            return
+        interval = self.intervals.get(status, self.intervals["unknown"])
+        self._next_poll[internal_job_id] = time.monotonic() + interval
+
+    def untrack(self, internal_job_id: str):
+        self._next_poll.pop(internal_job_id, None)
+        self._targets.pop(internal_job_id, None)
+
+    @property
+    def tracked_jobs(self) -> int:
+        return len(self._next_poll)
+
+    async def fetch(self, provider_name: str, external_job_id: str) -> Dict[str, Any]:
+        statuses = await self.fetch_many(provider_name, [external_job_id])
+        return statuses[external_job_id]
+
+    async def fetch_many(
+        self,
+        provider_name: str,
+        external_job_ids: List[str],
+        return_exceptions: bool = False
+    ) -> Dict[str, Any]:
+        """Look up many jobs at one provider, joining lookups that are already in flight"""
+        loop = asyncio.get_running_loop()
+        waiting: Dict[str, asyncio.Future] = {}
+        to_fetch: List[str] = []
+        for external_job_id in dict.fromkeys(external_job_ids):
+            key = (provider_name, external_job_id)
+            future = self._in_flight.get(key)
+            if future is None:
+                future = loop.create_future()
+                self._in_flight[key] = future
+                to_fetch.append(external_job_id)
+            else:
+                self.coalesced_lookups += 1
+            waiting[external_job_id] = future
+        if to_fetch:
+            await self._fetch_from_provider(provider_name, to_fetch)
+        results = await asyncio.gather(*waiting.values(), return_exceptions=return_exceptions)
+        return dict(zip(waiting, results))
+
+    async def _fetch_from_provider(self, provider_name: str, external_job_ids: List[str]):
+        provider = self.orchestrator.providers[provider_name]
+        try:
+            for start in range(0, len(external_job_ids), self.max_batch_size):
+                chunk = external_job_ids[start:start + self.max_batch_size]
+                self.provider_calls += 1 if provider.supports_batch_status else len(chunk)
+                try:
+                    results = await provider.get_job_statuses(chunk)
+                except Exception as e:
+                    results = {external_job_id: e for external_job_id in chunk}
+                for external_job_id in chunk:
+                    future = self._in_flight.pop((provider_name, external_job_id))
+                    result = results.get(external_job_id)
+                    if result is None:
+                        result = ValueError(f"Provider '{provider_name}' returned no status for {external_job_id}")
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        finally:
+            for external_job_id in external_job_ids:
+                future = self._in_flight.pop((provider_name, external_job_id), None)
+                if future is not None and not future.done():
+                    future.cancel()
+
+    async def poll_due(self):
+        now = time.monotonic()
+        due = [job_id for job_id, next_poll in self._next_poll.items() if next_poll <= now]
+        if not due:
+            return
+        by_provider: Dict[str, Dict[str, List[str]]] = {}
+        for internal_job_id in due:
+            provider_name, external_job_id = self._targets[internal_job_id]
+            # Push the deadline out so a slow provider does not get the same job again next tick
+            self._next_poll[internal_job_id] = now + self.intervals["unknown"]
+            external_jobs = by_provider.setdefault(provider_name, {})
+            external_jobs.setdefault(external_job_id, []).append(internal_job_id)
+        await asyncio.gather(*(
+            self._poll_provider(provider_name, external_jobs)
+            for provider_name, external_jobs in by_provider.items()
+        ))
+
+    async def _poll_provider(self, provider_name: str, external_jobs: Dict[str, List[str]]):
+        statuses = await self.fetch_many(provider_name, list(external_jobs), return_exceptions=True)
+        for external_job_id, provider_status in statuses.items():
+            if isinstance(provider_status, BaseException):
+                continue
+            for internal_job_id in external_jobs[external_job_id]:
+                await self.orchestrator._apply_provider_status(internal_job_id, provider_status)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            try:
+                if await self.orchestrator.should_poll():
+                    await self.poll_due()
+            except Exception:
+                continue
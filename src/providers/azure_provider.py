@@ -1,8 +1,14 @@
 import uuid
 from .base import QuantumProvider
-from typing import Dict, Any
+from typing import Dict, Any, List
+from src.circuits.ir import CircuitIR
+from src.circuits.transpile import transpile
 
 class AzureQuantumProvider(QuantumProvider):
+    target_format = "qsharp"
+    native_parameter_binding = True
+    supports_batch_status = True
+
     def _get_base_url(self) -> str:
         return "https://management.azure.com"
 
@@ -14,6 +20,10 @@ class AzureQuantumProvider(QuantumProvider):
         # Demo: Status-Response simulieren
         return {"status": "Succeeded"}
 
+    async def get_job_statuses(self, external_job_ids: List[str]) -> Dict[str, Any]:
+        # Demo: one list-jobs call instead of a request per job
+        return {external_job_id: {"status": "Succeeded"} for external_job_id in external_job_ids}
+
     async def get_job_result(self, external_job_id: str) -> Dict[str, Any]:
         # Demo: Ergebnis simulieren
         return {"result": "simulated_azure_result"}
@@ -21,5 +31,8 @@ class AzureQuantumProvider(QuantumProvider):
     async def cancel_job(self, external_job_id: str) -> bool:
         return True
 
-    def _transform_circuit(self, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
-        return {"qsharp": circuit_data}
+    def _transform_circuit(self, circuit: CircuitIR) -> Dict[str, Any]:
+        bindings = self.parameter_bindings(circuit)
+        if bindings is not None:
+            return {"qsharp": transpile(circuit.template, "qsharp"), "input_params": bindings}
+        return {"qsharp": transpile(circuit, "qsharp")}
@@ -1,11 +1,148 @@
+import asyncio
+import hashlib
+import json
+import weakref
+import httpx
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
+from src.circuits.ir import CircuitIR, circuit_to_dict
+from src.monitoring.tracing import span, trace_headers
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_POOL_CONFIG: Dict[str, Any] = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "http2": True,
+    "connect_timeout": 5.0,
+    "read_timeout": 30.0,
+    "write_timeout": 30.0,
+    "pool_timeout": 5.0
+}
 
 class QuantumProvider(ABC):
     """Abstract base class for all Quantum Providers"""
+    # Providers with a native list/bulk status query set this and override get_job_statuses
+    supports_batch_status = False
+    # Providers that accept several jobs in one request set this and override submit_jobs
+    supports_batch_submission = False
+    max_batch_submission = 100
+    # Keys of the transformed circuit that change on every call and must not affect its fingerprint
+    volatile_circuit_keys: tuple = ()
+    # Providers that set this receive a CircuitIR in _transform_circuit and are fingerprinted without transpiling
+    target_format: Optional[str] = None
+    # Providers that accept parameter values next to a symbolic circuit set this; a sweep then shares one emitted template
+    native_parameter_binding = False
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.base_url = self._get_base_url()
+        self.pool_config = {**DEFAULT_POOL_CONFIG, **config.get("http_pool", {})}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests_sent = 0
+        self._connections_opened = 0
+        self._known_connections: "weakref.WeakSet" = weakref.WeakSet()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared pooled client, created on first use if startup() was not called"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_http_client()
+        return self._client
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        pool = self.pool_config
+        limits = httpx.Limits(
+            max_connections=pool["max_connections"],
+            max_keepalive_connections=pool["max_keepalive_connections"],
+            keepalive_expiry=pool["keepalive_expiry"]
+        )
+        timeout = httpx.Timeout(
+            connect=pool["connect_timeout"],
+            read=pool["read_timeout"],
+            write=pool["write_timeout"],
+            pool=pool["pool_timeout"]
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=timeout,
+            http2=pool["http2"] and HTTP2_AVAILABLE,
+            transport=pool.get("transport"),
+            event_hooks={"request": [self._inject_trace_headers], "response": [self._track_connection]}
+        )
+
+    async def _inject_trace_headers(self, request: httpx.Request):
+        request.headers.update(trace_headers())
+
+    async def _track_connection(self, response: httpx.Response):
+        self._requests_sent += 1
+        for connection in self._pool_connections():
+            if connection not in self._known_connections:
+                self._known_connections.add(connection)
+                self._connections_opened += 1
+
+    def _pool_connections(self) -> list:
+        if self._client is None:
+            return []
+        pool = getattr(self._client._transport, "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+    async def startup(self):
+        """Open the shared connection pool"""
+        self.http_client
+
+    async def shutdown(self):
+        """Close the shared connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        connections = self._pool_connections()
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.pool_config["http2"] and HTTP2_AVAILABLE,
+            "max_connections": self.pool_config["max_connections"],
+            "max_keepalive_connections": self.pool_config["max_keepalive_connections"],
+            "connections_in_use": len(connections) - idle,
+            "connections_idle": idle,
+            "requests_sent": self._requests_sent,
+            "connections_opened": self._connections_opened,
+            "handshakes_avoided": max(self._requests_sent - self._connections_opened, 0)
+        }
+
+    def circuit_fingerprint(self, circuit_data: Union[CircuitIR, Dict[str, Any]], job_config: Dict[str, Any]) -> str:
+        """Canonical hash of the provider-specific circuit and its execution config"""
+        if self.target_format is not None:
+            circuit: Any = {"format": self.target_format, "ir": CircuitIR.coerce(circuit_data).fingerprint}
+        else:
+            transformed = self.transform_circuit(circuit_data)
+            circuit = {key: value for key, value in transformed.items() if key not in self.volatile_circuit_keys}
+        payload = json.dumps(
+            {"circuit": circuit, "config": job_config},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def transform_circuit(self, circuit_data: Union[CircuitIR, Dict[str, Any]]) -> Dict[str, Any]:
+        with span("transform", provider=type(self).__name__):
+            if self.target_format is None:
+                return self._transform_circuit(circuit_to_dict(circuit_data))
+            return self._transform_circuit(CircuitIR.coerce(circuit_data))
+
+    def parameter_bindings(self, circuit_data: Any) -> Optional[Dict[str, float]]:
+        """Values to send next to the template for a circuit bound from one, if this provider binds natively"""
+        if self.native_parameter_binding and isinstance(circuit_data, CircuitIR) and circuit_data.template is not None:
+            return circuit_data.bound_parameters()
+        return None
 
     @abstractmethod
     def _get_base_url(self) -> str:
@@ -17,22 +154,41 @@ class QuantumProvider(ABC):
         """Submit job, return external job ID"""
         pass
 
+    async def submit_jobs(self, jobs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Any]:
+        """Submit (circuit_data, job_config) pairs; items are external job IDs or the exception raised"""
+        return await asyncio.gather(
+            *(self.submit_job(circuit_data, job_config) for circuit_data, job_config in jobs),
+            return_exceptions=True
+        )
+
     @abstractmethod
     async def get_job_status(self, external_job_id: str) -> Dict[str, Any]:
         """Get job status from provider"""
         pass
 
+    async def get_job_statuses(self, external_job_ids: List[str]) -> Dict[str, Any]:
+        """Get many job statuses; values are status dicts or the exception raised for that job"""
+        results = await asyncio.gather(
+            *(self.get_job_status(external_job_id) for external_job_id in external_job_ids),
+            return_exceptions=True
+        )
+        return dict(zip(external_job_ids, results))
+
     @abstractmethod
     async def get_job_result(self, external_job_id: str) -> Dict[str, Any]:
         """Get job result from provider"""
         pass
 
+    async def stream_job_result(self, external_job_id: str) -> AsyncIterator[bytes]:
+        """Raw JSON result in chunks; providers that can download it incrementally override this"""
+        yield json.dumps(await self.get_job_result(external_job_id), default=str).encode()
+
     @abstractmethod
     async def cancel_job(self, external_job_id: str) -> bool:
         """Cancel job at provider"""
         pass
 
     @abstractmethod
-    def _transform_circuit(self, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _transform_circuit(self, circuit_data: Any) -> Dict[str, Any]:
         """Transform circuit to provider-specific format"""
         pass
@@ -1,13 +1,21 @@
 import uuid
 from .base import QuantumProvider
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+from src.circuits.ir import CircuitIR
+from src.circuits.transpile import transpile
 
 class GoogleQuantumProvider(QuantumProvider):
+    target_format = "cirq"
+    native_parameter_binding = True
+    supports_batch_status = True
+    supports_batch_submission = True
+
     def _get_base_url(self) -> str:
         return "https://quantum.googleapis.com"
 
     async def submit_job(self, circuit_data: Dict[str, Any], job_config: Dict[str, Any]) -> str:
-        cirq_circuit = self._transform_circuit(circuit_data)
+        cirq_circuit = self.transform_circuit(circuit_data)
+        bindings = self.parameter_bindings(circuit_data)
         processor = job_config.get("processor", "simulator")
         repetitions = job_config.get("repetitions", 1000)
         # Authentifizierung und Token-Handling muss hier ergänzt werden
@@ -24,13 +32,24 @@ class GoogleQuantumProvider(QuantumProvider):
             "processor": processor,
             "run_context": {"repetitions": repetitions}
         }
+        if bindings is not None:
+            payload["run_context"]["parameter_sweeps"] = [{"repetitions": repetitions, "sweep": {"points": [bindings]}}]
         # HTTP-Request an Google Quantum AI (Demo: kein echter Call)
         return payload["name"]
 
+    async def submit_jobs(self, jobs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Any]:
+        # Demo: one batch program with a job per circuit instead of a program per circuit
+        batch_name = f"projects/{self.config.get('project_id', 'demo-project')}/programs/{uuid.uuid4().hex}"
+        return [f"{batch_name}/jobs/{index}" for index in range(len(jobs))]
+
     async def get_job_status(self, external_job_id: str) -> Dict[str, Any]:
         # Demo: Status-Response simulieren
         return {"execution_status": {"state": "SUCCESS"}}
 
+    async def get_job_statuses(self, external_job_ids: List[str]) -> Dict[str, Any]:
+        # Demo: one ListJobs call instead of a GetJob per job
+        return {external_job_id: {"execution_status": {"state": "SUCCESS"}} for external_job_id in external_job_ids}
+
     async def get_job_result(self, external_job_id: str) -> Dict[str, Any]:
         # Demo: Ergebnis simulieren
         return {"result": "simulated_google_result"}
@@ -38,13 +57,10 @@ class GoogleQuantumProvider(QuantumProvider):
     async def cancel_job(self, external_job_id: str) -> bool:
         return True
 
-    def _transform_circuit(self, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _transform_circuit(self, circuit: CircuitIR) -> Dict[str, Any]:
         return {
             "program": {
                 "language": {"gate_set": "sqrt_iswap"},
-                "circuit": {
-                    "scheduling_strategy": "MOMENT_BY_MOMENT",
-                    "moments": circuit_data.get("gates", [])
-                }
+                "circuit": transpile(circuit.template if self.parameter_bindings(circuit) is not None else circuit, "cirq")
             }
         }
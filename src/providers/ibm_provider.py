@@ -1,14 +1,18 @@
-import httpx
 import uuid
 from .base import QuantumProvider
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
+from src.circuits.ir import CircuitIR
+from src.circuits.transpile import transpile
 
 class IBMQuantumProvider(QuantumProvider):
+    target_format = "qiskit"
+    native_parameter_binding = True
+
     def _get_base_url(self) -> str:
         return "https://api.quantum-computing.ibm.com"
 
     async def submit_job(self, circuit_data: Dict[str, Any], job_config: Dict[str, Any]) -> str:
-        qiskit_circuit = self._transform_circuit(circuit_data)
+        qiskit_circuit = self.transform_circuit(circuit_data)
         backend = job_config.get("backend", "ibmq_qasm_simulator")
         shots = job_config.get("shots", 1024)
         headers = {
@@ -18,57 +22,62 @@ class IBMQuantumProvider(QuantumProvider):
         payload = {
             "backend": backend,
             "shots": shots,
-            "qobj": qiskit_circuit,
+            "qobj": {"qobj_id": f"qobj_{uuid.uuid4().hex[:8]}", **qiskit_circuit},
             "hub": self.config.get("hub", "ibm-q"),
             "group": self.config.get("group", "open"),
             "project": self.config.get("project", "main")
         }
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/v1/jobs",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result["id"]
+        response = await self.http_client.post(
+            f"{self.base_url}/v1/jobs",
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        result = response.json()
+        return result["id"]
 
     async def get_job_status(self, external_job_id: str) -> Dict[str, Any]:
         headers = {"Authorization": f"Bearer {self.config['api_token']}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/v1/jobs/{external_job_id}",
-                headers=headers
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.http_client.get(
+            f"{self.base_url}/v1/jobs/{external_job_id}",
+            headers=headers
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def get_job_result(self, external_job_id: str) -> Dict[str, Any]:
         headers = {"Authorization": f"Bearer {self.config['api_token']}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/v1/jobs/{external_job_id}/result",
-                headers=headers
-            )
+        response = await self.http_client.get(
+            f"{self.base_url}/v1/jobs/{external_job_id}/result",
+            headers=headers
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def stream_job_result(self, external_job_id: str) -> AsyncIterator[bytes]:
+        headers = {"Authorization": f"Bearer {self.config['api_token']}"}
+        async with self.http_client.stream(
+            "GET", f"{self.base_url}/v1/jobs/{external_job_id}/result", headers=headers
+        ) as response:
             response.raise_for_status()
-            return response.json()
+            async for chunk in response.aiter_bytes():
+                yield chunk
 
     async def cancel_job(self, external_job_id: str) -> bool:
         headers = {"Authorization": f"Bearer {self.config['api_token']}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/v1/jobs/{external_job_id}/cancel",
-                headers=headers
-            )
-            return response.status_code == 200
+        response = await self.http_client.post(
+            f"{self.base_url}/v1/jobs/{external_job_id}/cancel",
+            headers=headers
+        )
+        return response.status_code == 200
 
-    def _transform_circuit(self, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "qobj_id": f"qobj_{uuid.uuid4().hex[:8]}",
+    def _transform_circuit(self, circuit: CircuitIR) -> Dict[str, Any]:
+        bindings = self.parameter_bindings(circuit)
+        qobj = {
             "type": "QASM",
             "schema_version": "1.3.0",
-            "experiments": [{
-                "instructions": circuit_data.get("gates", []),
-                "header": {"n_qubits": circuit_data.get("num_qubits", 2)}
-            }]
+            "experiments": [transpile(circuit.template if bindings is not None else circuit, "qiskit")]
         }
+        if bindings is not None:
+            qobj["config"] = {"parameter_binds": [{name: [value] for name, value in bindings.items()}]}
+        return qobj
@@ -0,0 +1,242 @@
+import asyncio
+import time
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+import httpx
+from .base import QuantumProvider
+from src.monitoring.tracing import span
+
+# Conservative request quotas per vendor API; override per provider with the "resilience" config key
+DEFAULT_RESILIENCE_CONFIG: Dict[str, Any] = {
+    "rate_per_second": 10.0,
+    "burst": 20,
+    "max_in_flight": 32,
+    "failure_threshold": 5,
+    "recovery_timeout": 30.0,
+    "timeouts": {"submit": 30.0, "status": 10.0, "result": 60.0, "cancel": 10.0}
+}
+
+VENDOR_RESILIENCE_CONFIG: Dict[str, Dict[str, Any]] = {
+    "ibm": {"rate_per_second": 5.0, "burst": 10},
+    "google": {"rate_per_second": 10.0, "burst": 20},
+    "azure": {"rate_per_second": 8.0, "burst": 16}
+}
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open"""
+    def __init__(self, provider_name: str, retry_after: float):
+        super().__init__(f"Provider '{provider_name}' is unavailable, retry in {retry_after:.1f}s")
+        self.provider_name = provider_name
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Token bucket that hands out reservations, so waiters are served in arrival order without a lock"""
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    async def acquire(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        delay = -self.tokens / self.rate
+        self.waits += 1
+        self.wait_seconds += delay
+        await asyncio.sleep(delay)
+        return delay
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single probe through once the recovery timeout passes"""
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+
+    @property
+    def available(self) -> bool:
+        return self.state != self.OPEN or time.monotonic() - self.opened_at >= self.recovery_timeout
+
+    def before_call(self) -> Optional[float]:
+        """Returns None if the call may proceed, otherwise the seconds until the next probe"""
+        if self.state == self.CLOSED:
+            return None
+        if self.state == self.OPEN:
+            remaining = self.recovery_timeout - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                self.rejected += 1
+                return remaining
+            self.state = self.HALF_OPEN
+        if self._probe_in_flight:
+            self.rejected += 1
+            return self.recovery_timeout
+        self._probe_in_flight = True
+        return None
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        self.state = self.CLOSED
+
+    def record_ignored(self):
+        """The call failed for a reason unrelated to provider health"""
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+def is_provider_failure(error: BaseException) -> bool:
+    """Errors that indicate vendor trouble; client errors such as a rejected circuit do not trip the breaker"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, (httpx.HTTPError, TimeoutError, ConnectionError, OSError))
+
+class ResilientProvider:
+    """Wraps a QuantumProvider with a rate limiter, an in-flight cap, a circuit breaker and per-call timeouts.
+
+    Every other attribute is delegated to the wrapped provider, so the orchestrator can use it unchanged.
+    """
+    def __init__(self, name: str, provider: QuantumProvider, config: Optional[Dict[str, Any]] = None):
+        config = {
+            **DEFAULT_RESILIENCE_CONFIG,
+            **VENDOR_RESILIENCE_CONFIG.get(name, {}),
+            **provider.config.get("resilience", {}),
+            **(config or {})
+        }
+        self.name = name
+        self.provider = provider
+        self.timeouts = {**DEFAULT_RESILIENCE_CONFIG["timeouts"], **config["timeouts"]}
+        self.limiter = TokenBucket(config["rate_per_second"], config["burst"])
+        self.max_in_flight = config["max_in_flight"]
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.breaker = CircuitBreaker(config["failure_threshold"], config["recovery_timeout"])
+        self.calls = 0
+        self.failures = 0
+        self.timeouts_hit = 0
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.provider, attribute)
+
+    @property
+    def available(self) -> bool:
+        return self.breaker.available
+
+    async def _call(self, kind: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        retry_after = self.breaker.before_call()
+        if retry_after is not None:
+            raise CircuitOpenError(self.name, retry_after)
+        try:
+            with span(f"provider.{kind}", provider=self.name) as record:
+                waited = await self.limiter.acquire()
+                if record is not None and waited:
+                    record.attributes["rate_limit_wait_ms"] = waited * 1000
+                async with self.semaphore:
+                    self.calls += 1
+                    async with asyncio.timeout(self.timeouts[kind]):
+                        result = await call()
+        except BaseException as e:
+            if isinstance(e, TimeoutError):
+                self.timeouts_hit += 1
+            if isinstance(e, Exception) and is_provider_failure(e):
+                self.failures += 1
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_ignored()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def submit_job(self, circuit_data: Dict[str, Any], job_config: Dict[str, Any]) -> str:
+        return await self._call("submit", lambda: self.provider.submit_job(circuit_data, job_config))
+
+    async def submit_jobs(self, jobs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Any]:
+        if self.provider.supports_batch_submission:
+            return await self._call("submit", lambda: self.provider.submit_jobs(jobs))
+        return await asyncio.gather(
+            *(self.submit_job(circuit_data, job_config) for circuit_data, job_config in jobs),
+            return_exceptions=True
+        )
+
+    async def get_job_status(self, external_job_id: str) -> Dict[str, Any]:
+        return await self._call("status", lambda: self.provider.get_job_status(external_job_id))
+
+    async def get_job_statuses(self, external_job_ids: List[str]) -> Dict[str, Any]:
+        if self.provider.supports_batch_status:
+            return await self._call("status", lambda: self.provider.get_job_statuses(external_job_ids))
+        statuses = await asyncio.gather(
+            *(self.get_job_status(external_job_id) for external_job_id in external_job_ids),
+            return_exceptions=True
+        )
+        return dict(zip(external_job_ids, statuses))
+
+    async def get_job_result(self, external_job_id: str) -> Dict[str, Any]:
+        return await self._call("result", lambda: self.provider.get_job_result(external_job_id))
+
+    async def stream_job_result(self, external_job_id: str) -> AsyncIterator[bytes]:
+        """Same guards as _call; the timeout applies to each chunk, so large downloads are not cut off"""
+        retry_after = self.breaker.before_call()
+        if retry_after is not None:
+            raise CircuitOpenError(self.name, retry_after)
+        try:
+            await self.limiter.acquire()
+            async with self.semaphore:
+                self.calls += 1
+                chunks = self.provider.stream_job_result(external_job_id)
+                try:
+                    while True:
+                        try:
+                            async with asyncio.timeout(self.timeouts["result"]):
+                                chunk = await chunks.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        yield chunk
+                finally:
+                    await chunks.aclose()
+        except BaseException as e:
+            if isinstance(e, TimeoutError):
+                self.timeouts_hit += 1
+            if isinstance(e, Exception) and is_provider_failure(e):
+                self.failures += 1
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_ignored()
+            raise
+        self.breaker.record_success()
+
+    async def cancel_job(self, external_job_id: str) -> bool:
+        return await self._call("cancel", lambda: self.provider.cancel_job(external_job_id))
+
+    def get_resilience_stats(self) -> Dict[str, Any]:
+        return {
+            "breaker_state": self.breaker.state,
+            "available": self.available,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "times_opened": self.breaker.times_opened,
+            "rejected_calls": self.breaker.rejected,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts_hit,
+            "in_flight": self.max_in_flight - self.semaphore._value,
+            "max_in_flight": self.max_in_flight,
+            "rate_per_second": self.limiter.rate,
+            "limiter_waits": self.limiter.waits,
+            "limiter_wait_seconds_total": self.limiter.wait_seconds
+        }
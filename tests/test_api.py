@@ -0,0 +1,128 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from src.api.quantum_gateway_api import app
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def sweep_job(theta: float, provider: str = "google"):
+    return {
+        "algorithm_type": "qaoa",
+        "circuit_data": {"gates": [{"type": "rx", "qubit": 0, "params": [theta]}], "num_qubits": 1},
+        "preferred_provider": provider
+    }
+
+def test_batch_submission_streams_per_item_results(client):
+    jobs = [sweep_job(0.1 * i) for i in range(5)] + [sweep_job(0.5, "azure"), sweep_job(0.1, "google")]
+    response = client.post("/api/v2/jobs:batch", json={"jobs": jobs, "max_concurrency": 4})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(item["index"] for item in items) == list(range(len(jobs)))
+    by_index = {item["index"]: item for item in items}
+    assert all("job_id" in item for item in items)
+    assert by_index[5]["provider"] == "azure"
+    assert by_index[1]["job_id"] != by_index[6]["job_id"]
+
+def submit_job(client, provider: str = "google") -> str:
+    response = client.post("/api/v2/jobs", json=sweep_job(0.3, provider))
+    assert response.status_code == 200
+    return response.json()["job_id"]
+
+def test_sse_stream_ends_after_terminal_status(client):
+    job_id = submit_job(client)
+    with client.stream("GET", f"/api/v2/jobs/{job_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+    assert body.startswith("event: status\n")
+    assert json.loads(body.split("data: ", 1)[1])["status"] == "completed"
+
+def test_sse_unknown_job_returns_404(client):
+    assert client.get("/api/v2/jobs/does-not-exist/events").status_code == 404
+
+def test_websocket_subscribes_to_many_jobs(client):
+    job_ids = [submit_job(client), submit_job(client, "azure")]
+    with client.websocket_connect("/api/v2/jobs/events/ws") as websocket:
+        websocket.send_json({"subscribe": job_ids + ["missing"]})
+        messages = [websocket.receive_json() for _ in range(3)]
+    assert {message["job_id"] for message in messages if message["type"] == "status"} == set(job_ids)
+    assert [message["job_id"] for message in messages if message["type"] == "error"] == ["missing"]
+
+def test_metrics_endpoint_serves_prometheus_text(client):
+    submit_job(client)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'quantum_jobs_total{provider="google"' in response.text
+    assert "quantum_provider_breaker_open" in response.text
+
+def test_sampled_request_records_stage_spans(client):
+    from src.api.endpoints import quantum_gateway
+    quantum_gateway.tracer.sample_rate = 1.0
+    try:
+        response = client.post("/api/v2/jobs", json=sweep_job(0.3141))
+    finally:
+        quantum_gateway.tracer.sample_rate = 0.0
+    assert response.status_code == 200
+    trace = quantum_gateway.tracer.recent[-1]
+    assert response.headers["x-trace-id"] == trace.trace_id
+    assert trace.name == "POST /api/v2/jobs"
+    stages = {record.name for record in trace.spans}
+    assert {"validation", "handler", "transform", "provider.submit", "status_lookup", "serialization"} <= stages
+
+def test_profiler_can_be_toggled_at_runtime(client, tmp_path):
+    from src.api.endpoints import quantum_gateway
+    quantum_gateway.profiler.output_dir = str(tmp_path)
+    response = client.post("/api/v2/debug/profiler", json={"enabled": True, "threshold_seconds": 0, "interval_seconds": 0.001})
+    assert response.json()["enabled"] is True
+    client.post("/api/v2/jobs", json=sweep_job(0.4))
+    status = client.post("/api/v2/debug/profiler", json={"enabled": False}).json()
+    assert status["enabled"] is False
+
+def test_invalid_circuit_is_rejected_with_all_errors(client):
+    job = sweep_job(0.2)
+    job["circuit_data"] = {"gates": [{"type": "rx", "qubit": 3}, {"type": "warp", "qubit": 0}], "num_qubits": 1}
+    response = client.post("/api/v2/jobs", json=job)
+    assert response.status_code == 422
+    assert len(response.json()["detail"]["errors"]) == 3
+
+def test_sweep_binds_registered_template(client):
+    circuit = {"gates": [{"type": "h", "qubit": 0}, {"type": "rx", "qubit": 0, "params": ["theta"]}], "num_qubits": 1}
+    response = client.post("/api/v2/circuits", json={"circuit_data": circuit})
+    assert response.status_code == 200
+    template = response.json()
+    assert template["parameters"] == ["theta"]
+    assert client.get(f"/api/v2/circuits/{template['template_id']}").json() == template
+    bindings = [[0.01 * i] for i in range(1, 21)]
+    response = client.post("/api/v2/jobs:sweep", json={
+        "algorithm_type": "qaoa", "template_id": template["template_id"], "parameter_bindings": bindings,
+        "preferred_provider": "google"
+    })
+    assert response.status_code == 200
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(item["index"] for item in items) == list(range(20))
+    assert len({item["job_id"] for item in items}) == 20
+    single = client.post("/api/v2/jobs", json={
+        "algorithm_type": "qaoa", "template_id": template["template_id"], "parameter_bindings": [[0.5]],
+        "preferred_provider": "azure"
+    })
+    assert single.status_code == 200
+
+def test_sweep_rejects_unknown_template_and_bad_bindings(client):
+    job = {"algorithm_type": "qaoa", "template_id": "tpl_missing", "parameter_bindings": [[0.1]]}
+    assert client.post("/api/v2/jobs:sweep", json=job).status_code == 404
+    circuit = {"gates": [{"type": "rx", "qubit": 0, "params": ["theta"]}], "num_qubits": 1}
+    template_id = client.post("/api/v2/circuits", json={"circuit_data": circuit}).json()["template_id"]
+    response = client.post("/api/v2/jobs:sweep", json={**job, "template_id": template_id, "parameter_bindings": [[0.1, 0.2]]})
+    assert response.status_code == 422
+
+def test_result_negotiates_encoding_and_formats(client):
+    job_id = submit_job(client)
+    response = client.get(f"/api/v2/jobs/{job_id}/result", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.json() == {"result": "simulated_google_result"}
+    assert client.get(f"/api/v2/jobs/{job_id}/result?format=counts").status_code == 422
+    assert client.get(f"/api/v2/jobs/{job_id}/result?format=bogus").status_code == 422
@@ -0,0 +1,162 @@
+import pytest
+import numpy as np
+from src.circuits.ir import CircuitIR, CircuitValidationError, circuit_to_dict, gate_count
+from src.circuits.templates import CircuitTemplate
+from src.circuits.transpile import TranspileCache, emit_qiskit, emit_cirq, emit_qsharp
+from src.providers.ibm_provider import IBMQuantumProvider
+from src.providers.google_provider import GoogleQuantumProvider
+
+BELL = {
+    "gates": [
+        {"type": "h", "qubit": 0},
+        {"type": "cnot", "control": 0, "target": 1},
+        {"type": "rz", "qubit": 1, "theta": 0.5},
+        {"type": "measure", "qubit": 0},
+        {"type": "measure", "qubit": 1}
+    ],
+    "num_qubits": 2
+}
+
+class TestCircuitIR:
+    def test_parses_into_columns(self):
+        circuit = CircuitIR.from_dict(BELL)
+        assert len(circuit) == 5
+        assert circuit.gate_names().tolist() == ["h", "cx", "rz", "measure", "measure"]
+        assert circuit.qubits[1].tolist() == [0, 1, -1]
+        assert circuit.params[2, 0] == 0.5 and np.isnan(circuit.params[0]).all()
+        circuit.validate()
+
+    def test_round_trips_to_dict(self):
+        circuit = CircuitIR.from_dict({**BELL, "name": "bell"})
+        again = CircuitIR.from_dict(circuit.to_dict())
+        assert again.fingerprint == circuit.fingerprint
+        assert circuit.to_dict()["name"] == "bell"
+        assert circuit_to_dict(BELL) is BELL
+
+    def test_fingerprint_depends_on_content(self):
+        other = {**BELL, "gates": [*BELL["gates"][:2], {"type": "rz", "qubit": 1, "theta": 0.25}]}
+        assert CircuitIR.from_dict(BELL).fingerprint == CircuitIR.from_dict(dict(BELL)).fingerprint
+        assert CircuitIR.from_dict(BELL).fingerprint != CircuitIR.from_dict(other).fingerprint
+
+    def test_validate_reports_every_problem(self):
+        circuit = CircuitIR.from_dict({
+            "gates": [
+                {"type": "h", "qubit": 0},
+                {"type": "warp", "qubit": 0},
+                {"type": "cx", "qubits": [0]},
+                {"type": "x", "qubit": 4},
+                {"type": "cz", "qubits": [1, 1]},
+                {"type": "rx", "qubit": 0}
+            ],
+            "num_qubits": 2
+        })
+        with pytest.raises(CircuitValidationError) as excinfo:
+            circuit.validate()
+        messages = excinfo.value.errors
+        assert len(messages) == 5
+        assert any("gate 1: unknown gate 'warp'" in message for message in messages)
+        assert any(message.startswith("gate 2:") for message in messages)
+        assert any("gate 3: qubit out of range" in message for message in messages)
+        assert any("gate 4: the same qubit" in message for message in messages)
+        assert any("gate 5: 'rx' needs 1" in message for message in messages)
+
+    def test_malformed_gate_raises_validation_error(self):
+        with pytest.raises(CircuitValidationError):
+            CircuitIR.from_dict({"gates": [{"type": "h", "qubit": "zero"}]})
+
+    def test_gate_count_accepts_both_forms(self):
+        assert gate_count(BELL) == gate_count(CircuitIR.from_dict(BELL)) == 5
+        assert gate_count(None) == 0
+
+class TestTranspile:
+    def test_qiskit_instructions(self):
+        experiment = emit_qiskit(CircuitIR.from_dict(BELL))
+        assert experiment["header"]["n_qubits"] == 2
+        assert experiment["instructions"][1] == {"name": "cx", "qubits": [0, 1]}
+        assert experiment["instructions"][2]["params"] == [0.5]
+        assert experiment["instructions"][3]["memory"] == [0]
+
+    def test_cirq_moments_pack_independent_gates(self):
+        circuit = CircuitIR.from_dict({
+            "gates": [{"type": "h", "qubit": 0}, {"type": "h", "qubit": 1}, {"type": "cz", "qubits": [0, 1]}],
+            "num_qubits": 2
+        })
+        moments = emit_cirq(circuit)["moments"]
+        assert [len(moment["operations"]) for moment in moments] == [2, 1]
+
+    def test_qsharp_source(self):
+        source = emit_qsharp(CircuitIR.from_dict(BELL))["source"]
+        assert "use q = Qubit[2];" in source
+        assert "CNOT(q[0], q[1]);" in source
+        assert "Rz(0.5, q[1]);" in source
+        with pytest.raises(CircuitValidationError):
+            emit_qsharp(CircuitIR.from_dict({"gates": [{"type": "iswap", "qubits": [0, 1]}]}))
+
+    def test_cache_reuses_emitted_circuit(self):
+        cache = TranspileCache(max_entries=1)
+        circuit = CircuitIR.from_dict(BELL)
+        first = cache.get_or_emit(circuit, "qiskit")
+        assert cache.get_or_emit(CircuitIR.from_dict(BELL), "qiskit") is first
+        cache.get_or_emit(circuit, "cirq")
+        assert cache.get_stats()["entries"] == 1
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_providers_fingerprint_without_transpiling(self):
+        ibm = IBMQuantumProvider({"api_token": "test_token"})
+        google = GoogleQuantumProvider({})
+        circuit = CircuitIR.from_dict(BELL)
+        assert ibm.circuit_fingerprint(circuit, {}) == ibm.circuit_fingerprint(BELL, {})
+        assert ibm.circuit_fingerprint(circuit, {}) != google.circuit_fingerprint(circuit, {})
+        assert ibm.transform_circuit(BELL)["experiments"][0]["header"]["n_qubits"] == 2
+
+QAOA = {
+    "gates": [
+        {"type": "h", "qubit": 0},
+        {"type": "h", "qubit": 1},
+        {"type": "rzz", "qubits": [0, 1], "params": ["gamma"]},
+        {"type": "rx", "qubit": 0, "theta": "beta"},
+        {"type": "rx", "qubit": 1, "params": [{"param": "beta"}]}
+    ],
+    "num_qubits": 2
+}
+
+class TestCircuitTemplate:
+    def test_symbols_become_parameters(self):
+        template = CircuitTemplate.from_dict(QAOA)
+        assert template.parameters == ["gamma", "beta"]
+        assert template.symbols() == {(2, 0): "gamma", (3, 0): "beta", (4, 0): "beta"}
+        template.validate()
+        assert CircuitTemplate.from_dict(template.to_dict()).template_id == template.template_id
+
+    def test_declared_order_is_used_for_bindings(self):
+        template = CircuitTemplate.from_dict({**QAOA, "parameters": ["beta", "gamma"]})
+        circuit = template.bind([[0.1, 0.7]])[0]
+        assert circuit.params[2, 0] == 0.7 and circuit.params[3, 0] == 0.1
+        with pytest.raises(CircuitValidationError):
+            CircuitTemplate.from_dict({**QAOA, "parameters": ["gamma"]})
+
+    def test_bind_is_vectorized_over_the_sweep(self):
+        template = CircuitTemplate.from_dict(QAOA)
+        bindings = np.column_stack([np.linspace(0, 1, 50), np.linspace(1, 2, 50)])
+        circuits = template.bind(bindings)
+        assert len(circuits) == 50
+        assert circuits[7].opcodes is template.opcodes
+        assert circuits[7].bound_parameters() == {"gamma": bindings[7, 0], "beta": bindings[7, 1]}
+        assert circuits[7].params[4, 0] == bindings[7, 1]
+        assert len({circuit.fingerprint for circuit in circuits}) == 50
+
+    def test_bad_bindings_are_rejected(self):
+        template = CircuitTemplate.from_dict(QAOA)
+        with pytest.raises(CircuitValidationError):
+            template.bind([[0.1]])
+        with pytest.raises(CircuitValidationError):
+            template.bind([[0.1, float("nan")]])
+
+    def test_native_binding_reuses_emitted_template(self):
+        provider = IBMQuantumProvider({"api_token": "test_token"})
+        first, second = CircuitTemplate.from_dict(QAOA).bind([[0.1, 0.2], [0.3, 0.4]])
+        qobj_first, qobj_second = provider.transform_circuit(first), provider.transform_circuit(second)
+        assert qobj_first["experiments"][0] is qobj_second["experiments"][0]
+        assert qobj_first["experiments"][0]["instructions"][2]["params"] == ["gamma"]
+        assert qobj_second["config"]["parameter_binds"] == [{"gamma": [0.3], "beta": [0.4]}]
+        assert provider.circuit_fingerprint(first, {}) != provider.circuit_fingerprint(second, {})
@@ -0,0 +1,74 @@
+import pytest
+import time
+from datetime import datetime, timedelta
+from src.monitoring.metrics import QuantumGatewayMonitoring, Histogram
+from src.monitoring.prometheus import PrometheusWriter, write_monitoring_metrics
+
+def run_job(monitoring: QuantumGatewayMonitoring, job_id: str, provider: str, queue_seconds: float, status: str = "completed"):
+    monitoring.record_job_submission(job_id, provider, "qaoa")
+    monitoring.job_metrics[job_id].submission_time -= timedelta(seconds=queue_seconds)
+    monitoring.record_job_status_change(job_id, "running")
+    monitoring.record_job_status_change(job_id, status)
+
+class TestHistogram:
+    def test_quantiles_interpolate_within_buckets(self):
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.observe(value * 0.6)
+        assert histogram.count == 100
+        assert histogram.mean == pytest.approx(30.3)
+        assert 10 <= histogram.quantile(0.5) <= 60
+        assert 30 <= histogram.quantile(0.95) <= 60
+        assert Histogram().quantile(0.5) is None
+
+class TestMonitoringAggregates:
+    def test_provider_statistics_from_counters(self):
+        monitoring = QuantumGatewayMonitoring()
+        for index in range(8):
+            run_job(monitoring, f"ok-{index}", "ibm", 20.0)
+        run_job(monitoring, "bad", "ibm", 5.0, status="failed")
+        monitoring.record_job_submission("waiting", "google", "vqe")
+        stats = monitoring.get_provider_statistics()
+        assert stats["ibm"]["total_jobs"] == 9
+        assert stats["ibm"]["completed_jobs"] == 8
+        assert stats["ibm"]["failed_jobs"] == 1
+        assert stats["ibm"]["success_rate"] == 8 / 9
+        assert stats["ibm"]["p95_queue_time_seconds"] is not None
+        assert stats["google"]["total_jobs"] == 1
+        assert stats["azure"]["total_jobs"] == 0
+        # Finished jobs no longer hold a per-job record
+        assert list(monitoring.job_metrics) == ["waiting"]
+        algorithms = monitoring.get_algorithm_statistics()
+        assert algorithms["qaoa"]["completed_jobs"] == 8
+        assert algorithms["vqe"]["preferred_providers"] == {"google": 1}
+
+    def test_window_excludes_old_slots(self):
+        monitoring = QuantumGatewayMonitoring(slot_seconds=0.05)
+        run_job(monitoring, "old", "ibm", 1.0)
+        time.sleep(0.12)
+        run_job(monitoring, "new", "ibm", 1.0)
+        assert monitoring.get_provider_statistics(timedelta(seconds=0.06))["ibm"]["total_jobs"] == 1
+        assert monitoring.get_provider_statistics()["ibm"]["total_jobs"] == 2
+
+    def test_unfinished_jobs_expire(self):
+        monitoring = QuantumGatewayMonitoring(job_retention=timedelta(hours=1), max_tracked_jobs=3)
+        monitoring.record_job_submission("stale", "ibm", "qaoa")
+        monitoring.job_metrics["stale"].submission_time = datetime.now() - timedelta(hours=2)
+        for index in range(5):
+            monitoring.record_job_submission(f"job-{index}", "ibm", "qaoa")
+        assert "stale" not in monitoring.job_metrics
+        assert len(monitoring.job_metrics) <= 4
+
+class TestPrometheusExport:
+    def test_text_format(self):
+        monitoring = QuantumGatewayMonitoring()
+        run_job(monitoring, "job-1", "ibm", 3.0)
+        monitoring.record_cache_event("status", "hit")
+        writer = PrometheusWriter()
+        write_monitoring_metrics(writer, monitoring)
+        text = writer.render()
+        assert '# TYPE quantum_job_queue_seconds histogram' in text
+        assert 'quantum_jobs_total{provider="ibm",algorithm="qaoa",event="completed"} 1' in text
+        assert 'quantum_job_queue_seconds_bucket{provider="ibm",le="5.0"} 1' in text
+        assert 'quantum_job_queue_seconds_bucket{provider="ibm",le="+Inf"} 1' in text
+        assert 'quantum_cache_events_total{cache="status",event="hit"} 1' in text
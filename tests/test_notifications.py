@@ -0,0 +1,102 @@
+import pytest
+import asyncio
+import json
+import httpx
+from datetime import datetime
+from src.monitoring.metrics import QuantumGatewayMonitoring
+from src.notifications.dispatcher import NotificationDispatcher
+from src.orchestration.orchestrator import QuantumJobOrchestrator
+
+async def add_finished_job(orchestrator, job_id: str, webhook_url: str):
+    await orchestrator.job_store.put({
+        "job_id": job_id,
+        "provider_name": "ibm",
+        "external_job_id": f"ext-{job_id}",
+        "submitted_at": datetime.now(),
+        "status": "completed",
+        "webhook_url": webhook_url
+    })
+    orchestrator.events.publish({
+        "job_id": job_id,
+        "status": "completed",
+        "previous_status": "running",
+        "provider": "ibm",
+        "external_job_id": f"ext-{job_id}",
+        "timestamp": datetime.now().isoformat()
+    })
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+class TestNotificationDispatcher:
+    async def test_batches_and_retries_deliveries(self):
+        received = []
+        failures = {"remaining": 1}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if failures["remaining"]:
+                failures["remaining"] -= 1
+                return httpx.Response(503)
+            received.append(json.loads(request.content))
+            return httpx.Response(200)
+
+        orchestrator = QuantumJobOrchestrator()
+        monitoring = QuantumGatewayMonitoring()
+        dispatcher = NotificationDispatcher(
+            orchestrator,
+            monitoring=monitoring,
+            base_backoff=0.01,
+            batch_window=0.05,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        await dispatcher.start()
+        await add_finished_job(orchestrator, "job-1", "https://hooks.test/done")
+        await add_finished_job(orchestrator, "job-2", "https://hooks.test/done")
+        await wait_for(lambda: dispatcher.delivered == 2)
+        await dispatcher.stop()
+        assert len(received) == 1
+        assert [event["job_id"] for event in received[0]["events"]] == ["job-1", "job-2"]
+        assert monitoring.get_webhook_statistics()["delivered"] == 2
+
+    async def test_slow_receiver_does_not_stall_others(self):
+        release = asyncio.Event()
+        fast_deliveries = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "slow.test":
+                await release.wait()
+            else:
+                fast_deliveries.append(request.url.host)
+            return httpx.Response(200)
+
+        orchestrator = QuantumJobOrchestrator()
+        dispatcher = NotificationDispatcher(
+            orchestrator,
+            batch_window=0,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        await dispatcher.start()
+        await add_finished_job(orchestrator, "slow-job", "https://slow.test/hook")
+        await add_finished_job(orchestrator, "fast-job", "https://fast.test/hook")
+        await wait_for(lambda: fast_deliveries == ["fast.test"])
+        release.set()
+        await wait_for(lambda: dispatcher.delivered == 2)
+        await dispatcher.stop()
+
+    async def test_rejected_delivery_goes_to_dead_letters(self):
+        orchestrator = QuantumJobOrchestrator()
+        dispatcher = NotificationDispatcher(
+            orchestrator,
+            batch_window=0,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(410)))
+        )
+        await dispatcher.start()
+        await add_finished_job(orchestrator, "job-1", "https://gone.test/hook")
+        await wait_for(lambda: len(dispatcher.dead_letters) == 1)
+        await dispatcher.stop()
+        assert dispatcher.dead_letters[0]["attempts"] == 1
+        assert dispatcher.delivered == 0
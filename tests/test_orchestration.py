@@ -0,0 +1,396 @@
+import pytest
+import pytest_asyncio
+import asyncio
+import gzip
+import io
+import json
+import os
+import numpy as np
+from datetime import datetime
+from typing import Dict, Any, List
+from src.orchestration.orchestrator import QuantumJobOrchestrator, SubmissionError
+from src.orchestration.status_cache import StatusCache
+from src.orchestration.result_cache import ResultCache
+from src.orchestration import result_formats
+from src.orchestration.job_store import InMemoryJobStore, SQLiteJobStore
+from src.orchestration.redis_state import RedisJobStore, RedisSharedState
+from src.monitoring.metrics import QuantumGatewayMonitoring
+from src.providers.base import QuantumProvider
+
+class CountingProvider(QuantumProvider):
+    supports_batch_status = True
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.status = config.get("status", "RUNNING")
+        self.status_calls = 0
+        self.batch_calls = 0
+        self.submitted = 0
+        self.cancelled: List[str] = []
+
+    def _get_base_url(self) -> str:
+        return "http://provider.test"
+
+    async def submit_job(self, circuit_data: Dict[str, Any], job_config: Dict[str, Any]) -> str:
+        self.submitted += 1
+        return f"ext-{self.submitted}"
+
+    async def get_job_status(self, external_job_id: str) -> Dict[str, Any]:
+        self.status_calls += 1
+        await asyncio.sleep(0.01)
+        return {"status": self.status}
+
+    async def get_job_statuses(self, external_job_ids: List[str]) -> Dict[str, Any]:
+        self.batch_calls += 1
+        await asyncio.sleep(0.01)
+        return {external_job_id: {"status": self.status} for external_job_id in external_job_ids}
+
+    async def get_job_result(self, external_job_id: str) -> Dict[str, Any]:
+        return {"counts": {"00": 512, "11": 512}}
+
+    async def cancel_job(self, external_job_id: str) -> bool:
+        self.cancelled.append(external_job_id)
+        return True
+
+    def _transform_circuit(self, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(circuit_data)
+
+@pytest.mark.asyncio
+class TestStatusPolling:
+    @pytest.fixture
+    def orchestrator(self):
+        orchestrator = QuantumJobOrchestrator()
+        orchestrator.register_provider("ibm", CountingProvider({}))
+        return orchestrator
+
+    async def test_concurrent_status_reads_are_coalesced(self, orchestrator):
+        job_id = await orchestrator.submit_job("ibm", {"gates": []}, {})
+        statuses = await asyncio.gather(*(orchestrator.get_job_status(job_id) for _ in range(50)))
+        assert {status["status"] for status in statuses} == {"running"}
+        assert orchestrator.providers["ibm"].batch_calls == 1
+        assert orchestrator.poller.coalesced_lookups == 49
+
+    async def test_due_jobs_are_batched_per_provider(self, orchestrator):
+        job_ids = [await orchestrator.submit_job("ibm", {"gates": []}, {}) for _ in range(5)]
+        for job_id in job_ids:
+            orchestrator.poller._next_poll[job_id] = 0
+        await orchestrator.poller.poll_due()
+        assert orchestrator.providers["ibm"].batch_calls == 1
+        for job_id in job_ids:
+            assert (await orchestrator.job_store.get(job_id))["status"] == "running"
+
+    async def test_terminal_jobs_stop_polling(self, orchestrator):
+        orchestrator.providers["ibm"].status = "DONE"
+        job_id = await orchestrator.submit_job("ibm", {"gates": []}, {})
+        assert orchestrator.poller.tracked_jobs == 1
+        await orchestrator.get_job_status(job_id)
+        assert orchestrator.poller.tracked_jobs == 0
+        await orchestrator.get_job_status(job_id)
+        assert orchestrator.providers["ibm"].batch_calls == 1
+
+    async def test_running_jobs_poll_faster_than_queued(self, orchestrator):
+        poller = orchestrator.poller
+        poller.track("queued-job", "queued", "ibm", "ext-1")
+        poller.track("running-job", "running", "ibm", "ext-2")
+        assert poller._next_poll["running-job"] < poller._next_poll["queued-job"]
+
+@pytest.mark.asyncio
+class TestStatusCache:
+    async def test_terminal_status_is_served_from_cache(self):
+        monitoring = QuantumGatewayMonitoring()
+        orchestrator = QuantumJobOrchestrator(monitoring=monitoring)
+        orchestrator.register_provider("ibm", CountingProvider({"status": "DONE"}))
+        job_id = await orchestrator.submit_job("ibm", {"gates": []}, {})
+        for _ in range(10):
+            assert (await orchestrator.get_job_status(job_id))["status"] == "completed"
+        assert orchestrator.providers["ibm"].batch_calls == 1
+        assert monitoring.get_cache_statistics()["status"]["hits"] == 9
+
+    async def test_non_terminal_status_expires(self):
+        cache = StatusCache(provider_ttls={"ibm": 0.0})
+        cache.put("job", "ibm", {"status": "running"})
+        assert cache.get("job") is None
+        cache.put("job", "ibm", {"status": "completed"})
+        assert cache.get("job") == {"status": "completed"}
+
+    async def test_lru_eviction_respects_limits(self):
+        cache = StatusCache(max_entries=2)
+        for job_id in ["a", "b", "c"]:
+            cache.put(job_id, "ibm", {"status": "completed"})
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+        assert cache.get_stats()["evictions"] == 1
+        small = StatusCache(max_bytes=60)
+        small.put("a", "ibm", {"status": "completed", "provider": "ibm"})
+        small.put("b", "ibm", {"status": "completed", "provider": "ibm"})
+        assert len(small) == 1
+
+@pytest.mark.asyncio
+class TestSubmissionDeduplication:
+    @pytest.fixture
+    def orchestrator(self, tmp_path):
+        orchestrator = QuantumJobOrchestrator(result_cache=ResultCache(directory=str(tmp_path)))
+        orchestrator.register_provider("ibm", CountingProvider({"status": "DONE"}))
+        return orchestrator
+
+    async def test_identical_submission_attaches_to_running_job(self, orchestrator):
+        circuit = {"gates": [{"type": "h", "qubit": 0}], "num_qubits": 1}
+        first = await orchestrator.submit_job("ibm", circuit, {"shots": 100})
+        second = await orchestrator.submit_job("ibm", dict(circuit), {"shots": 100})
+        assert orchestrator.providers["ibm"].submitted == 1
+        first_job = await orchestrator.job_store.get(first)
+        assert (await orchestrator.job_store.get(second))["external_job_id"] == first_job["external_job_id"]
+        await orchestrator.submit_job("ibm", circuit, {"shots": 200})
+        await orchestrator.submit_job("ibm", circuit, {"shots": 100}, deduplicate=False)
+        assert orchestrator.providers["ibm"].submitted == 3
+
+    async def test_completed_result_is_reused(self, orchestrator):
+        circuit = {"gates": [{"type": "x", "qubit": 0}], "num_qubits": 1}
+        first = await orchestrator.submit_job("ibm", circuit, {})
+        await orchestrator.get_job_status(first)
+        result = await orchestrator.get_job_result(first)
+        second = await orchestrator.submit_job("ibm", circuit, {})
+        assert (await orchestrator.get_job_status(second))["status"] == "completed"
+        assert await orchestrator.get_job_result(second) == result
+        assert orchestrator.providers["ibm"].submitted == 1
+
+    async def test_large_results_spill_to_disk(self, tmp_path):
+        cache = ResultCache(spill_threshold_bytes=100, directory=str(tmp_path))
+        large = {"memory": ["0x1"] * 100}
+        cache.put("ibm:abc", large)
+        assert cache.get_stats()["memory_entries"] == 0
+        assert cache.path_for("ibm:abc") is not None
+        assert cache.get("ibm:abc") == large
+
+    async def test_streamed_result_is_spooled_to_disk(self, tmp_path):
+        cache = ResultCache(spill_threshold_bytes=1000, directory=str(tmp_path))
+        large = {"memory": ["0x3"] * 2000}
+        body = json.dumps(large).encode()
+
+        async def chunks(payload: bytes):
+            for start in range(0, len(payload), 256):
+                yield payload[start:start + 256]
+
+        result, path = await cache.put_stream("ibm:large", chunks(body))
+        assert result is None and path == cache.path_for("ibm:large")
+        assert gzip.open(path).read() == body
+        assert cache.lookup("ibm:large") == (None, path)
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".partial")]
+        small = {"counts": {"0": 1}}
+        assert await cache.put_stream("ibm:small", chunks(json.dumps(small).encode())) == (small, None)
+        assert cache.lookup("ibm:small") == (small, None)
+
+    async def test_open_job_result_streams_completed_results(self, orchestrator):
+        job_id = await orchestrator.submit_job("ibm", {"gates": [{"type": "z", "qubit": 0}], "num_qubits": 1}, {})
+        await orchestrator.get_job_status(job_id)
+        assert await orchestrator.open_job_result(job_id) == ({"counts": {"00": 512, "11": 512}}, None)
+        assert orchestrator.result_cache.get_stats()["memory_entries"] == 1
+
+class TestResultFormats:
+    qobj_result = {"results": [{
+        "data": {"counts": {"0x0": 2, "0x3": 1}, "memory": ["0x0", "0x3", "0x0"]},
+        "header": {"memory_slots": 2}
+    }]}
+
+    def test_counts_use_register_width(self):
+        encoded = json.loads(result_formats.encode_counts(self.qobj_result))
+        assert encoded == {"experiments": [{"counts": {"00": 2, "11": 1}, "shots": 3}]}
+        flat = json.loads(result_formats.encode_counts({"memory": [[1, 0, 1], [1, 0, 1]]}))
+        assert flat["experiments"][0]["counts"] == {"101": 2}
+
+    def test_packed_and_npy_shots(self):
+        packed, headers = result_formats.encode_packed(self.qobj_result)
+        assert packed == bytes([0b00000000, 0b11000000, 0b00000000])
+        assert headers["X-Bits-Per-Shot"] == "2"
+        body, _ = result_formats.encode_npy(self.qobj_result)
+        assert np.load(io.BytesIO(body)).tolist() == [0, 3, 0]
+
+    def test_missing_measurements_are_reported(self):
+        with pytest.raises(result_formats.ResultFormatError):
+            result_formats.encode_counts({"result": "simulated"})
+        with pytest.raises(result_formats.ResultFormatError):
+            result_formats.encode_packed({"counts": {"0": 1}})
+
+class FlakyProvider(CountingProvider):
+    async def submit_job(self, circuit_data: Dict[str, Any], job_config: Dict[str, Any]) -> str:
+        if circuit_data.get("fail"):
+            raise RuntimeError("provider rejected circuit")
+        return await super().submit_job(circuit_data, job_config)
+
+@pytest.mark.asyncio
+class TestBatchSubmission:
+    async def test_failed_items_do_not_fail_the_batch(self):
+        orchestrator = QuantumJobOrchestrator()
+        orchestrator.register_provider("ibm", FlakyProvider({}))
+        results = await orchestrator.submit_jobs("ibm", [
+            {"circuit_data": {"gates": [], "n": 1}, "job_config": {}},
+            {"circuit_data": {"gates": [], "fail": True}, "job_config": {}},
+            {"circuit_data": {"gates": [], "n": 1}, "job_config": {}}
+        ])
+        assert await orchestrator.job_store.get(results[0]) is not None
+        assert isinstance(results[1], RuntimeError)
+        assert (await orchestrator.job_store.get(results[2]))["deduplicated_from"] == results[0]
+        assert orchestrator.providers["ibm"].submitted == 1
+
+class SlowProvider(CountingProvider):
+    async def submit_job(self, circuit_data: Dict[str, Any], job_config: Dict[str, Any]) -> str:
+        await asyncio.sleep(10)
+        return await super().submit_job(circuit_data, job_config)
+
+@pytest.mark.asyncio
+class TestFailoverAndHedging:
+    async def test_failed_submission_fails_over_to_fallback(self):
+        orchestrator = QuantumJobOrchestrator(submit_timeout=0.05)
+        orchestrator.register_provider("ibm", FlakyProvider({}))
+        orchestrator.register_provider("google", SlowProvider({}))
+        orchestrator.register_provider("azure", CountingProvider({}))
+        job_id = await orchestrator.submit_job(
+            "ibm", {"gates": [], "fail": True}, {}, fallback_providers=["google", "azure"]
+        )
+        job_info = await orchestrator.job_store.get(job_id)
+        assert job_info["provider_name"] == "azure"
+        assert [attempt["provider"] for attempt in job_info["submission_attempts"]] == ["ibm", "google", "azure"]
+        assert "TimeoutError" in job_info["submission_attempts"][1]["error"]
+        assert job_info["winning_attempt"] == 2
+
+    async def test_all_providers_failing_raises(self):
+        orchestrator = QuantumJobOrchestrator()
+        orchestrator.register_provider("ibm", FlakyProvider({}))
+        orchestrator.register_provider("azure", FlakyProvider({}))
+        with pytest.raises(SubmissionError) as error:
+            await orchestrator.submit_job("ibm", {"gates": [], "fail": True}, {}, fallback_providers=["azure"])
+        assert len(error.value.attempts) == 2
+
+    async def test_slow_queue_is_hedged_and_loser_cancelled(self):
+        orchestrator = QuantumJobOrchestrator(latency_estimator=lambda provider_name, job_config: 600.0)
+        orchestrator.register_provider("ibm", CountingProvider({}))
+        orchestrator.register_provider("azure", CountingProvider({}))
+        job_id = await orchestrator.submit_job("ibm", {"gates": []}, {}, fallback_providers=["azure"], hedge_after=0.05)
+        subscription = orchestrator.events.subscribe([job_id])
+        while orchestrator.providers["azure"].submitted == 0:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        job_info = await orchestrator.job_store.get(job_id)
+        hedge_job_id = job_info["submission_attempts"][-1]["job_id"]
+        await orchestrator._apply_provider_status(hedge_job_id, {"status": "Succeeded"})
+        await orchestrator._hedges[job_id]
+        job_info = await orchestrator.job_store.get(job_id)
+        assert job_info["provider_name"] == "azure"
+        assert job_info["status"] == "completed"
+        assert job_info["winning_attempt"] == 1
+        assert 0 < job_info["latency_saved_seconds"] <= 600.0
+        assert orchestrator.providers["ibm"].cancelled == ["ext-1"]
+        assert subscription.queue.get_nowait()["status"] == "completed"
+
+    async def test_job_that_starts_in_time_is_not_hedged(self):
+        orchestrator = QuantumJobOrchestrator()
+        orchestrator.register_provider("ibm", CountingProvider({}))
+        orchestrator.register_provider("azure", CountingProvider({}))
+        job_id = await orchestrator.submit_job("ibm", {"gates": []}, {}, fallback_providers=["azure"], hedge_after=0.2)
+        await orchestrator._apply_provider_status(job_id, {"status": "RUNNING"})
+        await orchestrator._hedges[job_id]
+        assert orchestrator.providers["azure"].submitted == 0
+
+@pytest.mark.asyncio
+class TestJobStores:
+    @pytest_asyncio.fixture(params=["memory", "sqlite"])
+    async def store(self, request, tmp_path):
+        if request.param == "memory":
+            store = InMemoryJobStore()
+        else:
+            store = SQLiteJobStore(str(tmp_path / "jobs.db"), hot_rows=1)
+        await store.start()
+        yield store
+        await store.close()
+
+    async def test_indexed_lookups(self, store):
+        now = datetime.now()
+        for index in range(3):
+            await store.put({
+                "job_id": f"job-{index}",
+                "provider_name": "ibm",
+                "external_job_id": f"ext-{index}",
+                "submitted_at": now,
+                "fingerprint": "ibm:abc" if index == 1 else None,
+                "status": "queued"
+            })
+        await store.put_circuit("job-1", {"gates": [{"type": "h", "qubit": 0}]})
+        await store.update("job-2", {"status": "completed"})
+        await store.flush()
+        assert [job["job_id"] for job in await store.find_by_external("ibm", "ext-1")] == ["job-1"]
+        assert {job["job_id"] for job in await store.find_by_status("queued")} == {"job-0", "job-1"}
+        assert (await store.find_by_fingerprint("ibm:abc"))["job_id"] == "job-1"
+        assert (await store.get_circuit("job-1"))["gates"][0]["type"] == "h"
+        assert (await store.get("job-0"))["submitted_at"] == now
+
+    async def test_sqlite_store_survives_restart(self, tmp_path):
+        path = str(tmp_path / "jobs.db")
+        first = SQLiteJobStore(path)
+        orchestrator = QuantumJobOrchestrator(job_store=first)
+        orchestrator.register_provider("ibm", CountingProvider({}))
+        await orchestrator.startup()
+        job_id = await orchestrator.submit_job("ibm", {"gates": []}, {})
+        await orchestrator.shutdown()
+        restarted = QuantumJobOrchestrator(job_store=SQLiteJobStore(path))
+        restarted.register_provider("ibm", CountingProvider({}))
+        await restarted.startup()
+        assert restarted.poller.tracked_jobs == 1
+        assert (await restarted.get_job_status(job_id))["external_job_id"] == "ext-1"
+        await restarted.shutdown()
+
+@pytest.mark.asyncio
+class TestRedisSharedState:
+    async def test_workers_share_jobs_and_status_updates(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+
+        def make_worker():
+            redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+            orchestrator = QuantumJobOrchestrator(
+                job_store=RedisJobStore(redis),
+                shared_state=RedisSharedState(redis, leader_ttl=0.3)
+            )
+            orchestrator.poller.tick_interval = 0.01
+            orchestrator.register_provider("ibm", CountingProvider({}))
+            return orchestrator
+
+        worker_a, worker_b = make_worker(), make_worker()
+        await worker_a.startup()
+        await worker_b.startup()
+        try:
+            job_id = await worker_a.submit_job("ibm", {"gates": []}, {})
+            assert (await worker_b.job_store.get(job_id))["external_job_id"] == "ext-1"
+            assert await worker_a.should_poll() != await worker_b.should_poll()
+            leader, follower = (worker_a, worker_b) if await worker_a.should_poll() else (worker_b, worker_a)
+            leader.poller._next_poll[job_id] = 0
+            for _ in range(100):
+                if follower.status_cache.get(job_id) is not None:
+                    break
+                await asyncio.sleep(0.01)
+            assert follower.status_cache.get(job_id)["status"] == "running"
+            assert follower.providers["ibm"].batch_calls == 0
+            assert await follower.shared_state.hit_rate_counter("ibm", 60) == 1
+            assert await leader.shared_state.hit_rate_counter("ibm", 60) == 2
+        finally:
+            await worker_a.shutdown()
+            await worker_b.shutdown()
+
+@pytest.mark.asyncio
+class TestStatusEvents:
+    async def test_transitions_are_published_to_subscribers(self):
+        orchestrator = QuantumJobOrchestrator()
+        orchestrator.register_provider("ibm", CountingProvider({}))
+        job_id = await orchestrator.submit_job("ibm", {"gates": []}, {})
+        subscription = orchestrator.events.subscribe([job_id])
+        everything = orchestrator.events.subscribe()
+        await orchestrator.get_job_status(job_id)
+        await orchestrator._apply_provider_status(job_id, {"status": "RUNNING"})
+        await orchestrator._apply_provider_status(job_id, {"status": "DONE"})
+        first, second = subscription.queue.get_nowait(), subscription.queue.get_nowait()
+        assert (first["previous_status"], first["status"]) == ("queued", "running")
+        assert (second["previous_status"], second["status"]) == ("running", "completed")
+        assert subscription.queue.empty()
+        assert everything.queue.qsize() == 2
+        subscription.close()
+        everything.close()
+        assert orchestrator.events.subscriber_count == 0
@@ -0,0 +1,127 @@
+import pytest
+import asyncio
+import time
+import httpx
+import json
+from src.providers.ibm_provider import IBMQuantumProvider
+from src.providers.resilience import ResilientProvider, CircuitOpenError
+
+def ibm_mock_transport():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST" and request.url.path == "/v1/jobs":
+            return httpx.Response(200, json={"id": "ibm-job-1"})
+        if request.url.path.endswith("/result"):
+            return httpx.Response(200, json={"results": [{"data": {"counts": {"0x0": 1024}}}]})
+        if request.url.path.endswith("/cancel"):
+            return httpx.Response(200)
+        return httpx.Response(200, json={"status": "RUNNING"})
+    return httpx.MockTransport(handler)
+
+@pytest.mark.asyncio
+class TestProviderConnectionPool:
+    @pytest.fixture
+    def provider(self):
+        return IBMQuantumProvider({
+            "api_token": "test_token",
+            "http_pool": {"transport": ibm_mock_transport(), "max_connections": 10}
+        })
+
+    async def test_client_is_shared_across_calls(self, provider):
+        await provider.startup()
+        client = provider.http_client
+        external_job_id = await provider.submit_job({"gates": [], "num_qubits": 1}, {})
+        await provider.get_job_status(external_job_id)
+        await provider.get_job_result(external_job_id)
+        assert provider.http_client is client
+        stats = provider.get_pool_stats()
+        assert stats["requests_sent"] == 3
+        assert stats["max_connections"] == 10
+        await provider.shutdown()
+        assert provider.get_pool_stats()["open"] is False
+
+    async def test_result_is_streamed_in_chunks(self, provider):
+        chunks = [chunk async for chunk in ResilientProvider("ibm", provider).stream_job_result("ibm-job-1")]
+        assert json.loads(b"".join(chunks)) == {"results": [{"data": {"counts": {"0x0": 1024}}}]}
+        await provider.shutdown()
+
+    async def test_client_created_lazily(self, provider):
+        assert provider.get_pool_stats()["open"] is False
+        assert await provider.cancel_job("ibm-job-1") is True
+        assert provider.get_pool_stats()["open"] is True
+        await provider.shutdown()
+
+def test_circuit_fingerprint_ignores_volatile_keys():
+    provider = IBMQuantumProvider({"api_token": "test_token"})
+    circuit = {"gates": [{"type": "h", "qubit": 0}], "num_qubits": 1}
+    assert provider.circuit_fingerprint(circuit, {"shots": 1024}) == provider.circuit_fingerprint(circuit, {"shots": 1024})
+    assert provider.circuit_fingerprint(circuit, {"shots": 1024}) != provider.circuit_fingerprint(circuit, {"shots": 512})
+
+def failing_transport(status_code: int):
+    calls = []
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(status_code, json={"error": "unavailable"})
+    return httpx.MockTransport(handler), calls
+
+@pytest.mark.asyncio
+class TestResilientProvider:
+    def wrap(self, transport, **config):
+        provider = IBMQuantumProvider({"api_token": "test_token", "http_pool": {"transport": transport}})
+        return ResilientProvider("ibm", provider, {"recovery_timeout": 0.05, "failure_threshold": 3, **config})
+
+    async def test_breaker_opens_and_fails_fast(self):
+        transport, calls = failing_transport(503)
+        provider = self.wrap(transport)
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await provider.get_job_status("ibm-job-1")
+        assert provider.available is False
+        with pytest.raises(CircuitOpenError):
+            await provider.get_job_status("ibm-job-1")
+        assert len(calls) == 3
+        stats = provider.get_resilience_stats()
+        assert stats["breaker_state"] == "open"
+        assert stats["rejected_calls"] == 1
+
+    async def test_half_open_probe_closes_breaker(self):
+        provider = self.wrap(ibm_mock_transport())
+        for _ in range(3):
+            provider.breaker.record_failure()
+        await asyncio.sleep(0.06)
+        assert provider.available is True
+        assert (await provider.get_job_status("ibm-job-1"))["status"] == "RUNNING"
+        assert provider.get_resilience_stats()["breaker_state"] == "closed"
+
+    async def test_client_errors_do_not_trip_breaker(self):
+        transport, _ = failing_transport(400)
+        provider = self.wrap(transport)
+        for _ in range(5):
+            with pytest.raises(httpx.HTTPStatusError):
+                await provider.get_job_status("ibm-job-1")
+        assert provider.get_resilience_stats()["breaker_state"] == "closed"
+
+    async def test_rate_limiter_spaces_out_bursts(self):
+        provider = self.wrap(ibm_mock_transport(), rate_per_second=100.0, burst=5)
+        start = time.monotonic()
+        await asyncio.gather(*(provider.get_job_status(f"job-{i}") for i in range(15)))
+        assert time.monotonic() - start >= 0.09
+        stats = provider.get_resilience_stats()
+        assert stats["limiter_waits"] == 10
+        assert stats["in_flight"] == 0
+
+    async def test_timeout_counts_as_failure(self):
+        async def slow_handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(1)
+            return httpx.Response(200, json={"status": "RUNNING"})
+        provider = self.wrap(httpx.MockTransport(slow_handler), timeouts={"status": 0.01})
+        with pytest.raises(TimeoutError):
+            await provider.get_job_status("ibm-job-1")
+        stats = provider.get_resilience_stats()
+        assert stats["timeouts"] == 1
+        assert stats["consecutive_failures"] == 1
+
+    async def test_other_attributes_are_delegated(self):
+        provider = self.wrap(ibm_mock_transport())
+        assert provider.supports_batch_status is False
+        assert provider.circuit_fingerprint({"gates": []}, {}) == provider.provider.circuit_fingerprint({"gates": []}, {})
+        assert provider.get_pool_stats()["open"] is False
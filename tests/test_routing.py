@@ -0,0 +1,103 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from src.orchestration.routing import (
+    ProviderRouter, JobFeatures, ExpectedTimePolicy, StaticAffinityPolicy
+)
+from src.orchestration.routing_sim import replay, load_trace, main
+
+PROVIDERS = ["ibm", "google", "azure"]
+
+def observe_queue(router, provider, seconds, samples=5):
+    for _ in range(samples):
+        router.record_queue_time(provider, None, seconds)
+        router.record_completion(provider, None, True, 1.0, 1024)
+
+class TestProviderRouter:
+    def test_cold_start_keeps_static_preferences(self):
+        router = ProviderRouter()
+        assert router.select(JobFeatures("vqe"), PROVIDERS) == "ibm"
+        assert router.select(JobFeatures("quantum_ml"), PROVIDERS) == "google"
+        assert router.select(JobFeatures("custom", circuit_format="qsharp"), PROVIDERS) == "azure"
+        assert router.select(JobFeatures("maxcut"), PROVIDERS) == "ibm"
+
+    def test_routes_away_from_long_queue(self):
+        router = ProviderRouter()
+        observe_queue(router, "ibm", 600.0)
+        observe_queue(router, "google", 20.0)
+        observe_queue(router, "azure", 30.0)
+        assert router.select(JobFeatures("vqe"), PROVIDERS) == "google"
+
+    def test_failure_rate_raises_expected_time(self):
+        router = ProviderRouter()
+        observe_queue(router, "ibm", 20.0)
+        observe_queue(router, "google", 25.0)
+        for _ in range(10):
+            router.record_completion("ibm", None, False)
+        assert router.select(JobFeatures("maxcut"), ["ibm", "google"]) == "google"
+
+    def test_high_priority_avoids_erratic_queue(self):
+        router = ProviderRouter()
+        for seconds in [5.0, 120.0, 5.0, 120.0, 5.0, 120.0]:
+            router.record_queue_time("ibm", None, seconds)
+        observe_queue(router, "google", 60.0)
+        assert router.select(JobFeatures("maxcut", priority=1), ["ibm", "google"]) == "ibm"
+        assert router.select(JobFeatures("maxcut", priority=10), ["ibm", "google"]) == "google"
+
+    def test_qubit_limits_and_no_eligible_provider(self):
+        router = ProviderRouter()
+        assert router.select(JobFeatures("maxcut", num_qubits=100), PROVIDERS) == "ibm"
+        with pytest.raises(ValueError):
+            router.select(JobFeatures("maxcut", circuit_format="qsharp", num_qubits=100), PROVIDERS)
+
+    @pytest.mark.asyncio
+    async def test_learns_from_status_events(self):
+        router = ProviderRouter()
+        submitted = datetime(2025, 1, 1)
+        for index in range(3):
+            job_id = f"job-{index}"
+            await router.observe({
+                "job_id": job_id, "status": "running", "previous_status": "queued", "provider": "ibm",
+                "submitted_at": submitted.isoformat(), "timestamp": (submitted + timedelta(seconds=40)).isoformat()
+            })
+            await router.observe({
+                "job_id": job_id, "status": "completed", "previous_status": "running", "provider": "ibm",
+                "submitted_at": submitted.isoformat(), "timestamp": (submitted + timedelta(seconds=50)).isoformat()
+            })
+        stats = router.get_stats()["ibm"]
+        assert stats["samples"] == 3
+        assert stats["queue_mean_seconds"] == pytest.approx(40.0)
+        assert stats["failure_rate"] == 0.0
+
+class TestRoutingSimulation:
+    @pytest.fixture
+    def trace_path(self, tmp_path):
+        records = []
+        for index in range(200):
+            records.append({
+                "submitted_at": float(index), "provider": "ibm", "queue_seconds": 300.0,
+                "execution_seconds": 2.0, "success": True,
+                "features": {"algorithm_type": "vqe", "gate_count": 10, "shots": 1024}
+            })
+            records.append({
+                "submitted_at": float(index) + 0.5, "provider": "google", "queue_seconds": 10.0,
+                "execution_seconds": 2.0, "success": True,
+                "features": {"algorithm_type": "maxcut", "gate_count": 10, "shots": 1024}
+            })
+        path = tmp_path / "trace.jsonl"
+        path.write_text("\n".join(json.dumps(record) for record in records))
+        return path
+
+    def test_adaptive_policy_beats_static(self, trace_path):
+        trace = load_trace(str(trace_path))
+        static = replay(trace, StaticAffinityPolicy())
+        adaptive = replay(trace, ExpectedTimePolicy())
+        assert static["jobs"] == adaptive["jobs"] == 400
+        assert adaptive["mean_seconds"] < static["mean_seconds"]
+        assert adaptive["p95_seconds"] <= static["p95_seconds"]
+
+    def test_cli_reports_each_policy(self, trace_path, capsys):
+        assert main([str(trace_path), "--policy", "static", "--policy", "expected_time"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert set(report) == {"static", "expected_time"}
+        assert set(report["static"]) >= {"mean_seconds", "p50_seconds", "p95_seconds"}
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import pytest
+import httpx
+from src.monitoring.tracing import Tracer, SamplingProfiler, JsonLinesExporter, current_trace, span, trace_headers
+from src.providers.ibm_provider import IBMQuantumProvider
+
+class TestTracer:
+    def test_unsampled_requests_create_no_trace(self):
+        tracer = Tracer(sample_rate=0.0)
+        assert tracer.start("GET /") is None
+        with span("stage") as record:
+            assert record is None
+        assert trace_headers() == {}
+
+    def test_upstream_sampled_traceparent_is_continued(self):
+        tracer = Tracer(sample_rate=0.0)
+        trace = tracer.start("GET /", "00-" + "a" * 32 + "-" + "b" * 16 + "-01")
+        assert trace.trace_id == "a" * 32
+        assert trace.parent_span_id == "b" * 16
+
+    def test_spans_nest_and_export(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(sample_rate=1.0, exporters=[JsonLinesExporter(str(path))])
+        trace = tracer.start("POST /api/v2/jobs")
+        token = current_trace.set(trace)
+        try:
+            with span("handler") as handler:
+                with span("transform") as transform:
+                    assert transform.parent_id == handler.span_id
+                    assert trace_headers()["traceparent"] == f"00-{trace.trace_id}-{transform.span_id}-01"
+        finally:
+            current_trace.reset(token)
+        tracer.finish(trace)
+        exported = json.loads(path.read_text())
+        assert exported["trace_id"] == trace.trace_id
+        assert [record["name"] for record in exported["spans"]] == ["handler", "transform"]
+
+@pytest.mark.asyncio
+class TestTracePropagation:
+    async def test_trace_id_reaches_provider_calls(self):
+        seen = []
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("traceparent"))
+            return httpx.Response(200, json={"id": "ibm-job-1"})
+        provider = IBMQuantumProvider({"api_token": "t", "http_pool": {"transport": httpx.MockTransport(handler)}})
+        trace = Tracer(sample_rate=1.0).start("POST /api/v2/jobs")
+        token = current_trace.set(trace)
+        try:
+            await provider.submit_job({"gates": [], "num_qubits": 1}, {})
+        finally:
+            current_trace.reset(token)
+        await provider.shutdown()
+        assert seen[0].startswith(f"00-{trace.trace_id}-")
+        assert "transform" in [record.name for record in trace.spans]
+
+class TestSamplingProfiler:
+    def test_slow_request_dumps_folded_stacks(self, tmp_path):
+        profiler = SamplingProfiler(output_dir=str(tmp_path), interval=0.001, threshold_seconds=0.01)
+        profiler.enable()
+        try:
+            import time
+            start = time.perf_counter()
+            while time.perf_counter() - start < 0.05:
+                sum(range(1000))
+            path = profiler.request_finished("GET /slow", "trace-1", start, time.perf_counter())
+        finally:
+            profiler.disable()
+        lines = open(path).read().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert ";" in stack or "(" in stack
+        assert profiler.request_finished("GET /slow", "trace-2", 0, 1) is None